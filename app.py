@@ -1,17 +1,53 @@
-from flask import Flask, request, jsonify, render_template, send_file
+from flask import Flask, Response, g, redirect, request, jsonify, render_template, send_file, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 import os
-import tempfile
 import logging
 import sys
 import pathlib
+import time
+import uuid
+from datetime import datetime
+from urllib.parse import quote, urlencode
 
 # Add utils to path
 sys.path.append(str(pathlib.Path(__file__).parent))
 
+from utils.jobs import JobQueue, QueueFullError, create_job_store, DONE, FAILED, NOT_FOUND
+from utils.result_cache import ResultCache, result_cache_key
+from utils.artifacts import create_artifact_store
+from utils.criteria import COUNTRIES, JOB_TITLES, INDUSTRIES
+from utils.locales import locales
+from utils.browser import close_browser_pool, get_browser_pool
+from utils.bulk import expand_criteria, run_bulk
+from utils.dedupe import get_dedupe_index
+from utils.lead_store import FILTERS as LEAD_FILTERS, get_lead_store
+from utils.metrics import BYTES, HTTP_REQUEST_SECONDS, render as render_metrics, timed
+
+from utils.lazy import lazy_import, loaded, missing_modules, warm_up
+
 # Import with better error handling
 try:
-    from utils.scraper import IntelligentLeadScraper
-    from utils.exporter import export_data
+    from utils.exporter import export_data, export_many, get_export_pool, close_export_pool, STREAM_WRITERS
+    # The scraper stack (requests, urllib3, BeautifulSoup) loads on first use, not at startup
+    missing = missing_modules('requests', 'urllib3', 'bs4')
+    if missing:
+        raise ImportError(f"No module named {missing[0]!r}")
+    scraper_module = lazy_import('utils.scraper')
+    http_cache_module = lazy_import('utils.http_cache')
+
+    def get_scraper():
+        return scraper_module.get_scraper()
+
+    def peek_scraper():
+        return scraper_module.peek_scraper() if loaded('utils.scraper') else None
+
+    def close_scraper():
+        if loaded('utils.scraper'):
+            scraper_module.close_scraper()
+
+    def get_response_cache():
+        return http_cache_module.get_response_cache()
+
     logging.info("✅ Successfully imported all modules")
 except ImportError as e:
     logging.error(f"❌ Import error: {e}")
@@ -31,6 +67,32 @@ except ImportError as e:
                 'source': 'Fallback Data'
             }]
     
+    _fallback_scraper = IntelligentLeadScraper()
+    
+    def get_scraper():
+        return _fallback_scraper
+    
+    def peek_scraper():
+        return None
+    
+    def close_scraper():
+        pass
+    
+    def get_response_cache():
+        return None
+    
+    STREAM_WRITERS = {}
+    
+    def get_export_pool():
+        return None
+    
+    def close_export_pool():
+        pass
+    
+    def export_many(leads, targets, pool=None):
+        for format_type, filename in targets.items():
+            export_data(leads, filename, format_type)
+    
     def export_data(leads, filename, format_type):
         logging.info("Using fallback exporter")
         import csv
@@ -50,38 +112,40 @@ except ImportError as e:
                     lead.get('source', '')
                 ])
 
+class LeadJSONProvider(DefaultJSONProvider):
+    """JSON provider that renders Lead records through their dict view"""
+    
+    @staticmethod
+    def default(o):
+        if hasattr(o, 'to_dict'):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+# Parse the locale table now, so a preloading gunicorn master shares it with every worker
+locales()
+
 app = Flask(__name__)
+app.json = LeadJSONProvider(app)
 logging.basicConfig(level=logging.INFO)
 
-# Enhanced country list
-COUNTRIES = [
-    # European Countries
-    "United Kingdom", "Germany", "France", "Italy", "Spain", "Netherlands", 
-    "Switzerland", "Sweden", "Norway", "Denmark", "Ireland", "Belgium", 
-    "Austria", "Portugal", "Finland", "Poland", "Czech Republic", "Hungary", 
-    "Romania", "Greece",
-    
-    # Wealthy Asian Countries
-    "Japan", "South Korea", "Singapore", "Hong Kong", "Taiwan", 
-    "United Arab Emirates", "Qatar", "Saudi Arabia", "Israel", "Malaysia",
-    
-    # Others
-    "United States", "Canada", "Australia", "India", "Brazil", "Mexico"
-]
-
-JOB_TITLES = [
-    "CEO", "CFO", "CTO", "CMO", "COO", "President", "Vice President",
-    "Director", "Manager", "Senior Manager", "Executive Director",
-    "Managing Director", "Partner", "Owner", "Founder", "Board Member",
-    "Head of Department", "Team Lead", "Supervisor"
-]
-
-INDUSTRIES = [
-    "Technology", "Healthcare", "Finance", "Education", "Real Estate",
-    "Manufacturing", "Retail", "Construction", "Transportation",
-    "Hospitality", "Energy", "Telecommunications", "Marketing",
-    "Consulting", "Legal", "Insurance", "Pharmaceuticals"
-]
+@app.before_request
+def start_request():
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def finish_request(response):
+    """Tag every response with its request id and record how long it took"""
+    elapsed = time.perf_counter() - g.request_started
+    HTTP_REQUEST_SECONDS.observe(elapsed, endpoint=request.endpoint or 'unknown', status=response.status_code)
+    response.headers['X-Request-ID'] = g.request_id
+    response.headers['Server-Timing'] = f'app;dur={elapsed * 1000:.1f}'
+    if response.is_json and not response.direct_passthrough:
+        body = response.get_json(silent=True)
+        if isinstance(body, dict):
+            body['request_id'] = g.request_id
+            response.set_data(app.json.dumps(body))
+    return response
 
 @app.route('/')
 def index():
@@ -90,6 +154,279 @@ def index():
                          job_titles=JOB_TITLES,
                          industries=INDUSTRIES)
 
+MAX_WEBSITE_URLS = int(os.environ.get('MAX_WEBSITE_URLS', 500))
+# Most leads one search (or one bulk combination) may ask for
+MAX_RESULTS = int(os.environ.get('MAX_RESULTS', 200))
+# Seconds between keep-alive events on an idle progress stream
+STREAM_HEARTBEAT = int(os.environ.get('STREAM_HEARTBEAT', 15))
+EXPORT_FORMATS = ('xlsx', 'pdf', 'vcf', 'csv', 'txt')
+BULK_WORKERS = int(os.environ.get('BULK_WORKERS', 8))
+BULK_EXECUTOR = os.environ.get('BULK_EXECUTOR', 'thread')
+# Most leads one /leads export reads from the store
+LEAD_EXPORT_MAX = int(os.environ.get('LEAD_EXPORT_MAX', 100_000))
+
+result_cache = ResultCache(
+    ttl=int(os.environ.get('RESULT_CACHE_TTL', 900)),
+    max_entries=int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 256))
+)
+
+# Exported files: content-addressed, swept when expired or over the size cap
+artifact_store = create_artifact_store()
+artifact_store.start_sweeper()
+
+def download_name(format_type, *name_parts):
+    """Friendly filename offered to the browser, e.g. leads_CEO_Technology.xlsx"""
+    safe_parts = ["".join(c for c in part if c.isalnum()) or "all" for part in name_parts]
+    return f"leads_{'_'.join(safe_parts)}.{format_type}"
+
+def lead_result(leads, filepath=None, cached=False, filename=None):
+    """Stored result of a finished lead search
+
+    Without a filepath the download is streamed from the leads by
+    /jobs/<id>/export; see public_result.
+    """
+    return {
+        'message': f'✅ Successfully generated {len(leads)} leads',
+        'download_url': download_url(filepath, filename) if filepath else None,
+        'leads_count': len(leads),
+        'leads': leads,
+        'cached': cached
+    }
+
+def download_url(filepath, filename=None):
+    url = f'/download/{os.path.basename(filepath)}'
+    return f'{url}?name={quote(filename)}' if filename else url
+
+def public_result(job):
+    """JSON body for a finished job: the result with a preview instead of every lead"""
+    result = {key: value for key, value in job['result'].items() if key != 'leads'}
+    result['leads_preview'] = job['result']['leads'][:5]  # Preview first 5 leads
+    if not result['download_url']:
+        result['download_url'] = f"/jobs/{job['id']}/export"
+    result['job_id'] = job['id']
+    result['status_url'] = f"/jobs/{job['id']}"
+    result['result_url'] = f"/jobs/{job['id']}/result"
+    return result
+
+def run_lead_job(payload):
+    """Scrape and export leads for one job - runs on the job worker pool"""
+    search_data = payload['search_data']
+    format_type = payload['format']
+    max_results = payload.get('max_results', 50)
+    cache_key = result_cache_key(search_data, max_results)
+    title = search_data.get('title', '')
+    industry = search_data.get('industry', '')
+
+    # Shared scraper - reuses the worker's session and connection pool
+    scraper = get_scraper()
+
+    def scrape():
+        app.logger.info(f"🔍 Searching for leads: {search_data}")
+        return scraper.scrape_leads(search_data, max_results=max_results)
+
+    # Scrape leads (identical concurrent searches share one run)
+    leads = result_cache.get_or_compute_leads(cache_key, scrape)
+    if leads and payload.get('new_only'):
+        leads, cache_key = only_new_leads(leads, max_results)
+        if not leads:
+            raise LookupError('No new leads since the last run for these criteria.')
+
+    if not leads:
+        raise LookupError('No leads found for the given criteria. Try different search terms.')
+
+    if payload.get('formats'):
+        return export_many_result(leads, payload['formats'], payload.get('bundle'), title, industry)
+    return export_result(leads, format_type, cache_key, title, industry)
+
+def only_new_leads(leads, max_results):
+    """Drop leads already returned by earlier new-only jobs; returns the rest and a cache key for them"""
+    with timed('dedupe_index'):
+        leads = get_dedupe_index().filter_new(leads)
+    # Key the export on the net-new leads themselves, not on the search
+    cache_key = result_cache_key({
+        'new_leads': [f"{lead.get('phone', '')}_{lead.get('email', '')}" for lead in leads]
+    }, max_results)
+    if leads:
+        result_cache.put_leads(cache_key, leads)
+    return leads, cache_key
+
+def export_result(leads, format_type, cache_key, *name_parts):
+    """Export leads (once per cache key and format) and build the job result"""
+    # Text formats are written on the fly when downloaded - no file needed
+    if format_type in STREAM_WRITERS:
+        return lead_result(leads)
+
+    # Identical lead sets share one artifact, whichever search produced them
+    def export():
+        return artifact_store.get_or_create(leads, format_type, file_writer(leads, format_type))
+
+    filepath = result_cache.get_or_export(cache_key, format_type, export)
+    return lead_result(leads, filepath, filename=download_name(format_type, *name_parts))
+
+def file_writer(leads, format_type):
+    """export(path) callback for the artifact store: writes the leads and counts the bytes"""
+    def write(path):
+        app.logger.info(f"💾 Exporting {len(leads)} leads as {format_type}")
+        with timed(f'export_{format_type}'):
+            export_data(leads, path, format_type)
+        if os.path.exists(path):
+            BYTES.inc(os.path.getsize(path), kind=f'export_{format_type}')
+    return write
+
+def export_many_result(leads, formats, bundle, *name_parts):
+    """Export leads to several formats in one pass and build the job result
+
+    Each format gets its own download URL; with bundle the main
+    download_url is a ZIP of all of them.
+    """
+    def write(targets):
+        app.logger.info(f"💾 Exporting {len(leads)} leads as {', '.join(targets)} in one pass")
+        with timed('export_many'):
+            export_many(leads, targets, pool=get_export_pool())
+        for format_type, path in targets.items():
+            if os.path.exists(path):
+                BYTES.inc(os.path.getsize(path), kind=f'export_{format_type}')
+
+    paths = artifact_store.get_or_create_many(leads, formats, write)
+    if not paths:
+        raise RuntimeError(f'Export failed for every requested format: {", ".join(formats)}')
+
+    names = {format_type: download_name(format_type, *name_parts) for format_type in paths}
+    if bundle:
+        with timed('export_zip'):
+            filepath = artifact_store.bundle(paths, names)
+        result = lead_result(leads, filepath, filename=download_name('zip', *name_parts))
+    else:
+        first = next(format_type for format_type in formats if format_type in paths)
+        result = lead_result(leads, paths[first], filename=names[first])
+    result['downloads'] = {format_type: download_url(paths[format_type], names[format_type])
+                           for format_type in formats if format_type in paths}
+    failed = [format_type for format_type in formats if format_type not in paths]
+    if failed:
+        result['failed_formats'] = failed
+    return result
+
+def parse_formats(data):
+    """The 'formats' list of a request, or None for a single-format export; raises ValueError"""
+    formats = data.get('formats')
+    if formats is None:
+        return None
+    if isinstance(formats, str):
+        formats = formats.split(',')
+    if not isinstance(formats, list) or not all(isinstance(f, str) for f in formats):
+        raise ValueError('formats must be a list of export formats')
+    formats = list(dict.fromkeys(f.strip().lower() for f in formats if f.strip()))
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown or not formats:
+        raise ValueError(f'formats must be chosen from {", ".join(EXPORT_FORMATS)}')
+    return formats
+
+def parse_format(data, formats=None):
+    """The export format of a request: the first of formats, else 'format' (default xlsx); raises ValueError"""
+    if formats:
+        return formats[0]
+    format_type = data.get('format', 'xlsx')
+    if not isinstance(format_type, str) or format_type.strip().lower() not in EXPORT_FORMATS:
+        raise ValueError(f'format must be one of {", ".join(EXPORT_FORMATS)}')
+    return format_type.strip().lower()
+
+def parse_max_results(data, default=50):
+    """The 'max_results' of a request, clamped to 1..MAX_RESULTS; raises ValueError if it isn't a whole number"""
+    value = data.get('max_results', default)
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError('max_results must be a whole number')
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError('max_results must be a whole number') from None
+    return max(1, min(value, MAX_RESULTS))
+
+def run_bulk_job(payload):
+    """Scrape every combination of a bulk request and export one combined file"""
+    combinations = payload['combinations']
+    max_results = payload.get('max_results', 50)
+    cache_key = result_cache_key({
+        'combinations': ['|'.join(c.values()) for c in combinations]
+    }, max_results)
+
+    def scrape():
+        leads, summary = run_bulk(combinations, max_results, workers=BULK_WORKERS, executor=BULK_EXECUTOR)
+        return leads
+
+    leads = result_cache.get_or_compute_leads(cache_key, scrape)
+    if leads and payload.get('new_only'):
+        leads, cache_key = only_new_leads(leads, max_results)
+        if not leads:
+            raise LookupError('No new leads since the last run for these criteria.')
+    if not leads:
+        raise LookupError('No leads found for any of the given criteria.')
+
+    if payload.get('formats'):
+        result = export_many_result(leads, payload['formats'], payload.get('bundle'), 'bulk')
+    else:
+        result = export_result(leads, payload['format'], cache_key, 'bulk')
+    result['combinations'] = len(combinations)
+    return result
+
+job_queue = JobQueue(
+    create_job_store(),
+    max_workers=int(os.environ.get('JOB_WORKERS', 4)),
+    max_pending=int(os.environ.get('JOB_MAX_PENDING', 100)),
+    ttl=int(os.environ.get('JOB_TTL', 3600))
+)
+
+def job_status(job):
+    """Public view of a job record"""
+    status = {
+        'job_id': job['id'],
+        'status': job['status'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at'],
+        'status_url': f"/jobs/{job['id']}",
+        'result_url': f"/jobs/{job['id']}/result"
+    }
+    if job['status'] == DONE:
+        status['download_url'] = public_result(job)['download_url']
+        status['leads_count'] = job['result']['leads_count']
+    elif job['status'] == FAILED:
+        status['error'] = job['error']
+    return status
+
+def lead_payload(data):
+    """Job payload for a /generate-leads request body; raises ValueError if it is invalid"""
+    title = data.get('title', '')
+    industry = data.get('industry', '')
+    country = data.get('country', '')
+    website_url = data.get('website_url', '')
+    website_urls = data.get('website_urls') or []
+    formats = parse_formats(data)
+    format_type = parse_format(data, formats)
+    
+    # Validate input
+    if not isinstance(website_urls, list) or not all(isinstance(url, str) for url in website_urls):
+        raise ValueError('website_urls must be a list of URLs')
+    if len(website_urls) > MAX_WEBSITE_URLS:
+        raise ValueError(f'Please provide at most {MAX_WEBSITE_URLS} website URLs')
+    
+    if not any([title, industry, country, website_url, website_urls]):
+        raise ValueError('Please provide at least one search criteria')
+    
+    return {
+        'search_data': {
+            'title': title,
+            'industry': industry,
+            'country': country,
+            'website_url': website_url,
+            'website_urls': website_urls
+        },
+        'format': format_type,
+        'formats': formats,
+        'bundle': bool(data.get('bundle')),
+        'max_results': 50,
+        'new_only': bool(data.get('new_only')),
+        'request_id': g.request_id
+    }
+
 @app.route('/generate-leads', methods=['POST'])
 def generate_leads():
     try:
@@ -97,80 +434,356 @@ def generate_leads():
         data = request.get_json()
         if not data:
             return jsonify({'error': 'No JSON data provided'}), 400
-            
-        title = data.get('title', '')
-        industry = data.get('industry', '')
-        country = data.get('country', '')
-        website_url = data.get('website_url', '')
-        format_type = data.get('format', 'xlsx')
         
-        # Validate input
-        if not any([title, industry, country, website_url]):
-            return jsonify({
-                'error': 'Please provide at least one search criteria'
-            }), 400
+        try:
+            payload = lead_payload(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        search_data = payload['search_data']
+        format_type = payload['format']
         
-        # Initialize scraper
-        scraper = IntelligentLeadScraper()
+        # Same search already done (and exported in this format) - answer from the cache.
+        # New-only jobs always run, since their answer depends on what was returned before.
+        # Multi-format jobs run too; their scrape still comes from the cache and their files from artifacts.
+        cache_key = result_cache_key(search_data, 50)
+        leads = None if payload['new_only'] or payload['formats'] else result_cache.get_leads(cache_key)
+        if leads and format_type in STREAM_WRITERS:
+            result = lead_result(leads, cached=True)
+        else:
+            filepath = result_cache.cached_export(cache_key, format_type) if leads else None
+            filename = download_name(format_type, search_data['title'], search_data['industry'])
+            result = lead_result(leads, filepath, cached=True, filename=filename) if filepath else None
+        if result:
+            app.logger.info(f"⚡ Result cache hit for {search_data}")
+            return jsonify(public_result(job_queue.record(payload, result)))
         
-        # Prepare search data
-        search_data = {
-            'title': title,
-            'industry': industry,
-            'country': country,
-            'website_url': website_url
-        }
+        # Hand the work to the job pool and answer straight away
+        job = job_queue.submit(run_lead_job, payload)
+        app.logger.info(f"📥 Queued job {job['id']} ({g.request_id}): {search_data}")
         
-        # Scrape leads
-        app.logger.info(f"🔍 Searching for leads: {search_data}")
-        leads = scraper.scrape_leads(search_data, max_results=50)
+        return jsonify(job_status(job)), 202
         
-        if not leads:
-            return jsonify({
-                'error': 'No leads found for the given criteria. Try different search terms.'
-            }), 404
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        app.logger.error(f"❌ Error generating leads: {str(e)}")
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+
+@app.route('/generate-leads/stream', methods=['POST'])
+def generate_leads_stream():
+    """Run a lead search and stream it as NDJSON: stage progress, each lead as found, then the result"""
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'No JSON data provided'}), 400
+    try:
+        payload = lead_payload(data)
+        job = job_queue.submit(run_lead_job, payload)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    app.logger.info(f"📡 Streaming job {job['id']} ({g.request_id}): {payload['search_data']}")
+    
+    # New-only results are filtered after the search, so only the survivors are sent, at the end
+    events = job_events(job['id'], forward_leads=not payload['new_only'])
+    return Response(
+        stream_with_context(app.json.dumps(event) + '\n' for event in events),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/bulk-generate-leads', methods=['POST'])
+def bulk_generate_leads():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No JSON data provided'}), 400
         
-        # Export data
-        temp_dir = tempfile.gettempdir()
-        safe_title = "".join(c for c in title if c.isalnum()) if title else "all"
-        safe_industry = "".join(c for c in industry if c.isalnum()) if industry else "all"
-        filename = f"leads_{safe_title}_{safe_industry}.{format_type}"
-        filepath = os.path.join(temp_dir, filename)
+        try:
+            combinations = expand_criteria(data)
+            formats = parse_formats(data)
+            format_type = parse_format(data, formats)
+            max_results = parse_max_results(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if not combinations:
+            return jsonify({
+                'error': 'Please provide combinations or at least one of titles, industries, countries'
+            }), 400
         
-        app.logger.info(f"💾 Exporting {len(leads)} leads to {filename}")
-        export_data(leads, filepath, format_type)
+        payload = {
+            'combinations': combinations,
+            'format': format_type,
+            'formats': formats,
+            'bundle': bool(data.get('bundle')),
+            'max_results': max_results,
+            'new_only': bool(data.get('new_only')),
+            'request_id': g.request_id
+        }
+        job = job_queue.submit(run_bulk_job, payload)
+        app.logger.info(f"📥 Queued bulk job {job['id']}: {len(combinations)} combinations")
         
-        return jsonify({
-            'message': f'✅ Successfully generated {len(leads)} leads',
-            'download_url': f'/download/{filename}',
-            'leads_count': len(leads),
-            'leads_preview': leads[:5]  # Preview first 5 leads
-        })
+        status = job_status(job)
+        status['combinations'] = len(combinations)
+        return jsonify(status), 202
         
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
-        app.logger.error(f"❌ Error generating leads: {str(e)}")
+        app.logger.error(f"❌ Error starting bulk job: {str(e)}")
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found. It may have expired.'}), 404
+    return jsonify(job_status(job))
+
+@app.route('/jobs/<job_id>/result')
+def get_job_result(job_id):
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found. It may have expired.'}), 404
+    if job['status'] == DONE:
+        return jsonify(public_result(job))
+    if job['status'] == FAILED:
+        return jsonify({'error': job['error']}), 404 if job.get('error_kind') == NOT_FOUND else 500
+    return jsonify(job_status(job)), 202
+
+@app.route('/jobs/<job_id>/events')
+def job_event_stream(job_id):
+    """Server-Sent Events feed of a job's progress, for EventSource clients"""
+    if not job_queue.get(job_id):
+        return jsonify({'error': 'Job not found. It may have expired.'}), 404
+    
+    def sse():
+        for event in job_events(job_id):
+            yield f"event: {event['type']}\ndata: {app.json.dumps(event)}\n\n"
+    
+    return Response(
+        stream_with_context(sse()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def job_events(job_id, forward_leads=True):
+    """Events of a job as they happen: queued, stage/progress/lead, then done or error
+
+    Jobs running in this process are followed live; otherwise the store is
+    polled. If no lead was sent live (e.g. the leads came from the cache),
+    the result's leads are sent before the done event.
+    """
+    yield {'type': 'queued', 'job_id': job_id, 'status_url': f'/jobs/{job_id}',
+           'result_url': f'/jobs/{job_id}/result'}
+    sent = 0
+    channel = job_queue.progress(job_id)
+    if channel is not None:
+        for event in channel.follow(heartbeat=STREAM_HEARTBEAT):
+            if event is None:
+                yield {'type': 'heartbeat'}
+            elif event['type'] != 'lead':
+                yield event
+            elif forward_leads:
+                sent += 1
+                yield event
+    
+    job = job_queue.get(job_id)
+    while job and job['status'] not in (DONE, FAILED):
+        time.sleep(1)
+        yield {'type': 'heartbeat'}
+        job = job_queue.get(job_id)
+    
+    if not job:
+        yield {'type': 'error', 'error': 'Job not found. It may have expired.'}
+    elif job['status'] == FAILED:
+        yield {'type': 'error', 'error': job['error']}
+    else:
+        if not sent:
+            for count, lead in enumerate(job['result']['leads'], 1):
+                yield {'type': 'lead', 'lead': lead, 'count': count}
+        result = public_result(job)
+        result.pop('leads_preview', None)
+        result['type'] = 'done'
+        yield result
+
+@app.route('/jobs/<job_id>/export')
+def export_job(job_id):
+    """Stream a finished job's leads as CSV/TXT/VCF while they are being written"""
+    job = job_queue.get(job_id)
+    if not job or job['status'] != DONE:
+        return jsonify({'error': 'No finished job with that id. It may have expired.'}), 404
+    
+    format_type = request.args.get('format', job['payload']['format'])
+    if format_type not in STREAM_WRITERS:
+        return jsonify({'error': f'Streaming is available for {", ".join(STREAM_WRITERS)}'}), 400
+    
+    writer, mimetype = STREAM_WRITERS[format_type]
+    try:
+        chunks = writer(job['result']['leads'])
+    except ImportError as e:
+        return jsonify({'error': f'{format_type} export is unavailable: {e}'}), 501
+    
+    return Response(
+        stream_with_context(counted_export(chunks, format_type)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=leads_{job_id[:10]}.{format_type}'}
+    )
+
+def counted_export(chunks, format_type):
+    """Pass streamed export chunks through, timing the export and counting its bytes"""
+    with timed(f'export_{format_type}'):
+        for chunk in chunks:
+            BYTES.inc(len(chunk.encode('utf-8')), kind=f'export_{format_type}')
+            yield chunk
+
+def parse_timestamp(value):
+    """Unix timestamp or ISO 8601 date/time from a query parameter; raises ValueError"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+def lead_filters(args):
+    """Lead store filters from query parameters; raises ValueError"""
+    filters = {field: args[field].strip() for field in LEAD_FILTERS if args.get(field, '').strip()}
+    for name in ('since', 'until'):
+        timestamp = parse_timestamp(args.get(name))
+        if timestamp is not None:
+            filters[name] = timestamp
+    return filters
+
+@app.route('/leads')
+def query_leads():
+    """Stored leads matching the filters, most recently seen first, one page at a time
+
+    Filters: industry, country, title, source (exact match) and since/until
+    (found at or after / before). Pass next_cursor back as cursor for the
+    next page. With format=csv|txt|vcf|xlsx|pdf the whole filtered view is
+    downloaded instead.
+    """
+    store = get_lead_store()
+    if store is None:
+        return jsonify({'error': 'The lead store is disabled'}), 404
+    try:
+        filters = lead_filters(request.args)
+        cursor = int(request.args['cursor']) if request.args.get('cursor') else None
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({'error': 'cursor and limit must be integers, since and until timestamps or ISO 8601 dates'}), 400
+
+    format_type = request.args.get('format')
+    if format_type:
+        return export_stored_leads(store, filters, format_type)
+
+    with timed('lead_query'):
+        leads, next_cursor = store.page(filters, cursor, limit)
+    body = {'leads': leads, 'count': len(leads), 'next_cursor': None, 'next_url': None}
+    if next_cursor is not None:
+        body['next_cursor'] = str(next_cursor)
+        body['next_url'] = f"/leads?{urlencode({**request.args.to_dict(), 'cursor': next_cursor})}"
+    return jsonify(body)
+
+def export_stored_leads(store, filters, format_type):
+    """Download every stored lead matching the filters (up to LEAD_EXPORT_MAX)"""
+    if format_type not in EXPORT_FORMATS:
+        return jsonify({'error': f'format must be one of {", ".join(EXPORT_FORMATS)}'}), 400
+    name = download_name(format_type, filters.get('industry', ''), filters.get('country', ''))
+    leads = store.iter_leads(filters, limit=LEAD_EXPORT_MAX)
+
+    # Text formats stream page by page straight from the store
+    if format_type in STREAM_WRITERS:
+        writer, mimetype = STREAM_WRITERS[format_type]
+        try:
+            chunks = writer(leads)
+        except ImportError as e:
+            return jsonify({'error': f'{format_type} export is unavailable: {e}'}), 501
+        return Response(
+            stream_with_context(counted_export(chunks, format_type)),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename={name}'}
+        )
+
+    leads = list(leads)
+    if not leads:
+        return jsonify({'error': 'No stored leads match these filters'}), 404
+    filepath = artifact_store.get_or_create(leads, format_type, file_writer(leads, format_type))
+    return redirect(download_url(filepath, name))
+
 @app.route('/download/<filename>')
 def download_file(filename):
     try:
-        temp_dir = tempfile.gettempdir()
-        filepath = os.path.join(temp_dir, filename)
-        
-        if not os.path.exists(filepath):
+        filepath = artifact_store.path_for(filename)
+        if not filepath:
             return jsonify({'error': 'File not found. It may have expired.'}), 404
-            
-        return send_file(
+        artifact_store.touch(filepath)
+        
+        # Keep the friendly name if it has the artifact's extension
+        name = os.path.basename(request.args.get('name', ''))
+        if not name.endswith(os.path.splitext(filename)[1]):
+            name = filename
+        
+        # Content-addressed: the hash in the name is a strong ETag, and
+        # conditional=True answers If-None-Match with 304 and Range with 206
+        response = send_file(
             filepath,
             as_attachment=True,
-            download_name=filename
+            download_name=name,
+            conditional=True,
+            etag=filename.split('_', 1)[1].split('.', 1)[0],
+            max_age=artifact_store.ttl
         )
+        # Exports hold personal contact details: the browser may keep them, shared proxies may not
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/health')
 def health_check():
-    return jsonify({'status': 'healthy', 'message': 'Lead Generator is running'})
+    health = {'status': 'healthy', 'message': 'Lead Generator is running'}
+    cache = get_response_cache()
+    if cache is not None:
+        health['http_cache'] = cache.stats()
+    health['result_cache'] = result_cache.stats()
+    store = get_lead_store()
+    if store is not None:
+        health['lead_store'] = store.stats()
+    browser_pool = get_browser_pool()
+    if browser_pool is not None:
+        health['browser_pool'] = browser_pool.stats()
+    health['artifacts'] = artifact_store.stats()
+    scraper = peek_scraper()
+    if scraper is not None:
+        health['http_pool'] = scraper.connection_stats()
+    return jsonify(health)
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus text exposition of stage timings, byte counts, cache and error counters"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+def on_master_start():
+    """Gunicorn when_ready hook with preload_app: load heavy modules once, for every forked worker"""
+    warm_up()
+
+def on_worker_start():
+    """Gunicorn post_worker_init hook: load heavy modules and build the shared scraper before traffic arrives"""
+    warm_up()
+    get_scraper()
+    app.logger.info(f"🔌 Worker {os.getpid()} ready")
+
+def on_worker_exit():
+    """Gunicorn worker_exit hook: let running jobs finish, then close pooled connections"""
+    job_queue.shutdown(wait=True)
+    artifact_store.stop_sweeper()
+    close_export_pool()
+    close_scraper()
+    close_browser_pool()
+    app.logger.info(f"👋 Worker {os.getpid()} closed its connections")
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
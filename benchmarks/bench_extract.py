@@ -0,0 +1,53 @@
+"""Micro-benchmark: legacy multi-regex contact extraction vs the single-pass extractor
+
+Run from the repository root:
+    python -m benchmarks.bench_extract [--repeat N]
+"""
+import argparse
+import re
+import time
+
+from utils.extractor import extract_contacts
+from .fixtures import make_html_corpus
+
+
+def legacy_extract_contacts(text):
+    """The pre-extractor implementation, kept here as the baseline"""
+    phone_patterns = [
+        r'\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',
+        r'\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4}',
+        r'[0-9]{3}-[0-9]{3}-[0-9]{4}',
+    ]
+    phones = []
+    for pattern in phone_patterns:
+        phones.extend(re.findall(pattern, text))
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    emails = re.findall(email_pattern, text)
+    return list(set(phones)), list(set(emails))
+
+
+def best_time(func, text, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(text)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'page':<14}{'MB':>7}{'legacy ms':>12}{'engine ms':>12}{'speedup':>10}{'phones':>8}{'emails':>8}")
+    for name, html in make_html_corpus():
+        megabytes = len(html) / 1_000_000
+        legacy_time, _ = best_time(legacy_extract_contacts, html, args.repeat)
+        engine_time, (phones, emails) = best_time(extract_contacts, html, args.repeat)
+        print(f"{name:<14}{megabytes:>7.2f}{legacy_time * 1000:>12.1f}{engine_time * 1000:>12.1f}"
+              f"{legacy_time / engine_time:>9.2f}x{len(phones):>8}{len(emails):>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Memory benchmark: Lead (__slots__) records vs the old 9-key lead dicts
+
+Run from the repository root:
+    python -m benchmarks.bench_lead_memory [--count N]
+"""
+import argparse
+import tracemalloc
+
+from utils.models import LEAD_FIELDS, Lead
+
+
+def make_values(i):
+    # Distinct strings per lead, as real scraped data would have
+    return (f"First{i} Last{i}", "CEO", f"Company {i} Ltd", f"+4930{i:09d}", f"lead{i}@company{i}.de",
+            f"https://www.company{i}.de", "Technology", "Germany", "Enhanced Search")
+
+
+def measure(build, count):
+    """Bytes allocated per lead by build(values) over count leads, excluding the field strings"""
+    values = [make_values(i) for i in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    leads = [build(v) for v in values]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del leads
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200_000)
+    args = parser.parse_args()
+
+    as_dict = measure(lambda v: dict(zip(LEAD_FIELDS, v)), args.count)
+    as_lead = measure(lambda v: Lead(*v), args.count)
+
+    print(f"{args.count:,} leads (container overhead only, shared field strings excluded)")
+    print(f"{'dict':<8}{as_dict:>10.1f} bytes/lead{as_dict * args.count / 1e6:>10.1f} MB")
+    print(f"{'Lead':<8}{as_lead:>10.1f} bytes/lead{as_lead * args.count / 1e6:>10.1f} MB")
+    print(f"saving  {1 - as_lead / as_dict:>10.1%}")
+
+
+if __name__ == '__main__':
+    main()
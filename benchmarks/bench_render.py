@@ -0,0 +1,69 @@
+"""Headless-browser fallback against a local fixture server
+
+Scrapes plain sites (contacts in the HTML) and script sites (contacts added
+by JavaScript after load) twice: static fetches only, then with a
+BrowserPool behind them. Reports how many sites yielded contacts, how many
+were rendered, the time taken, and how many image/font requests reached the
+server (0 when resource blocking works). Needs Chrome and selenium; set
+BROWSER_BINARY / BROWSER_DRIVER_PATH if Selenium Manager cannot find them.
+
+Run from the repository root:
+    python -m benchmarks.bench_render [--sites N] [--pool-size N] [--recycle-after N]
+"""
+import argparse
+import os
+import time
+
+from .fixture_server import FixtureServer
+
+
+def run(scraper, urls):
+    started = time.perf_counter()
+    found = rendered = 0
+    for url in urls:
+        data = scraper.scrape_website_contacts(url, country='United Kingdom')
+        if data and (data['phones'] or data['emails']):
+            found += 1
+        if data and data.get('rendered'):
+            rendered += 1
+    return found, rendered, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sites', type=int, default=20, help='plain sites and script sites each')
+    parser.add_argument('--pool-size', type=int, default=2)
+    parser.add_argument('--recycle-after', type=int, default=10)
+    parser.add_argument('--no-blocking', action='store_true', help='let browsers load images and fonts')
+    args = parser.parse_args()
+
+    os.environ.setdefault('HTTP_CACHE_ENABLED', '0')
+    os.environ.setdefault('ENRICH_ENABLED', '0')
+    os.environ.setdefault('LEAD_STORE_ENABLED', '0')
+    from utils.browser import BrowserPool, chrome_driver
+    from utils.scraper import IntelligentLeadScraper
+
+    with FixtureServer(sites=args.sites, page_bytes=20_000) as server:
+        scraper = IntelligentLeadScraper(search_backends='fixture')
+        pool = BrowserPool(size=args.pool_size, recycle_after=args.recycle_after,
+                           driver_factory=lambda: chrome_driver(block_resources=not args.no_blocking,
+                                                                binary=os.environ.get('BROWSER_BINARY'),
+                                                                driver_path=os.environ.get('BROWSER_DRIVER_PATH')))
+        cases = [('plain', server.site_urls(args.sites)), ('script', server.script_site_urls(args.sites))]
+        print(f"{'sites':<8}{'mode':<10}{'with contacts':>15}{'rendered':>10}{'seconds':>10}{'assets':>8}")
+        try:
+            for mode, browser_pool in (('static', None), ('browser', pool)):
+                scraper.browser_pool = browser_pool
+                for name, urls in cases:
+                    assets = server.asset_requests
+                    found, rendered, seconds = run(scraper, urls)
+                    print(f"{name:<8}{mode:<10}{found:>10}/{len(urls):<4}{rendered:>10}{seconds:>10.2f}"
+                          f"{server.asset_requests - assets:>8}")
+            print(f"pool: {pool.stats()}")
+        finally:
+            pool.close()
+            scraper.close()
+
+
+if __name__ == '__main__':
+    main()
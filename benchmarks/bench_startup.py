@@ -0,0 +1,86 @@
+"""Startup benchmark: import cost of each heavy dependency and of app.py itself
+
+Every module is imported in a fresh interpreter under -X importtime, so
+costs are cold (modules that share dependencies each pay for them). The
+app row also lists which heavy modules `import app` loaded.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [--repeat N] [--modules flask,requests,...]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies from pyproject.toml, then the utils modules that pull them in
+MODULES = (
+    'flask', 'requests', 'urllib3', 'bs4', 'openpyxl', 'fpdf', 'vobject', 'pdfplumber',
+    'selenium.webdriver', 'webdriver_manager', 'numpy', 'dns.resolver',
+    'utils.http_cache', 'utils.scraper', 'utils.exporter',
+)
+HEAVY = ('requests', 'urllib3', 'bs4', 'openpyxl', 'fpdf', 'vobject', 'pdfplumber', 'selenium', 'numpy')
+
+REPORT_LOADED = f"import sys, json; print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+
+
+def import_seconds(module, extra=''):
+    """(seconds, stdout) for importing module in a fresh interpreter, or (None, error)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}; {extra}'],
+        cwd=ROOT, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=ROOT, WARMUP_MODULES='')
+    )
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    # Lines look like "import time:  self [us] | cumulative | name"; the top level module has no indent
+    for line in reversed(result.stderr.splitlines()):
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].rstrip() == f' {module}':
+            return int(parts[1]) / 1e6, result.stdout
+    return None, 'no importtime line'
+
+
+def best_of(module, repeat, extra=''):
+    best = None
+    output = ''
+    for _ in range(repeat):
+        seconds, output = import_seconds(module, extra)
+        if seconds is None:
+            return None, output
+        best = seconds if best is None else min(best, seconds)
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='imports per module; the fastest is reported')
+    parser.add_argument('--modules', help='comma-separated modules instead of the default list')
+    parser.add_argument('-o', '--output', help='also write the results to this JSON file')
+    args = parser.parse_args()
+
+    modules = args.modules.split(',') if args.modules else MODULES
+    results = {}
+    print(f"{'module':<22}{'import ms':>12}")
+    for module in modules:
+        seconds, error = best_of(module, args.repeat)
+        results[module] = seconds
+        print(f"{module:<22}{seconds * 1000:>12.1f}" if seconds is not None else f"{module:<22}{'-':>12}  {error}")
+
+    seconds, output = best_of('app', args.repeat, REPORT_LOADED)
+    results['app'] = seconds
+    if seconds is None:
+        print(f"{'app':<22}{'-':>12}  {output}")
+    else:
+        heavy = json.loads(output.strip().splitlines()[-1])
+        print(f"{'app':<22}{seconds * 1000:>12.1f}  loads: {', '.join(heavy) or 'none of ' + ', '.join(HEAVY)}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'import_seconds': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
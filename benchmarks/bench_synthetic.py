@@ -0,0 +1,85 @@
+"""Throughput benchmark: per-lead synthetic generation loop vs batched generation
+
+Run from the repository root:
+    python -m benchmarks.bench_synthetic [--count N] [--csv-count N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from utils import synthetic
+from utils.models import Lead
+
+COUNTRY_INFO = {"code": "+49", "tld": "de"}
+
+
+def legacy_generate(industry, country, count):
+    """The pre-batching implementation, kept here as the baseline"""
+    leads = []
+    suffixes = ["GmbH", "AG", "Group"]
+    for i in range(count):
+        first_names = ["Thomas", "Michael", "Andreas", "Stefan", "Christian"]
+        last_names = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber"]
+        first_name = random.choice(first_names)
+        last_name = random.choice(last_names)
+        leads.append(Lead(
+            name=f"{first_name} {last_name}",
+            title="CEO",
+            company=f"{industry} {random.choice(['Global', 'International', 'Solutions'])} {random.choice(suffixes)}",
+            phone=f"{COUNTRY_INFO['code']}{random.randint(100000000, 999999999)}",
+            email=f"{first_name.lower()}.{last_name.lower()}@{industry.lower().replace(' ', '')}.{COUNTRY_INFO['tld']}",
+            website=f"https://www.{industry.lower().replace(' ', '')}.{COUNTRY_INFO['tld']}",
+            industry=industry,
+            location=country,
+            source='Enhanced Search'
+        ))
+    return leads
+
+
+def rows_per_second(func, count):
+    started = time.perf_counter()
+    func(count)
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200_000)
+    parser.add_argument('--csv-count', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    numpy = synthetic._numpy
+    cases = [
+        ('legacy loop', lambda n: legacy_generate('Technology', 'Germany', n)),
+        ('batched leads', lambda n: synthetic.generate_leads('Technology', 'Germany', n, COUNTRY_INFO, seed=1)),
+        ('batched columns', lambda n: synthetic.generate_columns('Technology', 'Germany', n, COUNTRY_INFO, seed=1)),
+    ]
+    if numpy() is not None:
+        synthetic._numpy = lambda: None
+        synthetic._tables.cache_clear()
+        python_columns = rows_per_second(
+            lambda n: synthetic.generate_columns('Technology', 'Germany', n, COUNTRY_INFO, seed=1), args.count)
+        synthetic._numpy = numpy
+        synthetic._tables.cache_clear()
+    else:
+        python_columns = None
+
+    print(f"numpy: {'yes' if numpy() is not None else 'no'}, {args.count:,} rows")
+    print(f"{'mode':<22}{'rows/sec':>14}")
+    for name, func in cases:
+        print(f"{name:<22}{rows_per_second(func, args.count):>14,.0f}")
+    if python_columns is not None:
+        print(f"{'columns (no numpy)':<22}{python_columns:>14,.0f}")
+
+    path = os.path.join(tempfile.gettempdir(), 'bench_synthetic.csv')
+    rate = rows_per_second(
+        lambda n: synthetic.write_synthetic(path, 'csv', 'Technology', 'Germany', n, COUNTRY_INFO, seed=1),
+        args.csv_count)
+    print(f"{'csv to disk':<22}{rate:>14,.0f}  ({args.csv_count:,} rows, {os.path.getsize(path) / 1e6:.0f} MB)")
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Throughput benchmark: built-in vCard and PDF table writers vs the vobject/FPDF paths
+
+Run from the repository root:
+    python -m benchmarks.bench_writers [--count N] [--library-count N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from utils import exporter
+from utils.synthetic import generate_leads
+
+COUNTRY_INFO = {"code": "+44", "tld": "co.uk"}
+
+
+def leads_per_second(export, leads, path):
+    started = time.perf_counter()
+    export(leads, path)
+    rate = len(leads) / (time.perf_counter() - started)
+    size = os.path.getsize(path)
+    os.remove(path)
+    return rate, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100_000, help='leads for the built-in writers')
+    parser.add_argument('--library-count', type=int, default=5_000, help='leads for the vobject/FPDF writers')
+    args = parser.parse_args()
+
+    leads = generate_leads('Technology', 'United Kingdom', args.count, COUNTRY_INFO, seed=1)
+    library_leads = leads[:args.library_count]
+    directory = tempfile.mkdtemp(prefix='bench_writers_')
+
+    def with_settings(export, **settings):
+        def run(leads, path):
+            previous = {name: getattr(exporter, name) for name in settings}
+            for name, value in settings.items():
+                setattr(exporter, name, value)
+            try:
+                export(leads, path)
+            finally:
+                for name, value in previous.items():
+                    setattr(exporter, name, value)
+        return run
+
+    cases = [
+        ('vcf', 'vobject', library_leads, with_settings(exporter.export_vcf, VCARD_WRITER='vobject')),
+        ('vcf', 'native 3.0', leads, with_settings(exporter.export_vcf, VCARD_WRITER='native', VCARD_VERSION='3.0')),
+        ('vcf', 'native 4.0', leads, with_settings(exporter.export_vcf, VCARD_WRITER='native', VCARD_VERSION='4.0')),
+        ('pdf', 'fpdf records', library_leads, with_settings(exporter.export_pdf, PDF_LAYOUT='records')),
+        ('pdf', 'native table', leads, with_settings(exporter.export_pdf, PDF_LAYOUT='table')),
+    ]
+
+    print(f"{'format':<8}{'writer':<16}{'leads':>10}{'leads/sec':>14}{'MB':>9}{'speedup':>10}")
+    baseline = {}
+    for format_type, writer, case_leads, export in cases:
+        path = os.path.join(directory, f'leads.{format_type}')
+        rate, size = leads_per_second(export, case_leads, path)
+        baseline.setdefault(format_type, rate)
+        print(f"{format_type:<8}{writer:<16}{len(case_leads):>10,}{rate:>14,.0f}{size / 1e6:>9.1f}"
+              f"{rate / baseline[format_type]:>9.1f}x")
+    os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""Local HTTP server replaying company pages and search-result pages for offline benchmarks
+
+Pages are rendered once at startup from a seed, so every run serves the
+same bytes. Routes:
+
+    /site/<n>/                 company landing page (links to contact/about)
+    /site/<n>/contact, /about  contact pages with phones and emails
+    /spa/<n>/                  landing page whose contacts only exist after JavaScript runs
+    /assets/<name>             images and fonts the /spa pages load (counted in asset_requests)
+    /google/search?q=&start=   div.g h3 results
+    /bing/search?q=&first=     li.b_algo h2 results
+    /ddg/html/?q=&s=           h2.result__title a results
+"""
+import hashlib
+import html
+import http.server
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+from .fixtures import make_html_page
+
+RESULTS_PER_QUERY = 60
+
+SEARCH_LAYOUTS = {
+    'google': ('start', 0, 10, '<div class="g"><h3>{title}</h3><span>{snippet}</span></div>'),
+    'bing': ('first', 1, 10, '<li class="b_algo"><h2><a href="#">{title}</a></h2><p>{snippet}</p></li>'),
+    'ddg': ('s', 0, 30, '<div class="result"><h2 class="result__title">'
+                        '<a class="result__a" href="#">{title}</a></h2></div>'),
+}
+
+
+def make_contact_page(n):
+    return (f"<html><head><title>Contact | Company {n}</title></head><body>"
+            f"<h1>Contact us</h1><p>Sales: sales{n}@company{n}.example / +44 20 7946 {n % 10000:04d}</p>"
+            f"<p>Support: support{n}@company{n}.example, (555) 010-{n % 10000:04d}</p>"
+            f"<a href=\"/site/{n}/\">Home</a></body></html>")
+
+
+def make_script_page(n):
+    """A page whose static HTML has no contacts: a script adds them after load, next to an image and a font"""
+    return (f"<html><head><title>Company {n} App</title>"
+            f"<style>@font-face {{ font-family: brand; src: url(/assets/brand{n}.woff2); }}"
+            f" body {{ font-family: brand; }}</style></head><body>"
+            f"<img src=\"/assets/logo{n}.png\"><div id=\"app\">Loading...</div>"
+            f"<script>window.addEventListener('load', function () {{ setTimeout(function () {{"
+            f" document.getElementById('app').innerHTML = '<h1>Contact us</h1>"
+            f"<p>Sales: sales{n}@spa{n}.example / +44 20 7946 {n % 10000:04d}</p>'; }}, 100); }});</script>"
+            f"</body></html>")
+
+
+def make_landing_page(n, size_bytes):
+    page = make_html_page(size_bytes, seed=n)
+    # make_html_page links to /about and /contact at the root - keep them inside this site
+    return (page.replace('href="/about"', f'href="/site/{n}/about"')
+                .replace('href="/contact"', f'href="/site/{n}/contact"'))
+
+
+def search_titles(engine, query):
+    """Deterministic result titles for a query; engines overlap so rank fusion has work to do"""
+    digest = int(hashlib.sha1(query.encode('utf-8')).hexdigest()[:8], 16)
+    offset = {'google': 0, 'bing': 5, 'ddg': 10}[engine]
+    return [f"Company {(digest + offset + i) % 100000} Ltd" for i in range(RESULTS_PER_QUERY)]
+
+
+def make_search_page(engine, query, position):
+    param, first, per_page, template = SEARCH_LAYOUTS[engine]
+    start = max(0, position - first)
+    titles = search_titles(engine, query)[start:start + per_page]
+    items = ''.join(template.format(title=html.escape(title), snippet='Contact email phone')
+                    for title in titles)
+    return f"<html><head><title>{html.escape(query)}</title></head><body>{items}</body></html>"
+
+
+class FixtureServer:
+    """Threaded HTTP server on 127.0.0.1 serving deterministic fixture pages
+
+    Use as a context manager; base_url is set once it is listening.
+    """
+
+    def __init__(self, sites=100, page_bytes=50_000):
+        self.sites = sites
+        self.pages = {}
+        for n in range(sites):
+            self.pages[f'/site/{n}/'] = make_landing_page(n, page_bytes).encode('utf-8')
+            contact = make_contact_page(n).encode('utf-8')
+            self.pages[f'/site/{n}/contact'] = contact
+            self.pages[f'/site/{n}/about'] = contact
+            self.pages[f'/spa/{n}/'] = make_script_page(n).encode('utf-8')
+        self.requests = 0
+        self.asset_requests = 0
+        self._server = None
+        self.base_url = None
+
+    def site_urls(self, count):
+        return [f'{self.base_url}/site/{n % self.sites}/' for n in range(count)]
+
+    def script_site_urls(self, count):
+        return [f'{self.base_url}/spa/{n % self.sites}/' for n in range(count)]
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_HEAD(self):
+                self.do_GET(head=True)
+
+            def do_GET(self, head=False):
+                fixture.requests += 1
+                parts = urlsplit(self.path)
+                if parts.path.startswith('/assets/'):
+                    fixture.asset_requests += 1
+                    self.send_response(200)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body = fixture.pages.get(parts.path)
+                if body is None:
+                    body = fixture._search(parts)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                if not head:
+                    self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _search(self, parts):
+        engine = {'/google/search': 'google', '/bing/search': 'bing', '/ddg/html/': 'ddg'}.get(parts.path)
+        if engine is None:
+            return None
+        params = parse_qs(parts.query)
+        param = SEARCH_LAYOUTS[engine][0]
+        position = int(params.get(param, ['0'])[0] or 0)
+        return make_search_page(engine, params.get('q', [''])[0], position).encode('utf-8')
+
+    def search_urls(self):
+        return {
+            'google': f'{self.base_url}/google/search',
+            'bing': f'{self.base_url}/bing/search',
+            'duckduckgo': f'{self.base_url}/ddg/html/',
+        }
+
+    def __enter__(self):
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self.base_url = f'http://127.0.0.1:{self._server.server_port}'
+        threading.Thread(target=self._server.serve_forever, name='fixture-server', daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,41 @@
+"""Deterministic fixture data shared by the benchmarks"""
+import random
+
+FIRST_NAMES = ["James", "John", "Anna", "Maria", "Thomas", "Yuki", "Pierre", "Chen"]
+WORDS = ("our team delivers industry leading solutions for enterprise customers across "
+         "europe asia and the americas with a focus on quality service and innovation").split()
+
+
+def make_html_page(size_bytes, seed=0, contact_every=40):
+    """Build a company-style HTML page of roughly size_bytes with contacts sprinkled in"""
+    rng = random.Random(seed)
+    parts = [
+        "<!DOCTYPE html><html><head><title>Acme Holdings | Home</title>",
+        "<style>body { font-family: Arial; } .hero { color: #333; }</style>",
+        "<script>var tracking = {id: 'UA-000000-1', phone: '555-000-0000'};</script>",
+        "</head><body><nav><a href=\"/about\">About</a> <a href=\"/contact\">Contact</a></nav>",
+    ]
+    size = sum(len(p) for p in parts)
+    block = 0
+    while size < size_bytes:
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 60)))
+        if block % contact_every == 0:
+            name = rng.choice(FIRST_NAMES).lower()
+            words += (f" Contact {name}.{block}@acme-holdings.com or call "
+                      f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+                      f" / +49 30 {rng.randint(1000000, 9999999)}")
+        if block % 25 == 0:
+            words = f"<script>window.data{block} = '{words}';</script>"
+        else:
+            words = f"<div class=\"section\"><p>{words}</p></div>"
+        parts.append(words)
+        size += len(words)
+        block += 1
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def make_html_corpus(sizes=(250_000, 1_000_000, 4_000_000), seed=0):
+    """A list of (name, html) pages of increasing size"""
+    return [(f"page_{size // 1000}kb", make_html_page(size, seed=seed + i))
+            for i, size in enumerate(sizes)]
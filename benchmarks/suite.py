@@ -0,0 +1,313 @@
+"""Offline benchmark suite for the scrape -> export pipeline
+
+Drives IntelligentLeadScraper.scrape_leads against a local fixture server,
+extract_contacts_from_text over generated pages, and every export_* function
+at several lead counts (plus export_many writing every format in one
+pass). Reports throughput, latency percentiles and peak RSS,
+and writes everything to JSON for comparing commits.
+
+Run from the repository root:
+    python -m benchmarks.suite [--sizes 10,1000,100000,1000000] [--repeat 5] [-o results.json]
+    python -m benchmarks.suite --only export --sizes 10,1000
+    python -m benchmarks.suite --compare before.json after.json
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from .fixture_server import FixtureServer
+from .fixtures import make_html_page
+
+EXPORT_FORMATS = ('csv', 'txt', 'vcf', 'xlsx', 'pdf')
+
+# Largest lead count each export format is run at unless --full is given
+EXPORT_SIZE_CAPS = {'pdf': 100_000, 'vcf': 100_000, 'xlsx': 100_000}
+
+
+def read_rss():
+    """Current resident set size in bytes (Linux /proc), or None"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class RssSampler:
+    """Track the peak RSS while a benchmark case runs, sampling on a helper thread"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start_rss = None
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, read_rss() or 0)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.start_rss = read_rss()
+        self.peak = self.start_rss or 0
+        if self.start_rss is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.peak = max(self.peak, read_rss() or 0)
+        else:
+            # No /proc: fall back to the process-wide high-water mark (KiB on Linux, bytes on macOS)
+            import resource
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak = maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def measure(suite, case, size, func, repeat, items, unit, **extra):
+    """Run func repeat times and summarise latency, throughput and peak RSS"""
+    durations = []
+    gc.collect()
+    with RssSampler() as rss:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - started)
+    median = percentile(durations, 50)
+    result = {
+        'suite': suite,
+        'case': case,
+        'size': size,
+        'runs': repeat,
+        'p50_ms': round(median * 1000, 3),
+        'p95_ms': round(percentile(durations, 95) * 1000, 3),
+        'p99_ms': round(percentile(durations, 99) * 1000, 3),
+        'min_ms': round(min(durations) * 1000, 3),
+        'throughput': round(items / median, 2) if median else None,
+        'unit': unit,
+        'peak_rss_mb': round(rss.peak / 1e6, 1),
+        'rss_growth_mb': round((rss.peak - rss.start_rss) / 1e6, 1) if rss.start_rss else None,
+    }
+    result.update(extra)
+    print(f"{suite:<8}{case:<22}{size:>10,}{result['p50_ms']:>12.1f}{result['p95_ms']:>12.1f}"
+          f"{result['throughput'] or 0:>16,.0f} {unit:<10}{result['peak_rss_mb']:>9.1f}", flush=True)
+    return result
+
+
+@contextlib.contextmanager
+def scratch_stores():
+    """Point the lead store and dedupe index at a temporary directory, so runs never touch the real ones"""
+    with tempfile.TemporaryDirectory(prefix='bench_stores_') as directory:
+        paths = {'LEAD_STORE_PATH': 'leads.db', 'DEDUPE_INDEX_PATH': 'dedupe.db'}
+        saved = {name: os.environ.get(name) for name in paths}
+        os.environ.update({name: os.path.join(directory, filename) for name, filename in paths.items()})
+        try:
+            yield directory
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def bench_scrape(args, results):
+    from utils.enrich import HostsResolver
+    from utils.scraper import IntelligentLeadScraper
+
+    with scratch_stores(), FixtureServer(sites=max(args.scrape_sites), page_bytes=args.page_bytes) as server:
+        scraper = IntelligentLeadScraper(search_backends='google,bing,duckduckgo', synthetic_seed=1)
+        for backend in scraper.search_engines.backends:
+            backend.base_url = server.search_urls()[backend.name]
+        if scraper.enricher is not None:
+            # Only the fixture server resolves, so enrichment never leaves the machine
+            scraper.enricher.resolver = HostsResolver({'127.0.0.1': server.base_url.split('//', 1)[1]})
+        scraper.crawler_options.update(per_host=args.concurrency, max_concurrency=args.concurrency,
+                                       host_delay=0)
+        try:
+            for sites in args.scrape_sites:
+                search_data = {
+                    'title': 'CEO',
+                    'industry': 'Technology',
+                    'country': 'United Kingdom',
+                    'website_urls': server.site_urls(sites),
+                }
+                leads = scraper.scrape_leads(search_data, max_results=sites + 100)
+                results.append(measure(
+                    'scrape', 'scrape_leads', sites,
+                    lambda: scraper.scrape_leads(search_data, max_results=sites + 100),
+                    args.repeat, len(leads), 'leads/s', leads=len(leads)))
+        finally:
+            scraper.close()
+
+
+def bench_extract(args, results):
+    from utils.scraper import IntelligentLeadScraper
+
+    scraper = IntelligentLeadScraper(search_backends='fixture')
+    try:
+        for size in args.page_sizes:
+            text = make_html_page(size, seed=size)
+            phones, emails = scraper.extract_contacts_from_text(text, 'United Kingdom')
+            results.append(measure(
+                'extract', 'extract_contacts', size,
+                lambda: scraper.extract_contacts_from_text(text, 'United Kingdom'),
+                args.repeat, len(text) / 1e6, 'MB/s', phones=len(phones), emails=len(emails)))
+    finally:
+        scraper.close()
+
+
+def bench_export(args, results):
+    from utils import exporter
+    from utils.synthetic import generate_leads
+
+    country_info = {'code': '+44', 'tld': 'co.uk'}
+    directory = tempfile.mkdtemp(prefix='bench_export_')
+    for size in args.sizes:
+        leads = generate_leads('Technology', 'United Kingdom', size, country_info, seed=size)
+        # Big exports take seconds each - one run is enough to see them
+        repeat = args.repeat if size <= 10_000 else 1
+        for format_type in args.formats:
+            cap = EXPORT_SIZE_CAPS.get(format_type)
+            if cap and size > cap and not args.full:
+                print(f"{'export':<8}{'export_' + format_type:<22}{size:>10,}  skipped (over {cap:,}, use --full)")
+                continue
+            path = os.path.join(directory, f'leads_{size}.{format_type}')
+            export = getattr(exporter, f'export_{format_type}')
+            result = measure('export', f'export_{format_type}', size, lambda: export(leads, path),
+                             repeat, size, 'leads/s')
+            if os.path.exists(path):
+                result['output_bytes'] = os.path.getsize(path)
+                os.remove(path)
+            results.append(result)
+        if len(args.formats) > 1:
+            bench_export_many(args, results, leads, directory, repeat)
+        del leads
+    os.rmdir(directory)
+
+
+def bench_export_many(args, results, leads, directory, repeat):
+    """Every selected format from one pass over the leads, XLSX/PDF on the export process pool"""
+    from utils import exporter
+
+    size = len(leads)
+    formats = [f for f in args.formats
+               if args.full or not EXPORT_SIZE_CAPS.get(f) or size <= EXPORT_SIZE_CAPS[f]]
+    targets = {f: os.path.join(directory, f'leads_{size}_many.{f}') for f in formats}
+    pool = exporter.get_export_pool()
+    try:
+        exporter.export_many(leads[:10], targets, pool)  # start the worker processes outside the timing
+        results.append(measure('export', 'export_many', size, lambda: exporter.export_many(leads, targets, pool),
+                               repeat, size, 'leads/s', formats=formats))
+    finally:
+        exporter.close_export_pool()
+        for path in targets.values():
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': numpy_version,
+    }
+
+
+def compare(before_path, after_path):
+    """Print p50 latency and throughput changes between two result files"""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    old = {(r['suite'], r['case'], r['size']): r for r in before['results']}
+    print(f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}")
+    print(f"{'case':<24}{'size':>10}{'p50 before':>12}{'p50 after':>12}{'speedup':>10}")
+    for result in after['results']:
+        previous = old.get((result['suite'], result['case'], result['size']))
+        if previous is None:
+            continue
+        speedup = previous['p50_ms'] / result['p50_ms'] if result['p50_ms'] else 0
+        print(f"{result['case']:<24}{result['size']:>10,}{previous['p50_ms']:>12.1f}"
+              f"{result['p50_ms']:>12.1f}{speedup:>9.2f}x")
+
+
+def int_list(value):
+    return [int(part) for part in value.split(',') if part.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', default='scrape,extract,export', help='comma-separated suites to run')
+    parser.add_argument('--sizes', type=int_list, default=[10, 1000, 100_000, 1_000_000],
+                        help='lead counts for the export suite')
+    parser.add_argument('--formats', default=','.join(EXPORT_FORMATS))
+    parser.add_argument('--full', action='store_true', help='run slow formats at every size')
+    parser.add_argument('--scrape-sites', type=int_list, default=[10, 100],
+                        help='websites crawled per scrape_leads call')
+    parser.add_argument('--page-sizes', type=int_list, default=[10_000, 1_000_000, 10_000_000],
+                        help='page sizes in bytes for the extract suite')
+    parser.add_argument('--page-bytes', type=int, default=50_000, help='size of fixture landing pages')
+    parser.add_argument('--concurrency', type=int, default=16, help='crawler concurrency against the fixture server')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('-o', '--output', default='bench-results.json')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='compare two result files and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    # Measure the pipeline itself, not the on-disk response cache
+    os.environ.setdefault('HTTP_CACHE_ENABLED', '0')
+    args.formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    suites = {'scrape': bench_scrape, 'extract': bench_extract, 'export': bench_export}
+    selected = [name.strip() for name in args.only.split(',') if name.strip()]
+
+    print(f"{'suite':<8}{'case':<22}{'size':>10}{'p50 ms':>12}{'p95 ms':>12}{'throughput':>16} {'':<10}{'peak MB':>9}")
+    results = []
+    for name in selected:
+        suites[name](args, results)
+
+    with open(args.output, 'w') as f:
+        json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+    print(f"📊 {len(results)} results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# A job is polled through whichever worker gets the request, so with several
+# workers jobs must live in the shared SQLite store, not in one worker's memory
+if workers > 1:
+    if os.environ.get('JOB_STORE') == 'memory':
+        raise RuntimeError(f'JOB_STORE=memory keeps jobs in one worker; use JOB_STORE=sqlite with {workers} workers')
+    os.environ.setdefault('JOB_STORE', 'sqlite')
+# Import the app (and warm up its heavy modules) once in the master; workers fork with it loaded
+preload_app = os.environ.get('GUNICORN_PRELOAD', '0') == '1'
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from app import on_master_start
+        on_master_start()
+
+
+def post_worker_init(worker):
+    from app import on_worker_start
+    on_worker_start()
+
+
+def worker_exit(server, worker):
+    from app import on_worker_exit
+    on_worker_exit()
@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep every store the app opens out of the shared temp dir and off the network
+_state = tempfile.mkdtemp(prefix='lead_generator_tests_')
+os.environ.setdefault('ARTIFACT_DIR', os.path.join(_state, 'exports'))
+os.environ.setdefault('DEDUPE_INDEX_PATH', os.path.join(_state, 'dedupe.db'))
+os.environ.setdefault('LEAD_STORE_PATH', os.path.join(_state, 'leads.db'))
+os.environ.setdefault('HTTP_CACHE_ENABLED', '0')
+os.environ.setdefault('ENRICH_ENABLED', '0')
+os.environ.setdefault('WARMUP_MODULES', '')
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+import app as app_module
+from utils.jobs import DONE, FAILED
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def finished(job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = app_module.job_queue.get(job_id)
+        if job['status'] in (DONE, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+def test_job_result_is_404_when_nothing_was_found(client):
+    def no_leads(payload):
+        raise LookupError('No leads found for the given criteria.')
+
+    job_id = app_module.job_queue.submit(no_leads, {})['id']
+    finished(job_id)
+    response = client.get(f'/jobs/{job_id}/result')
+    assert response.status_code == 404
+    assert response.get_json()['error'] == 'No leads found for the given criteria.'
+
+
+def test_job_result_is_500_when_the_job_broke(client):
+    def broken(payload):
+        raise RuntimeError('boom')
+
+    job_id = app_module.job_queue.submit(broken, {})['id']
+    finished(job_id)
+    assert client.get(f'/jobs/{job_id}/result').status_code == 500
+
+
+@pytest.mark.parametrize('value', ['lots', '12.5', None, True, [10]])
+def test_bulk_rejects_a_non_numeric_max_results(client, value):
+    response = client.post('/bulk-generate-leads', json={'industries': ['Technology'], 'max_results': value})
+    assert response.status_code == 400
+    assert 'max_results' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('value, expected', [('20', 20), (0, 1), (10 ** 9, app_module.MAX_RESULTS)])
+def test_max_results_is_clamped(value, expected):
+    assert app_module.parse_max_results({'max_results': value}) == expected
+
+
+@pytest.mark.parametrize('endpoint, body', [
+    ('/generate-leads', {'industry': 'Technology', 'country': 'Germany'}),
+    ('/generate-leads/stream', {'industry': 'Technology', 'country': 'Germany'}),
+    ('/bulk-generate-leads', {'industries': ['Technology']}),
+])
+@pytest.mark.parametrize('format_type', ['exe', '../../etc/x', 5])
+def test_unknown_format_is_rejected(client, endpoint, body, format_type):
+    response = client.post(endpoint, json={**body, 'format': format_type})
+    assert response.status_code == 400
+    assert 'format' in response.get_json()['error']
+
+
+def test_format_is_normalized():
+    assert app_module.parse_format({'format': ' CSV '}) == 'csv'
+    assert app_module.parse_format({}) == 'xlsx'
+    assert app_module.parse_format({'format': 'exe'}, ['pdf']) == 'pdf'
+
+
+def test_downloads_are_not_cached_by_shared_proxies(client):
+    def write(path):
+        with open(path, 'w') as f:
+            f.write('Name\nAnn Lee\n')
+
+    path = app_module.artifact_store.get_or_create([{'name': 'Ann Lee'}], 'csv', write)
+    response = client.get(f'/download/{path.rsplit("/", 1)[1]}')
+    assert response.status_code == 200
+    assert response.cache_control.private and not response.cache_control.public
+    assert client.get(response.request.path, headers={'If-None-Match': response.headers['ETag']}).status_code == 304
@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+
+import pytest
+
+from utils.artifacts import ArtifactStore
+from utils.models import Lead
+
+LEADS = [Lead(name='Ann Lee', company='Acme', email='ann@acme.com')]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(str(tmp_path), ttl=60, max_bytes=1000)
+
+
+def write(content):
+    def export(path):
+        with open(path, 'w') as f:
+            f.write(content)
+    return export
+
+
+def listing(store):
+    return sorted(os.listdir(store.directory))
+
+
+def test_same_leads_reuse_one_artifact(store):
+    first = store.get_or_create(LEADS, 'csv', write('a'))
+    second = store.get_or_create(LEADS, 'csv', write('b'))
+    assert first == second
+    assert open(first).read() == 'a'
+    assert (store.created, store.reused) == (1, 1)
+
+
+def test_failed_export_leaves_nothing_behind(store):
+    def fail(path):
+        with open(path, 'w') as f:
+            f.write('half a file')
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        store.get_or_create(LEADS, 'csv', fail)
+    assert listing(store) == []
+
+
+def test_empty_export_is_not_stored(store):
+    with pytest.raises(RuntimeError):
+        store.get_or_create(LEADS, 'csv', write(''))
+    assert listing(store) == []
+
+
+def test_readers_never_see_a_partial_file(store):
+    started = threading.Event()
+
+    def slow(path):
+        with open(path, 'w') as f:
+            f.write('first half ')
+            started.set()
+            time.sleep(0.2)
+            f.write('second half')
+
+    result = []
+    writer = threading.Thread(target=lambda: result.append(store.get_or_create(LEADS, 'csv', slow)))
+    writer.start()
+    started.wait()
+    # Mid-write only the temporary file exists, under a name path_for refuses
+    assert all(name.startswith('.partial_') for name in listing(store))
+    assert all(store.path_for(name) is None for name in listing(store))
+    writer.join()
+    assert open(result[0]).read() == 'first half second half'
+
+
+def test_concurrent_requests_export_once(store):
+    calls = []
+
+    def export(path):
+        calls.append(path)
+        time.sleep(0.1)
+        write('x')(path)
+
+    threads = [threading.Thread(target=store.get_or_create, args=(LEADS, 'csv', export)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+
+def age(path, seconds):
+    at = time.time() - seconds
+    os.utime(path, (at, at))
+
+
+def test_sweep_removes_expired_artifacts_and_abandoned_partials(store):
+    old = store.get_or_create(LEADS, 'csv', write('old'))
+    fresh = store.get_or_create(LEADS, 'txt', write('fresh'))
+    partial = store._temp_path('pdf')
+    age(old, 120)
+    age(partial, 120)
+
+    store.sweep()
+    assert listing(store) == [os.path.basename(fresh)]
+    assert store.swept == 2
+
+
+def test_sweep_keeps_a_fresh_partial_write(store):
+    partial = store._temp_path('pdf')
+    store.sweep()
+    assert os.path.exists(partial)
+
+
+def test_sweep_drops_least_recently_used_until_under_budget(store):
+    paths = []
+    for index, format_type in enumerate(('csv', 'txt', 'vcf')):
+        paths.append(store.get_or_create(LEADS, format_type, write('x' * 400)))
+        age(paths[-1], 30 - index * 10)
+    # Reusing the oldest artifact makes it the most recently used
+    store.get_or_create(LEADS, 'csv', write('unused'))
+
+    store.sweep()
+    assert [os.path.exists(path) for path in paths] == [True, False, True]
+
+
+def test_fallback_export_is_cleaned_up(store, monkeypatch):
+    import sys
+    from utils.exporter import export_data
+
+    monkeypatch.setitem(sys.modules, 'openpyxl', None)   # XLSX export falls back to CSV
+    with pytest.raises(RuntimeError):
+        store.get_or_create(LEADS, 'xlsx', lambda path: export_data(LEADS, path, 'xlsx'))
+    assert listing(store) == []
@@ -0,0 +1,33 @@
+import contextvars
+
+from utils import bulk
+
+request_id = contextvars.ContextVar('request_id', default=None)
+
+
+def test_bulk_threads_run_in_the_callers_context(monkeypatch):
+    monkeypatch.setattr(bulk, '_scrape_one', lambda search_data, max_results: [
+        {'name': request_id.get(), 'email': f"{search_data['industry']}@example.com"}
+    ])
+    request_id.set('req-1')
+
+    leads, summary = bulk.run_bulk([{'industry': 'a'}, {'industry': 'b'}], workers=2)
+
+    assert {lead['name'] for lead in leads} == {'req-1'}
+    assert [row['found'] for row in summary] == [1, 1]
+
+
+def test_process_pool_never_forks(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    used = {}
+
+    def pool(max_workers, mp_context):
+        used['start_method'] = mp_context.get_start_method()
+        return ThreadPoolExecutor(max_workers)
+
+    monkeypatch.setattr(bulk, 'ProcessPoolExecutor', pool)
+    monkeypatch.setattr(bulk, '_scrape_one', lambda search_data, max_results: [])
+
+    bulk.run_bulk([{'industry': 'a'}], workers=1, executor='process')
+    assert used['start_method'] in ('forkserver', 'spawn')
@@ -0,0 +1,82 @@
+import requests
+
+from benchmarks.fixture_server import FixtureServer
+from utils.crawler import BatchCrawler, ContactPageCrawler
+
+
+def test_busy_host_does_not_starve_other_hosts():
+    with FixtureServer(sites=20, page_bytes=1000) as server:
+        port = server.base_url.rsplit(':', 1)[1]
+        busy = [f'http://127.0.0.1:{port}/site/{n}/contact' for n in range(10)]
+        other = f'http://localhost:{port}/site/0/contact'
+        crawler = BatchCrawler(requests.Session(), max_concurrency=2, per_host=1, host_delay=0.2, retries=0)
+
+        results = {result['url']: result for result in crawler.iter_crawl(busy + [other])}
+
+    assert all(result['status'] == 200 for result in results.values())
+    # The busy host needs ~2s (10 pages, 0.2s apart); the other host must not wait behind it
+    assert results[other]['elapsed'] < 0.5
+    assert max(results[url]['elapsed'] for url in busy) > 1.5
+
+
+class FakeResponse:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Answers every GET; pages listed in missing get a 404"""
+
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.fetched = []
+
+    def get(self, url, timeout=None, stream=False):
+        self.fetched.append(url)
+        return FakeResponse(404 if url in self.missing else 200)
+
+
+def test_contact_links_are_ranked_and_limited_to_the_site():
+    crawler = ContactPageCrawler(FakeSession())
+    links = crawler.discover_links('https://www.acme.com/', [
+        ('/about-us', 'About'),
+        ('https://www.acme.com/kontakt#form', 'Kontakt'),
+        ('/kontakt/', 'Kontakt'),                 # same page as above once normalized
+        ('https://acme.com/team', 'Team'),        # same site without www
+        ('https://other.com/contact', 'Contact'),  # another site
+        ('mailto:info@acme.com', 'Contact us'),
+        ('/products', 'Products'),
+        ('/en', 'Contact'),                       # matched on the link text
+    ])
+    # Ranked by keyword: contact, kontakt, about, team
+    assert links == ['https://www.acme.com/en', 'https://www.acme.com/kontakt', 'https://www.acme.com/about-us',
+                     'https://acme.com/team']
+
+
+def crawl(session, links_by_page, **options):
+    crawler = ContactPageCrawler(session, **options)
+    return crawler.crawl('https://acme.com/', lambda url, response: {'links': links_by_page.get(url, [])})
+
+
+SITE = {
+    'https://acme.com/': [('/contact', ''), ('/about', ''), ('/team', ''), ('/imprint', '')],
+    'https://acme.com/contact': [('/contact/sales', ''), ('/', '')],
+}
+
+
+def test_crawl_stops_at_max_pages():
+    session = FakeSession()
+    pages = crawl(session, SITE, max_depth=2, max_pages=3)
+    assert [url for url, _ in pages] == ['https://acme.com/', 'https://acme.com/contact', 'https://acme.com/about']
+    assert len(session.fetched) == 3
+
+
+def test_crawl_stops_at_max_depth_and_skips_failed_pages():
+    session = FakeSession(missing={'https://acme.com/about'})
+    pages = crawl(session, SITE, max_depth=1, max_pages=10)
+    assert [url for url, _ in pages] == ['https://acme.com/', 'https://acme.com/contact',
+                                         'https://acme.com/imprint', 'https://acme.com/team']
+    assert 'https://acme.com/contact/sales' not in session.fetched
@@ -0,0 +1,39 @@
+import pytest
+
+from utils.dedupe import DedupeIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    return DedupeIndex(str(tmp_path / 'dedupe.db'))
+
+
+def namesakes():
+    return [
+        {'name': 'Anna Schmidt', 'company': 'Müller Technik GmbH', 'location': 'Germany',
+         'email': 'anna@mueller-technik.de'},
+        {'name': 'Anna Schmidt', 'company': 'Müller Technik AG', 'location': 'Germany',
+         'email': 'a.schmidt@mueller-tech.de'},
+    ]
+
+
+def test_namesakes_in_one_batch_are_kept(index):
+    assert len(index.filter_new(namesakes())) == 2
+
+
+def test_same_contact_in_one_batch_is_dropped(index):
+    leads = namesakes()
+    leads[1]['email'] = leads[0]['email'].upper()
+    assert index.filter_new(leads) == leads[:1]
+
+
+def test_fuzzy_match_against_an_earlier_run(index):
+    first, second = namesakes()
+    assert index.filter_new([first]) == [first]
+    assert index.filter_new([second]) == []
+    assert index.is_duplicate(second)
+
+
+def test_unrelated_lead_is_new(index):
+    index.filter_new(namesakes())
+    assert not index.is_duplicate({'name': 'Anna Schmidt', 'company': 'Contoso', 'location': 'Germany'})
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from utils.enrich import UNCHECKED, VERIFIED, Enricher, HostsResolver, create_enricher
+from utils.exporter import iter_csv
+from utils.models import WEBSITE_SOURCE, Lead
+
+
+class CountingEnricher(Enricher):
+    def __init__(self, **kwargs):
+        super().__init__(session=None, resolver=HostsResolver({'acme.com': '127.0.0.1:1'}), **kwargs)
+        self.checked = []
+
+    def check_mail(self, domain):
+        self.checked.append(f'mail:{domain}')
+        return True
+
+    def check_website(self, host, url):
+        self.checked.append(f'http:{host}')
+        return True
+
+
+def crawled():
+    return Lead(email='info@acme.com', website='https://acme.com/contact', source=WEBSITE_SOURCE)
+
+
+def made_up():
+    return Lead(email='contact@acmeltd.com', website='https://www.acmeltd.com', source='Enhanced Search')
+
+
+def test_crawled_site_is_not_checked_again():
+    enricher = CountingEnricher()
+    [lead] = enricher.enrich([crawled()])
+    assert lead.verification == VERIFIED
+    assert enricher.checked == ['mail:acme.com']
+
+
+def test_made_up_domains_are_checked():
+    enricher = CountingEnricher()
+    [lead] = enricher.enrich([made_up()])
+    assert lead.verification == VERIFIED
+    assert sorted(enricher.checked) == ['http:www.acmeltd.com', 'mail:acmeltd.com']
+
+
+def test_made_up_domains_can_be_left_unchecked(monkeypatch):
+    monkeypatch.setenv('ENRICH_ENABLED', '1')
+    monkeypatch.setenv('ENRICH_SYNTHETIC', '0')
+    assert create_enricher(None).check_synthetic is False
+    enricher = CountingEnricher(check_synthetic=False)
+    [lead] = enricher.enrich([made_up()])
+    assert lead.verification == UNCHECKED
+    assert enricher.checked == []
+
+
+def test_verification_is_exported():
+    [lead] = CountingEnricher().enrich([crawled()])
+    header, row = ''.join(iter_csv([lead])).splitlines()
+    assert header.endswith(',Verification') and row.endswith(',verified')
+
+
+def test_enrichment_does_not_hold_up_the_next_batch(monkeypatch):
+    from utils.scraper import IntelligentLeadScraper
+
+    class SlowEnricher(CountingEnricher):
+        def enrich(self, leads):
+            time.sleep(0.2)
+            return super().enrich(leads)
+
+    def batches(search_data, max_results):
+        for index in range(5):
+            time.sleep(0.2)
+            yield [Lead(name=f'Lead {index}', email=f'lead{index}@acme.com', source=WEBSITE_SOURCE)]
+
+    scraper = IntelligentLeadScraper(search_backends='fixture')
+    scraper.enricher = SlowEnricher()
+    scraper.lead_store = None
+    monkeypatch.setattr(scraper, '_lead_batches', batches)
+    try:
+        started = time.monotonic()
+        leads = scraper.scrape_leads({}, max_results=10)
+        elapsed = time.monotonic() - started
+    finally:
+        scraper.close()
+
+    assert [lead.name for lead in leads] == [f'Lead {index}' for index in range(5)]
+    assert {lead.verification for lead in leads} == {VERIFIED}
+    assert elapsed == pytest.approx(1.2, abs=0.35)   # 2.0s when each batch waits for its enrichment
@@ -0,0 +1,91 @@
+import pytest
+
+from utils.extractor import StreamingExtraction, extract_contacts, normalize_phone
+from utils.html_stream import parse_html
+
+
+@pytest.mark.parametrize('html, dial_code, phone', [
+    ('<span>Tel</span><span>+49 30 1234567</span>', '+49', '+49301234567'),
+    ('<table><tr><td>Phone</td><td>(555) 123-4567</td></tr></table>', '+1', '+15551234567'),
+    ('<dl><dt>Call</dt><dd>+44 20 7946 0958</dd></dl>', '+44', '+442079460958'),
+    ('<p>Tel:<br>+44 20 7946 0958</p>', '+44', '+442079460958'),
+])
+def test_phone_in_its_own_element_is_found(html, dial_code, phone):
+    assert parse_html(html, dial_code)['phones'] == [phone]
+
+
+def test_email_next_to_a_label_element_is_found():
+    page = parse_html('<td>Email</td><td>sales@example.com</td><td>Web</td>')
+    assert page['emails'] == ['sales@example.com']
+    assert page['phones'] == []
+
+
+def test_script_and_style_text_is_ignored():
+    page = parse_html('<script>var phone = "+49 30 1234567";</script><style>a{}</style><p>none</p>')
+    assert page == {'title': '', 'phones': [], 'emails': [], 'links': []}
+
+
+def test_title_and_links():
+    page = parse_html('<title> Acme Ltd </title><a href="/contact">Contact <b>us</b></a>', collect_links=True)
+    assert page['title'] == 'Acme Ltd'
+    assert page['links'] == [('/contact', 'Contact us')]
+
+
+@pytest.mark.parametrize('text', [
+    'Order ID12345678901 shipped',       # digits glued to a word are not a phone
+    'write to 5551234567@example.com',   # digits that start an email address
+    'version 1.2.3.4',
+])
+def test_not_phones(text):
+    assert extract_contacts(text)[0] == []
+
+
+def test_email_before_and_after_text():
+    phones, emails = extract_contacts('Mail Info@Example.com or info@example.com, call +1 (555) 123-4567.')
+    assert emails == ['Info@Example.com']
+    assert phones == ['+15551234567']
+
+
+@pytest.mark.parametrize('raw, dial_code, expected', [
+    ('+49 30 1234567', None, '+49301234567'),
+    ('0044 20 7946 0958', None, '+442079460958'),
+    ('030 1234567', '+49', '+49301234567'),
+    ('1-555-123-4567', '+1', '+15551234567'),
+    ('12345', None, None),
+])
+def test_normalize_phone(raw, dial_code, expected):
+    assert normalize_phone(raw, dial_code) == expected
+
+
+def test_streaming_extraction_matches_one_pass_across_piece_boundaries():
+    text = ('filler text ' * 20 + 'Call +44 20 7946 0958 or mail sales@example.co.uk. ') * 50
+    expected = extract_contacts(text, '+44')
+    for piece_size in (7, 64, 1000):
+        extraction = StreamingExtraction(dial_code='+44', chunk_size=512, overlap=64)
+        for i in range(0, len(text), piece_size):
+            extraction.feed(text[i:i + piece_size])
+        assert extraction.close() == expected
+
+
+def test_national_numbers_are_kept_as_written_without_a_country():
+    assert extract_contacts('Telefon: 030 1234567, Fax 089 123-4567') == (['030 1234567', '089 123-4567'], [])
+    assert normalize_phone('030 1234567') is None
+    assert extract_contacts('Call +49 30 1234567') == (['+49301234567'], [])
+
+
+@pytest.mark.parametrize('url, dial_code', [
+    ('https://www.mueller.de/kontakt', '+49'),
+    ('https://shop.example.co.uk/', '+44'),
+    ('https://acme.com.au/', '+61'),
+    ('https://acme.com/', None),        # generic TLD: no country
+    ('https://acme.xyz/', None),
+])
+def test_dial_code_from_the_site_tld(url, dial_code):
+    from utils.scraper import IntelligentLeadScraper
+
+    scraper = IntelligentLeadScraper(search_backends='fixture')
+    try:
+        assert scraper.dial_code(url=url) == dial_code
+        assert scraper.dial_code('France', url) == '+33'
+    finally:
+        scraper.close()
@@ -0,0 +1,62 @@
+import http.server
+import threading
+
+import pytest
+import requests
+
+from utils.html_stream import body_encoding, stream_page, stream_search_results
+
+PAGE = '<html><head><title>Müller Bäckerei GmbH</title></head><body>' \
+       '<div class="g"><h3>Café Zürich AG</h3></div></body></html>'
+
+
+@pytest.fixture
+def serve():
+    """serve(body, content_type) -> URL of a local server answering every GET with that body"""
+    servers = []
+
+    def start(body, content_type):
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_address[1]}/'
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize('body, content_type', [
+    (PAGE.encode('utf-8'), 'text/html'),                                   # no charset: UTF-8
+    (PAGE.encode('cp1252'), 'text/html; charset=windows-1252'),
+    (PAGE.replace('<head>', '<head><meta charset="iso-8859-1">').encode('latin-1'), 'text/html'),
+    (b'\xef\xbb\xbf' + PAGE.encode('utf-8'), 'text/html'),
+])
+def test_streamed_pages_are_decoded_with_the_right_charset(serve, body, content_type):
+    url = serve(body, content_type)
+    response = requests.get(url, stream=True)
+    assert response.encoding == ('windows-1252' if 'charset' in content_type else 'ISO-8859-1')
+    assert stream_page(response)['title'] == 'Müller Bäckerei GmbH'
+    assert stream_search_results(requests.get(url, stream=True)) == ['Café Zürich AG']
+
+
+@pytest.mark.parametrize('content_type, head, encoding', [
+    ('text/html', b'<html>', 'utf-8'),
+    ('text/html; charset="Shift_JIS"', b'<meta charset="utf-8">', 'shift_jis'),   # the header wins
+    ('text/html', b'<meta http-equiv="Content-Type" content="text/html; charset=koi8-r">', 'koi8-r'),
+    ('text/html; charset=no-such-charset', b'', 'utf-8'),
+])
+def test_body_encoding(content_type, head, encoding):
+    assert body_encoding(content_type, head) == encoding
@@ -0,0 +1,64 @@
+import email.utils
+import time
+
+import pytest
+
+from utils.http_cache import ResponseCache, freshness_lifetime
+
+
+def http_date(seconds_ago):
+    return email.utils.formatdate(time.time() - seconds_ago, usegmt=True)
+
+
+@pytest.mark.parametrize('headers, lifetime', [
+    ({'Cache-Control': 'no-store'}, None),
+    ({'Cache-Control': 'private, max-age=600'}, None),
+    ({'Cache-Control': 'no-cache, max-age=600'}, 0),
+    ({'Cache-Control': 'public, max-age=600'}, 600),
+    ({}, 0),                                          # nothing to base a heuristic on
+    ({'ETag': '"v1"'}, 0),
+])
+def test_freshness_lifetime(headers, lifetime):
+    assert freshness_lifetime(headers, 3600) == lifetime
+
+
+def test_heuristic_lifetime_needs_last_modified():
+    assert freshness_lifetime({'Last-Modified': http_date(1000)}, 3600) == 100
+    assert freshness_lifetime({'Last-Modified': http_date(10 ** 6)}, 3600) == 3600
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'), min_ttl=300, touch_batch=3, touch_interval=60)
+    yield cache
+    cache._conn.close()
+
+
+def test_private_response_is_not_stored(cache):
+    assert not cache.put('http://a/', 200, {'Cache-Control': 'private', 'ETag': '"v1"'}, b'x')
+    assert cache.get('http://a/') is None
+
+
+def test_min_ttl_does_not_override_no_cache(cache):
+    assert cache.put('http://a/', 200, {'Cache-Control': 'no-cache', 'ETag': '"v1"'}, b'x')
+    assert cache.put('http://b/', 200, {'ETag': '"v1"'}, b'x')
+    assert cache.get('http://a/')['fresh'] is False
+    assert cache.get('http://b/')['fresh'] is True
+
+
+def test_hits_write_access_times_in_batches(cache):
+    keys = ('http://a/', 'http://b/', 'http://c/')
+    for key in keys:
+        cache.put(key, 200, {'Cache-Control': 'max-age=60'}, b'x')
+
+    def stored_access():
+        return dict(cache._conn.execute('SELECT key, last_access FROM responses').fetchall())
+
+    written = stored_access()
+    time.sleep(0.01)
+    cache.get(keys[0])
+    cache.get(keys[1])
+    assert stored_access() == written        # batch of 3 not reached yet
+
+    cache.get(keys[2])
+    assert all(at > written[key] for key, at in stored_access().items())
@@ -0,0 +1,84 @@
+import multiprocessing
+import time
+
+import pytest
+
+from utils.jobs import DONE, ERROR, FAILED, NOT_FOUND, JobQueue, MemoryJobStore, SQLiteJobStore
+
+
+def _finish_in_child(store, job_id):
+    # Runs in a forked process: the store must open its own connection there
+    store.update(job_id, status=DONE, result={'leads_count': 3})
+
+
+def _read_in_new_store(path, job_id, results):
+    results.put(SQLiteJobStore(path).get(job_id)['status'])
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in (DONE, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+def test_sqlite_job_store_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    store = SQLiteJobStore(path)
+    store.create('a', {'format': 'csv'})
+
+    context = multiprocessing.get_context('fork')
+    child = context.Process(target=_finish_in_child, args=(store, 'a'))
+    child.start()
+    child.join(10)
+    assert child.exitcode == 0
+    # The parent's connection still works after the fork and sees the child's write
+    job = store.get('a')
+    assert job['status'] == DONE
+    assert job['result'] == {'leads_count': 3}
+
+    results = context.Queue()
+    reader = context.Process(target=_read_in_new_store, args=(path, 'a', results))
+    reader.start()
+    reader.join(10)
+    assert results.get(timeout=5) == DONE
+
+
+def test_sqlite_job_store_adds_error_kind_to_old_files(tmp_path):
+    import sqlite3
+    path = str(tmp_path / 'jobs.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, payload TEXT, result TEXT, '
+                 'error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)')
+    conn.commit()
+    conn.close()
+
+    store = SQLiteJobStore(path)
+    store.create('a', {})
+    assert store.update('a', status=FAILED, error='x', error_kind=ERROR)['error_kind'] == ERROR
+
+
+@pytest.mark.parametrize('store_class', [MemoryJobStore, SQLiteJobStore])
+def test_failed_jobs_record_why(tmp_path, store_class):
+    store = store_class(str(tmp_path / 'jobs.db')) if store_class is SQLiteJobStore else store_class()
+    queue = JobQueue(store, max_workers=2)
+
+    def no_leads(payload):
+        raise LookupError('No leads found')
+
+    def broken(payload):
+        raise RuntimeError('boom')
+
+    try:
+        not_found = wait_for(queue, queue.submit(no_leads, {})['id'])
+        failed = wait_for(queue, queue.submit(broken, {})['id'])
+        done = wait_for(queue, queue.submit(lambda payload: {'ok': True}, {})['id'])
+    finally:
+        queue.shutdown()
+
+    assert (not_found['status'], not_found['error_kind'], not_found['error']) == (FAILED, NOT_FOUND, 'No leads found')
+    assert (failed['status'], failed['error_kind']) == (FAILED, ERROR)
+    assert done['status'] == DONE and done['result']['ok']
@@ -0,0 +1,100 @@
+import sqlite3
+
+import pytest
+
+import app as app_module
+from utils import lead_store
+from utils.lead_store import LeadStore, lead_key
+from utils.models import Lead
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = LeadStore(str(tmp_path / 'leads.db'))
+    monkeypatch.setattr(lead_store, '_store', store)
+    return store
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def leads(count, industry='Technology'):
+    return [Lead(name=f'Lead {i}', company=f'Company {i}', email=f'lead{i}@example.com',
+                 phone=f'+4930{1000000 + i}', industry=industry) for i in range(count)]
+
+
+def names(records):
+    return [record['name'] for record in records]
+
+
+def test_synthetic_namesakes_sharing_an_email_are_kept_apart():
+    first = Lead(name='Ann Lee', email='ann.lee@technology.de', phone='+49301234567')
+    second = Lead(name='Ann Lee', email='ann.lee@technology.de', phone='+49307654321')
+    assert lead_key(first) != lead_key(second)
+    assert lead_key(first) == lead_key(Lead(email='ANN.LEE@technology.de', phone='+49 30 1234567'))
+
+
+def test_pages_cover_every_lead_once(store, client):
+    store.add(leads(7), {'country': 'Germany'})
+
+    seen = []
+    url = '/leads?limit=3&industry=Technology'
+    while url:
+        body = client.get(url).get_json()
+        assert body['count'] == len(body['leads']) <= 3
+        seen.extend(names(body['leads']))
+        url = body['next_url']
+
+    assert seen == [f'Lead {i}' for i in reversed(range(7))]
+
+
+def test_filters_and_cursor_combine(store, client):
+    store.add(leads(4), {'country': 'Germany'})
+    store.add([Lead(name='Shop', email='shop@example.com', industry='Retail')], {'country': 'France'})
+
+    body = client.get('/leads?limit=2&country=Germany').get_json()
+    assert names(body['leads']) == ['Lead 3', 'Lead 2']
+    body = client.get(f"/leads?limit=2&country=Germany&cursor={body['next_cursor']}").get_json()
+    assert names(body['leads']) == ['Lead 1', 'Lead 0']
+    assert body['next_cursor'] is None
+    assert names(client.get('/leads?country=France').get_json()['leads']) == ['Shop']
+
+
+def test_a_lead_seen_again_moves_to_the_front(store, client):
+    batch = leads(3)
+    store.add(batch)
+    first_id = client.get('/leads').get_json()['leads'][-1]['id']
+    batch[0].title = 'CTO'
+    store.add([batch[0]])
+
+    records = client.get('/leads').get_json()['leads']
+    assert names(records) == ['Lead 0', 'Lead 2', 'Lead 1']
+    assert records[0]['id'] == first_id and records[0]['title'] == 'CTO'
+    assert store.count({}) == 3
+
+
+def test_bad_cursor_is_rejected(store, client):
+    assert client.get('/leads?cursor=abc').status_code == 400
+
+
+def test_old_store_is_migrated(tmp_path):
+    path = str(tmp_path / 'old.db')
+    fields = ', '.join(f'{field} TEXT NOT NULL' for field in Lead.__slots__)
+    conn = sqlite3.connect(path)
+    conn.execute(f'CREATE TABLE leads (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, {fields}, '
+                 f'country TEXT NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL)')
+    conn.execute('CREATE INDEX leads_industry ON leads (industry, id)')
+    for i, lead in enumerate(leads(2)):
+        values = [lead.get(field) or '' for field in Lead.__slots__]
+        conn.execute(f"INSERT INTO leads VALUES (?, ?, {', '.join('?' * len(values))}, 'Germany', 0, 0)",
+                     (i + 1, f'e:{lead.email}', *values))
+    conn.commit()
+    conn.close()
+
+    store = LeadStore(path)
+    assert names(store.page({})[0]) == ['Lead 1', 'Lead 0']
+    store.add(leads(1))   # same phone and email as the migrated row
+    assert store.count({}) == 2
+    assert names(store.page({})[0]) == ['Lead 0', 'Lead 1']
@@ -0,0 +1,16 @@
+from utils.models import Lead
+
+
+def test_leads_are_hashable_and_equal_on_lead_fields():
+    lead = Lead(name='Ann Lee', company='Acme', email='ann@acme.com')
+    verified = Lead(name='Ann Lee', company='Acme', email='ann@acme.com', verification='deliverable')
+
+    assert lead == verified
+    assert hash(lead) == hash(verified)
+    assert len({lead, verified, Lead(name='Bob', company='Acme')}) == 2
+
+
+def test_dict_round_trip_keeps_verification():
+    lead = Lead(name='Ann Lee', verification='deliverable')
+    assert Lead.from_dict(lead.to_dict()).verification == 'deliverable'
+    assert Lead.from_dict({'name': 'Ann Lee'}) == Lead(name='Ann Lee')
@@ -0,0 +1,21 @@
+import re
+import zlib
+
+from utils.models import ALL_FIELDS, Lead
+from utils.pdf import COLUMNS, MARGIN, PAGE_WIDTH, write_table
+
+
+def test_columns_fill_the_printable_width():
+    assert sum(width for _, _, width in COLUMNS) == PAGE_WIDTH - 2 * MARGIN
+
+
+def test_every_lead_field_has_a_column():
+    assert tuple(field for _, field, _ in COLUMNS[1:]) == ALL_FIELDS
+
+
+def test_source_is_written(tmp_path):
+    path = tmp_path / 'leads.pdf'
+    assert write_table([Lead(name='Ann Lee', source='Bing Search')], str(path)) == 1
+    streams = re.findall(rb'stream\n(.*?)\nendstream', path.read_bytes(), re.S)
+    content = b''.join(zlib.decompress(stream) for stream in streams)
+    assert b'(Source)' in content and b'(Bing Search)' in content
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+from utils.result_cache import ResultCache, SingleFlight, result_cache_key
+
+
+def run_together(count, func):
+    """Call func from count threads released at the same moment; returns their results"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def call(index):
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def slow_counter(result='done', error=None):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        if error:
+            raise error
+        return result
+    return compute, calls
+
+
+def test_concurrent_calls_share_one_computation():
+    compute, calls = slow_counter()
+    flight = SingleFlight()
+    assert run_together(8, lambda: flight.do('key', compute)) == ['done'] * 8
+    assert len(calls) == 1
+
+
+def test_every_waiter_gets_the_leaders_error():
+    compute, calls = slow_counter(error=RuntimeError('search failed'))
+    flight = SingleFlight()
+    results = run_together(4, lambda: flight.do('key', compute))
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(calls) == 1
+
+
+def test_later_calls_compute_again():
+    flight = SingleFlight()
+    compute, calls = slow_counter()
+    flight.do('key', compute)
+    flight.do('key', compute)
+    assert len(calls) == 2
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight()
+    compute, calls = slow_counter()
+    keys = iter(range(4))
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            key = next(keys)
+        return flight.do(key, compute)
+
+    run_together(4, call)
+    assert len(calls) == 4
+
+
+def test_identical_searches_scrape_once():
+    cache = ResultCache()
+    compute, calls = slow_counter(result=[{'name': 'Ann Lee'}])
+    first = result_cache_key({'industry': 'Technology ', 'country': 'germany'}, 50)
+    second = result_cache_key({'country': 'Germany', 'industry': 'technology'}, 50)
+    assert first == second
+
+    results = run_together(6, lambda: cache.get_or_compute_leads(first, compute))
+    assert results == [[{'name': 'Ann Lee'}]] * 6
+    assert len(calls) == 1
+    assert cache.get_or_compute_leads(second, compute) == [{'name': 'Ann Lee'}]
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+@pytest.mark.parametrize('result', [[], None])
+def test_empty_results_are_not_cached(result):
+    cache = ResultCache()
+    compute, calls = slow_counter(result=result)
+    cache.get_or_compute_leads('key', compute)
+    cache.get_or_compute_leads('key', compute)
+    assert len(calls) == 2
@@ -0,0 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.search import FixtureBackend, GoogleBackend, MultiSearch
+
+
+class SlowGoogle(FixtureBackend):
+    name = GoogleBackend.name
+    source = GoogleBackend.source
+
+
+def test_concurrent_searches_each_get_their_full_deadline():
+    # 16 searches at once, each backend needing 0.4s of its 1s deadline
+    search = MultiSearch([FixtureBackend(results=['Acme Ltd'], delay=0.4, deadline=1, max_pages=1)])
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(lambda _: search.search('q', {}, 5), range(16)))
+    assert results == [['Acme Ltd']] * 16
+
+
+def test_results_carry_the_best_ranking_engine():
+    search = MultiSearch([
+        FixtureBackend(results=['Acme Ltd', 'Globex GmbH']),
+        SlowGoogle(results=['Globex GmbH']),
+    ])
+    results = dict(search.search('q', {}, 5, with_sources=True))
+    assert results == {'Globex GmbH': 'Google Search', 'Acme Ltd': 'Fixture Search'}
@@ -0,0 +1,108 @@
+import json
+import threading
+
+import pytest
+
+import app as app_module
+from utils.models import Lead
+from utils.progress import report
+
+SEARCH = {'industry': 'Technology', 'country': 'Germany', 'format': 'csv'}
+LEADS = [Lead(name='Ann Lee', email='ann@acme.de'), Lead(name='Bo Kim', email='bo@acme.de')]
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def gate():
+    # Jobs wait for the stream to start following them, so their events arrive live
+    gate = threading.Event()
+    yield gate
+    gate.set()
+
+
+def fake_job(gate, live=True, error=None):
+    def run(payload):
+        gate.wait(5)
+        report('stage', stage='search', message='Searching the web')
+        if live:
+            for count, lead in enumerate(LEADS, 1):
+                report('lead', lead=lead, count=count)
+        if error:
+            raise error
+        return app_module.lead_result(LEADS)
+    return run
+
+
+def read(response, gate):
+    chunks = []
+    for chunk in response.response:
+        chunks.append(chunk if isinstance(chunk, bytes) else chunk.encode('utf-8'))
+        gate.set()
+    return b''.join(chunks).decode('utf-8')
+
+
+def ndjson(client, gate, body=SEARCH):
+    response = client.post('/generate-leads/stream', json=body, buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    return [json.loads(line) for line in read(response, gate).splitlines()]
+
+
+def types(events):
+    return [event['type'] for event in events]
+
+
+def test_leads_stream_as_found_then_done(client, gate, monkeypatch):
+    monkeypatch.setattr(app_module, 'run_lead_job', fake_job(gate))
+    events = ndjson(client, gate)
+
+    assert types(events) == ['queued', 'stage', 'lead', 'lead', 'done']
+    assert [event['lead']['name'] for event in events[2:4]] == ['Ann Lee', 'Bo Kim']
+    done = events[-1]
+    assert done['job_id'] == events[0]['job_id'] and done['leads_count'] == 2
+    assert 'leads_preview' not in done
+
+
+def test_leads_not_sent_live_come_from_the_result(client, gate, monkeypatch):
+    monkeypatch.setattr(app_module, 'run_lead_job', fake_job(gate, live=False))
+    events = ndjson(client, gate)
+
+    assert types(events) == ['queued', 'stage', 'lead', 'lead', 'done']
+    assert [event['count'] for event in events[2:4]] == [1, 2]
+
+
+def test_new_only_sends_the_surviving_leads_at_the_end(client, gate, monkeypatch):
+    monkeypatch.setattr(app_module, 'run_lead_job', fake_job(gate))
+    events = ndjson(client, gate, {**SEARCH, 'new_only': True})
+
+    assert types(events) == ['queued', 'stage', 'lead', 'lead', 'done']
+
+
+def test_failed_job_ends_with_an_error(client, gate, monkeypatch):
+    monkeypatch.setattr(app_module, 'run_lead_job', fake_job(gate, error=LookupError('No leads found.')))
+    events = ndjson(client, gate)
+
+    assert types(events) == ['queued', 'stage', 'lead', 'lead', 'error']
+    assert events[-1]['error'] == 'No leads found.'
+
+
+def test_server_sent_events_name_each_event(client, gate):
+    job_id = app_module.job_queue.submit(fake_job(gate), {})['id']
+    response = client.get(f'/jobs/{job_id}/events', buffered=False)
+    assert response.mimetype == 'text/event-stream'
+
+    messages = read(response, gate).split('\n\n')
+    assert messages.pop() == ''             # every message ends with a blank line
+    names = [message.split('\n')[0] for message in messages]
+    assert names == ['event: queued', 'event: stage', 'event: lead', 'event: lead', 'event: done']
+    for name, message in zip(names, messages):
+        data = json.loads(message.split('\n')[1][len('data: '):])
+        assert data['type'] == name[len('event: '):]
+
+
+def test_events_of_an_unknown_job_are_404(client):
+    assert client.get('/jobs/nope/events').status_code == 404
@@ -0,0 +1,75 @@
+import pytest
+
+from utils import vcard
+from utils.exporter import iter_vcf
+from utils.models import Lead
+
+
+def unfold(text):
+    return text.replace('\r\n ', '')
+
+
+@pytest.mark.parametrize('value, escaped', [
+    ('Smith, Jones; Partners', 'Smith\\, Jones\\; Partners'),
+    ('C:\\temp', 'C:\\\\temp'),
+    ('line one\r\nline two\nthree\rfour', 'line one\\nline two\\nthree\\nfour'),
+    ('a\\,b', 'a\\\\\\,b'),        # backslash escaped before the comma it precedes
+    (42, '42'),
+])
+def test_escape(value, escaped):
+    assert vcard.escape(value) == escaped
+
+
+@pytest.mark.parametrize('line', [
+    'NOTE:' + 'x' * 200,
+    'NOTE:' + 'ü' * 100,             # two octets each
+    'NOTE:' + 'a' + '日本語' * 40,    # three octets each, not aligned to the fold
+    'NOTE:' + '😀' * 30,             # four octets each
+])
+def test_fold_keeps_lines_within_75_octets(line):
+    folded = vcard.fold(line)
+    pieces = folded.split('\r\n')
+    assert len(pieces) > 1
+    assert all(len(piece.encode('utf-8')) <= vcard.FOLD_OCTETS for piece in pieces)
+    assert all(piece.startswith(' ') for piece in pieces[1:])
+    assert unfold(folded) == line     # no character was split or lost
+
+
+def test_short_lines_are_not_folded():
+    line = 'FN:' + 'x' * (vcard.FOLD_OCTETS - 3)
+    assert vcard.fold(line) == line
+    assert vcard.fold(line + 'x') != line + 'x'
+
+
+def test_card_escapes_values_and_uses_crlf():
+    card = vcard.serialize(Lead(name='Ann Lee', company='Lee, Sons; Co', phone='+49 30 1234567',
+                                email='ann@lee.de', industry='Retail', source='Website Scraping'))
+    assert card.endswith('END:VCARD\r\n')
+    assert '\n' not in card.replace('\r\n', '')
+    lines = unfold(card).split('\r\n')
+    assert 'N:Lee;Ann;;;' in lines
+    assert 'ORG:Lee\\, Sons\\; Co' in lines
+    assert 'NOTE:Industry: Retail | Source: Website Scraping' in lines
+
+
+def test_v4_phone_is_a_tel_uri():
+    card = vcard.serialize(Lead(name='Ann', phone='+1 (555) 123-4567'), '4.0')
+    assert 'TEL;VALUE=uri;TYPE=work:tel:+1-555-123-4567\r\n' in card
+
+
+def test_unknown_version_is_rejected():
+    with pytest.raises(ValueError):
+        vcard.serialize(Lead(name='Ann'), '2.1')
+
+
+def test_vobject_reads_the_native_cards():
+    vobject = pytest.importorskip('vobject')
+    leads = [Lead(name='Ann Lee', company='Lee, Sons; Co', title='Head of ' + 'Sales ' * 20,
+                  email='ann@lee.de', industry='Grüne Energie ' * 8),
+             Lead(company='Nameless GmbH')]
+
+    cards = list(vobject.readComponents(''.join(iter_vcf(leads))))
+    assert [card.fn.value for card in cards] == ['Ann Lee', 'Nameless GmbH']
+    assert cards[0].org.value == ['Lee, Sons; Co']
+    assert cards[0].title.value == 'Head of ' + 'Sales ' * 20
+    assert cards[0].note.value == 'Industry: ' + 'Grüne Energie ' * 8
@@ -0,0 +1,248 @@
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+
+from .exporter import fallback_filename, lead_row
+from .result_cache import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Bump when an exporter's output changes, so old artifacts are not reused
+EXPORT_VERSION = '3'
+
+_ARTIFACT_NAME = re.compile(r'^leads_([0-9a-f]{32})\.([a-z0-9]+)$')
+
+
+def rows_digest(leads):
+    """Hash of the lead rows, shared by every format exported from them"""
+    digest = hashlib.sha256(f'{EXPORT_VERSION}\x1e'.encode('utf-8'))
+    for lead in leads:
+        digest.update('\x1f'.join(str(value) for value in lead_row(lead)).encode('utf-8'))
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+
+def format_digest(rows, format_type):
+    return hashlib.sha256(f'{rows}\x1e{format_type}'.encode('utf-8')).hexdigest()[:32]
+
+
+def content_digest(leads, format_type):
+    """Hash of the lead rows and format - identical lead sets share one artifact"""
+    return format_digest(rows_digest(leads), format_type)
+
+
+class ArtifactStore:
+    """Exported files named by content hash, written atomically and swept when old or over budget
+
+    An artifact's mtime is its last use: reusing or downloading it touches
+    the file. The sweeper deletes artifacts unused for ttl seconds, then the
+    least recently used ones until the directory is under max_bytes.
+    """
+
+    def __init__(self, directory, ttl=3600, max_bytes=500_000_000, sweep_interval=60):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        os.makedirs(directory, exist_ok=True)
+        self._flight = SingleFlight()
+        self._sweeper = None
+        self._stop = threading.Event()
+        self.reused = 0
+        self.created = 0
+        self.swept = 0
+
+    @staticmethod
+    def filename(digest, format_type):
+        return f'leads_{digest}.{format_type}'
+
+    def path_for(self, filename):
+        """Path of an existing artifact, or None for unknown or malformed names"""
+        if not _ARTIFACT_NAME.match(filename):
+            return None
+        path = os.path.join(self.directory, filename)
+        return path if os.path.exists(path) else None
+
+    def touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def get_or_create(self, leads, format_type, export):
+        """Path of the artifact for these leads, running export(path) only if none exists yet
+
+        export must write the file at the path it is given; it is written
+        under a temporary name and renamed into place once complete.
+        """
+        return self._get_or_create(content_digest(leads, format_type), format_type, export)
+
+    def _get_or_create(self, digest, format_type, export):
+        path = os.path.join(self.directory, self.filename(digest, format_type))
+        if os.path.exists(path):
+            self.touch(path)
+            self.reused += 1
+            return path
+
+        def create():
+            if os.path.exists(path):
+                self.reused += 1
+                return path
+            temp_path = self._temp_path(format_type)
+            try:
+                export(temp_path)
+                self._commit(temp_path, path, format_type)
+            finally:
+                self._discard(temp_path, format_type)
+            return path
+
+        return self._flight.do(digest + format_type, create)
+
+    def get_or_create_many(self, leads, formats, export_many):
+        """{format: path} of the artifacts for these leads, exporting every missing format together
+
+        export_many gets {format: temporary path} for the formats without an
+        artifact yet and must write each file in one go. Formats whose export
+        fails are left out of the result.
+        """
+        rows = rows_digest(leads)
+        paths = {format_type: os.path.join(self.directory, self.filename(format_digest(rows, format_type), format_type))
+                 for format_type in formats}
+        missing = [format_type for format_type, path in paths.items() if not os.path.exists(path)]
+        for format_type, path in paths.items():
+            if format_type not in missing:
+                self.touch(path)
+                self.reused += 1
+
+        def create():
+            targets = {format_type: self._temp_path(format_type)
+                       for format_type in missing if not os.path.exists(paths[format_type])}
+            try:
+                if targets:
+                    export_many(dict(targets))
+                for format_type, temp_path in targets.items():
+                    try:
+                        self._commit(temp_path, paths[format_type], format_type)
+                    except (OSError, RuntimeError) as e:
+                        logger.error(f"❌ {e}")
+            finally:
+                for format_type, temp_path in targets.items():
+                    self._discard(temp_path, format_type)
+
+        if missing:
+            self._flight.do(rows + ','.join(missing), create)
+        return {format_type: path for format_type, path in paths.items() if os.path.exists(path)}
+
+    def bundle(self, paths, names):
+        """ZIP artifact of the given artifacts; names maps format -> file name inside the archive"""
+        members = sorted((names[format_type], os.path.basename(path)) for format_type, path in paths.items())
+        # Member artifacts are content-addressed, so their names (and the archive names) identify the bundle
+        key = '\x1e'.join([EXPORT_VERSION] + [f'{name}\x1f{artifact}' for name, artifact in members])
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+        def write(temp_path):
+            with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                for format_type, path in paths.items():
+                    archive.write(path, names[format_type])
+
+        return self._get_or_create(digest, 'zip', write)
+
+    def _temp_path(self, format_type):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.partial_', suffix=f'.{format_type}')
+        os.close(fd)
+        return temp_path
+
+    def _discard(self, temp_path, format_type):
+        """Remove an unpromoted temporary export and any fallback file written next to it"""
+        for leftover in {temp_path, fallback_filename(temp_path, format_type)}:
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    def _commit(self, temp_path, path, format_type):
+        """Rename a finished temporary export into place"""
+        if not os.path.getsize(temp_path):
+            raise RuntimeError(f'{format_type} export produced no output')
+        os.replace(temp_path, path)
+        self.created += 1
+        logger.info(f"🗃️ Stored export artifact {os.path.basename(path)}")
+
+    def sweep(self):
+        """Delete expired artifacts (and abandoned partial writes), then enforce the size cap"""
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl:
+                self._remove(path)
+            elif not name.startswith('.partial_'):
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            self.swept += 1
+        except OSError:
+            pass
+
+    def start_sweeper(self):
+        """Sweep every sweep_interval seconds on a daemon thread (once per process)"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+
+        def run():
+            while not self._stop.wait(self.sweep_interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logger.error(f"❌ Artifact sweep failed: {e}")
+
+        self._sweeper = threading.Thread(target=run, name='artifact-sweeper', daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        self._stop.set()
+
+    def stats(self):
+        files = 0
+        size = 0
+        for name in os.listdir(self.directory):
+            if _ARTIFACT_NAME.match(name):
+                files += 1
+                try:
+                    size += os.path.getsize(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+        return {
+            'files': files,
+            'size_bytes': size,
+            'max_bytes': self.max_bytes,
+            'reused': self.reused,
+            'created': self.created,
+            'swept': self.swept,
+        }
+
+
+def create_artifact_store():
+    """ArtifactStore configured from ARTIFACT_* env vars"""
+    return ArtifactStore(
+        os.environ.get('ARTIFACT_DIR') or os.path.join(tempfile.gettempdir(), 'lead_generator_exports'),
+        ttl=int(os.environ.get('ARTIFACT_TTL', 3600)),
+        max_bytes=int(os.environ.get('ARTIFACT_MAX_BYTES', 500_000_000)),
+        sweep_interval=int(os.environ.get('ARTIFACT_SWEEP_INTERVAL', 60))
+    )
@@ -0,0 +1,243 @@
+"""Headless Chrome rendering for sites whose contacts only appear after JavaScript runs
+
+Off unless BROWSER_RENDERING=1. The scraper fetches every site with plain
+requests first and only renders it here when that finds no contacts, so
+the expensive path stays rare. BrowserPool keeps a fixed number of browsers
+and reuses them: a render waits for a free one (up to acquire_timeout, then
+gives up), page loads are cut off at page_timeout, images and fonts are
+never downloaded, and each browser is replaced after recycle_after pages to
+keep its memory in check.
+
+Chrome and its driver are found by Selenium Manager, or set
+BROWSER_BINARY / BROWSER_DRIVER_PATH. benchmarks/bench_render.py runs
+against a local fixture server with JavaScript-rendered contact pages.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from .lazy import load, missing_modules
+from .metrics import ERRORS
+
+logger = logging.getLogger(__name__)
+
+# URL patterns Chrome is told not to fetch when resources are blocked
+BLOCKED_RESOURCES = ('*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+                     '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot')
+
+# Seconds between checks while waiting for scripts to render the page
+POLL_INTERVAL = 0.1
+
+
+def chrome_driver(block_resources=True, binary=None, driver_path=None):
+    """Start a headless Chrome through Selenium"""
+    webdriver = load('selenium.webdriver')
+    service_module = load('selenium.webdriver.chrome.service')
+
+    options = webdriver.ChromeOptions()
+    for argument in ('--headless=new', '--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu',
+                     '--disable-extensions', '--mute-audio', '--no-first-run'):
+        options.add_argument(argument)
+    if block_resources:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    if binary:
+        options.binary_location = binary
+
+    service = service_module.Service(executable_path=driver_path) if driver_path else service_module.Service()
+    driver = webdriver.Chrome(options=options, service=service)
+    if block_resources:
+        # Fonts (and images the prefs miss, e.g. CSS backgrounds) are blocked at the network layer
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(BLOCKED_RESOURCES)})
+    return driver
+
+
+class Browser:
+    """One browser from the pool; pages counts every page it has rendered"""
+
+    def __init__(self, driver, page_timeout=15):
+        self.driver = driver
+        self.pages = 0
+        self.broken = False
+        driver.set_page_load_timeout(page_timeout)
+
+    def render(self, url, ready=None, settle=2.0):
+        """HTML of the page after its scripts ran, or None if it could not be loaded
+
+        ready(html) is polled for up to settle seconds after the load event,
+        for pages that fill themselves in from timers or XHR; without it the
+        HTML is read as soon as the page has loaded.
+        """
+        exceptions = load('selenium.common.exceptions')
+        self.pages += 1
+        try:
+            self.driver.get(url)
+        except exceptions.TimeoutException:
+            # Keep whatever rendered before the timeout
+            logger.info(f"⏱️ Page load timed out, using what rendered: {url}")
+            try:
+                self.driver.execute_script('window.stop();')
+            except exceptions.WebDriverException:
+                pass
+        except exceptions.WebDriverException as e:
+            # net::ERR_* is the site's fault; anything else may mean the browser is gone
+            self.broken = 'net::ERR_' not in str(e)
+            logger.warning(f"❌ Could not render {url}: {str(e).splitlines()[0]}")
+            return None
+
+        try:
+            html = self.driver.page_source
+            deadline = time.monotonic() + settle
+            while ready is not None and not ready(html) and time.monotonic() < deadline:
+                time.sleep(POLL_INTERVAL)
+                html = self.driver.page_source
+            return html
+        except exceptions.WebDriverException as e:
+            self.broken = True
+            logger.warning(f"❌ Lost the browser while rendering {url}: {str(e).splitlines()[0]}")
+            return None
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Browser did not quit cleanly: {e}")
+
+
+class BrowserPool:
+    """A fixed number of reusable headless browsers, started on demand
+
+    driver_factory() starts one WebDriver (default: chrome_driver()).
+    """
+
+    def __init__(self, size=2, page_timeout=15, recycle_after=50, acquire_timeout=30,
+                 block_resources=True, driver_factory=None):
+        self.size = size
+        self.page_timeout = page_timeout
+        self.recycle_after = recycle_after
+        self.acquire_timeout = acquire_timeout
+        self.driver_factory = driver_factory or (lambda: chrome_driver(block_resources))
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.launched = 0
+        self.recycled = 0
+        self.rendered = 0
+        self.busy = 0
+
+    @contextmanager
+    def browser(self):
+        """A Browser to render with, or None if none came free in time or one could not start"""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self.busy += 1
+            logger.warning(f"⏳ No browser free after {self.acquire_timeout}s, skipping render")
+            yield None
+            return
+
+        browser = None
+        try:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                browser = self._launch()
+            pages_before = browser.pages if browser is not None else 0
+            yield browser
+        finally:
+            if browser is not None:
+                self._release(browser, browser.pages - pages_before)
+            self._slots.release()
+
+    def _launch(self):
+        try:
+            browser = Browser(self.driver_factory(), self.page_timeout)
+        except Exception as e:
+            ERRORS.inc(stage='browser_launch')
+            logger.error(f"❌ Could not start a browser: {e}")
+            return None
+        with self._lock:
+            self.launched += 1
+        logger.info(f"🌐 Started browser {self.launched} (pool of {self.size})")
+        return browser
+
+    def _release(self, browser, pages):
+        with self._lock:
+            self.rendered += pages
+            closed = self._closed
+            recycle = browser.broken or browser.pages >= self.recycle_after
+            if recycle and not closed:
+                self.recycled += 1
+        if closed or recycle:
+            browser.quit()
+        else:
+            self._idle.put(browser)
+
+    def render(self, url, ready=None, settle=2.0):
+        """Render one page on a pooled browser; None if no browser was available or the page failed"""
+        with self.browser() as browser:
+            if browser is None:
+                return None
+            return browser.render(url, ready, settle)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'idle': self._idle.qsize(),
+                'launched': self.launched,
+                'recycled': self.recycled,
+                'pages_rendered': self.rendered,
+                'skipped_busy': self.busy,
+            }
+
+    def close(self):
+        """Quit every idle browser; browsers in use quit when they are released"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().quit()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Process-wide BrowserPool configured from BROWSER_* env vars, or None unless BROWSER_RENDERING=1"""
+    global _pool
+    if os.environ.get('BROWSER_RENDERING', '0') != '1':
+        return None
+    with _pool_lock:
+        if _pool is None:
+            missing = missing_modules('selenium')
+            if missing:
+                logger.warning("⚠️ BROWSER_RENDERING=1 but selenium is not installed - rendering disabled")
+                return None
+            binary = os.environ.get('BROWSER_BINARY')
+            driver_path = os.environ.get('BROWSER_DRIVER_PATH')
+            block_resources = os.environ.get('BROWSER_BLOCK_RESOURCES', '1') == '1'
+            _pool = BrowserPool(
+                size=int(os.environ.get('BROWSER_POOL_SIZE', 2)),
+                page_timeout=float(os.environ.get('BROWSER_PAGE_TIMEOUT', 15)),
+                recycle_after=int(os.environ.get('BROWSER_RECYCLE_AFTER', 50)),
+                acquire_timeout=float(os.environ.get('BROWSER_ACQUIRE_TIMEOUT', 30)),
+                driver_factory=lambda: chrome_driver(block_resources, binary, driver_path)
+            )
+    return _pool
+
+
+def close_browser_pool():
+    """Quit the process-wide pool's browsers (e.g. when a worker exits)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
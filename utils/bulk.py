@@ -0,0 +1,158 @@
+"""Fan one lead search out over many title/industry/country combinations
+
+Used by the /bulk-generate-leads endpoint and as a command line tool:
+
+    python -m utils.bulk --industries all --countries Germany,France --format csv -o leads.csv
+"""
+import argparse
+import contextvars
+import functools
+import itertools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from .criteria import COUNTRIES, INDUSTRIES, JOB_TITLES
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on combinations in one bulk run
+MAX_COMBINATIONS = int(os.environ.get('BULK_MAX_COMBINATIONS', 1000))
+
+_CHOICES = {
+    'titles': JOB_TITLES,
+    'industries': INDUSTRIES,
+    'countries': COUNTRIES,
+}
+
+
+def _expand(values, field):
+    """Turn 'all', a comma-separated string or a list into a list of values"""
+    if values in (None, '', []):
+        return ['']
+    if isinstance(values, str):
+        if values.strip().lower() == 'all':
+            return list(_CHOICES[field])
+        values = values.split(',')
+    return [value.strip() for value in values if value.strip()] or ['']
+
+
+def expand_criteria(spec):
+    """List of search_data dicts for a bulk spec
+
+    spec is either {'combinations': [{'title': ..., 'industry': ..., 'country': ...}, ...]}
+    or a cross-product {'titles': [...], 'industries': [...], 'countries': [...]} where
+    each list may also be 'all' or a comma-separated string.
+    """
+    if spec.get('combinations'):
+        combinations = [{
+            'title': (item.get('title') or '').strip(),
+            'industry': (item.get('industry') or '').strip(),
+            'country': (item.get('country') or '').strip(),
+        } for item in spec['combinations']]
+    else:
+        combinations = [
+            {'title': title, 'industry': industry, 'country': country}
+            for title, industry, country in itertools.product(
+                _expand(spec.get('titles'), 'titles'),
+                _expand(spec.get('industries'), 'industries'),
+                _expand(spec.get('countries'), 'countries'),
+            )
+        ]
+
+    # Drop empty and repeated combinations, keeping order
+    unique = {}
+    for search_data in combinations:
+        if any(search_data.values()):
+            unique.setdefault(tuple(search_data.values()), search_data)
+    combinations = list(unique.values())
+
+    if len(combinations) > MAX_COMBINATIONS:
+        raise ValueError(f'Bulk runs are limited to {MAX_COMBINATIONS} combinations, got {len(combinations)}')
+    return combinations
+
+
+def _scrape_one(search_data, max_results):
+    # Runs on a pool worker: each thread/process uses its own shared scraper
+    from .scraper import get_scraper
+    return get_scraper().scrape_leads(search_data, max_results=max_results)
+
+
+def run_bulk(combinations, max_results=50, workers=4, executor='thread'):
+    """Scrape every combination in parallel and merge the results
+
+    Returns (leads, summary): leads deduplicated across all combinations in
+    the order the combinations finished, and one summary row per combination.
+    """
+    from .scraper import dedupe_leads
+
+    merged = []
+    seen_contacts = set()
+    summary = []
+
+    def submit(pool, search_data):
+        if executor == 'process':
+            return pool.submit(_scrape_one, search_data, max_results)
+        # Threads run in a copy of the caller's context, so the job's progress channel and timings reach them
+        return pool.submit(contextvars.copy_context().run, _scrape_one, search_data, max_results)
+
+    if executor == 'process':
+        # Never fork a web worker that runs thread pools (see utils.exporter.get_export_pool)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        pool_class = functools.partial(ProcessPoolExecutor, mp_context=context)
+    else:
+        pool_class = ThreadPoolExecutor
+
+    with pool_class(max_workers=workers) as pool:
+        futures = {submit(pool, search_data): search_data for search_data in combinations}
+        for future in as_completed(futures):
+            search_data = futures[future]
+            row = dict(search_data)
+            try:
+                leads = future.result()
+                new_leads = dedupe_leads(leads, seen_contacts)
+                merged.extend(new_leads)
+                row.update(found=len(leads), new=len(new_leads))
+            except Exception as e:
+                logger.error(f"❌ Bulk search failed for {search_data}: {e}")
+                row.update(found=0, new=0, error=str(e))
+            summary.append(row)
+
+    logger.info(f"📦 Bulk run: {len(combinations)} combinations, {len(merged)} unique leads")
+    return merged, summary
+
+
+def main(argv=None):
+    from .exporter import export_data
+
+    parser = argparse.ArgumentParser(description='Generate leads for many criteria combinations at once')
+    parser.add_argument('--titles', default='', help="comma-separated job titles, or 'all'")
+    parser.add_argument('--industries', default='', help="comma-separated industries, or 'all'")
+    parser.add_argument('--countries', default='', help="comma-separated countries, or 'all'")
+    parser.add_argument('--max-results', type=int, default=50, help='leads per combination')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--format', default='csv', choices=['xlsx', 'pdf', 'vcf', 'csv', 'txt'])
+    parser.add_argument('-o', '--output', help='output file (default leads_bulk.<format>)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    combinations = expand_criteria({
+        'titles': args.titles,
+        'industries': args.industries,
+        'countries': args.countries,
+    })
+    if not combinations:
+        parser.error('Please provide at least one of --titles, --industries or --countries')
+
+    leads, summary = run_bulk(combinations, args.max_results, args.workers, args.executor)
+    output = args.output or f'leads_bulk.{args.format}'
+    export_data(leads, output, args.format)
+    failed = sum(1 for row in summary if row.get('error'))
+    print(f"✅ {len(leads)} unique leads from {len(combinations)} combinations ({failed} failed) -> {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from .metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth another attempt
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_DONE = object()
+
+
+class BatchCrawler:
+    """Fetch many URLs concurrently with a global cap and per-host politeness limits
+
+    With a parse(url, response) callable the body is handed to it on the worker
+    thread and its return value is reported as 'data' instead of 'content'.
+    """
+
+    def __init__(self, session, max_concurrency=20, per_host=2, host_delay=0.5,
+                 timeout=10, retries=2, backoff=0.5, parse=None):
+        self.session = session
+        self.parse = parse
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    async def crawl(self, urls, stop_event=None):
+        """Async generator yielding one result dict per URL as each one finishes"""
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='crawler')
+        limit = asyncio.Semaphore(self.max_concurrency)
+        host_slots = {}
+        host_locks = {}
+        host_next = {}
+
+        async def wait_for_host(host):
+            # Space out requests to the same host by host_delay seconds
+            lock = host_locks.setdefault(host, asyncio.Lock())
+            async with lock:
+                delay = host_next.get(host, 0) - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                host_next[host] = loop.time() + self.host_delay
+
+        async def fetch(url):
+            host = urlparse(url).netloc.lower()
+            slot = host_slots.setdefault(host, asyncio.Semaphore(self.per_host))
+            started = time.monotonic()
+            result = {'url': url, 'status': None, 'content': None, 'data': None, 'error': None, 'attempts': 0}
+
+            # Queue on the host first: a global permit is only held while a fetch is in flight,
+            # so one busy host waiting on per_host / host_delay never starves the others
+            async with slot:
+                for attempt in range(self.retries + 1):
+                    if stop_event is not None and stop_event.is_set():
+                        result['error'] = 'cancelled'
+                        break
+                    await wait_for_host(host)
+                    result['attempts'] = attempt + 1
+                    retry_after = None
+                    try:
+                        # Run in a copy of this task's context so stage timings reach the caller's job
+                        call = functools.partial(contextvars.copy_context().run, self._fetch, url)
+                        async with limit:
+                            status, retry_after, body = await loop.run_in_executor(executor, call)
+                        result['status'] = status
+                        if status not in RETRY_STATUSES:
+                            result['data' if self.parse else 'content'] = body
+                            result['error'] = None
+                            break
+                        result['error'] = f'HTTP {status}'
+                    except requests.RequestException as e:
+                        result['error'] = str(e)
+
+                    if attempt < self.retries:
+                        await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+
+            result['elapsed'] = time.monotonic() - started
+            if result['error']:
+                logger.warning(f"❌ Crawl failed for {url}: {result['error']}")
+            return result
+
+        tasks = []
+        try:
+            tasks.extend(asyncio.ensure_future(fetch(url)) for url in urls)
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False)
+
+    def _fetch(self, url):
+        """Blocking GET (and optional parse) run on the worker pool"""
+        with timed('website_fetch'):
+            response = self.session.get(url, timeout=self.timeout, stream=self.parse is not None)
+        if response.status_code in RETRY_STATUSES:
+            response.close()
+            return response.status_code, response.headers.get('Retry-After'), None
+        if self.parse:
+            with timed('html_parse'):
+                return response.status_code, None, self.parse(url, response)
+        return response.status_code, None, response.content
+
+    def _backoff_delay(self, attempt, retry_after=None):
+        """Exponential backoff with jitter, honouring a numeric Retry-After header"""
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 30.0)
+        delay = self.backoff * (2 ** attempt)
+        return delay + random.uniform(0, delay / 2)
+
+    def iter_crawl(self, urls):
+        """Blocking generator over crawl() - runs the event loop on a helper thread"""
+        results = queue.Queue()
+        stop_event = threading.Event()
+
+        async def pump():
+            async for result in self.crawl(urls, stop_event):
+                results.put(result)
+
+        def run():
+            try:
+                asyncio.run(pump())
+            except Exception as e:
+                logger.error(f"❌ Batch crawl error: {e}")
+            finally:
+                results.put(_DONE)
+
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(run,), name='batch-crawl', daemon=True)
+        thread.start()
+        try:
+            while True:
+                result = results.get()
+                if result is _DONE:
+                    break
+                yield result
+        finally:
+            stop_event.set()
+
+
+# Link text / path fragments that usually lead to contact details
+CONTACT_KEYWORDS = (
+    'contact', 'kontakt', 'contacto', 'contatti', 'about', 'uber-uns', 'ueber-uns',
+    'impressum', 'imprint', 'legal', 'team', 'people', 'staff', 'leadership',
+)
+
+
+def normalize_url(url):
+    """Canonical form of a URL for the seen-set: lower-case host, no fragment or trailing slash"""
+    parsed = urlparse(url)
+    path = parsed.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    return parsed._replace(scheme=parsed.scheme.lower(), netloc=parsed.netloc.lower(),
+                           path=path, params='', fragment='').geturl()
+
+
+def _site(host):
+    host = host.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class ContactPageCrawler:
+    """Follow contact/about/impressum/team links from a landing page on one site
+
+    Every page goes through the same session, so all requests to a host share
+    one keep-alive connection pool instead of paying a new handshake each.
+    """
+
+    def __init__(self, session, max_depth=1, max_pages=5, timeout=10):
+        self.session = session
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.timeout = timeout
+
+    def discover_links(self, page_url, links):
+        """Rank (href, text) links that look like same-site contact pages, best first"""
+        host = urlparse(page_url).netloc
+        scored = {}
+
+        for href, text in links:
+            link = urljoin(page_url, href.strip())
+            parsed = urlparse(link)
+            if parsed.scheme not in ('http', 'https') or _site(parsed.netloc) != _site(host):
+                continue
+            haystack = f"{parsed.path} {text}".lower()
+            hits = [i for i, keyword in enumerate(CONTACT_KEYWORDS) if keyword in haystack]
+            if hits:
+                link = normalize_url(link)
+                scored[link] = min(hits[0], scored.get(link, hits[0]))
+
+        return sorted(scored, key=scored.get)
+
+    def crawl(self, url, parse):
+        """Breadth-first fetch of the landing page and its contact pages
+
+        parse(url, response) must return a dict with a 'links' list of
+        (href, text) pairs. Returns a list of (url, parsed) pairs, landing page
+        first, stopping at max_depth link hops or max_pages fetched pages.
+        """
+        pages = []
+        seen = {normalize_url(url)}
+        frontier = [url]
+
+        for depth in range(self.max_depth + 1):
+            next_frontier = []
+            for page_url in frontier:
+                if len(pages) >= self.max_pages:
+                    return pages
+                try:
+                    with timed('website_fetch'):
+                        response = self.session.get(page_url, timeout=self.timeout, stream=True)
+                except requests.RequestException as e:
+                    logger.warning(f"❌ Could not fetch {page_url}: {e}")
+                    continue
+                if response.status_code >= 400:
+                    response.close()
+                    continue
+                with timed('html_parse'):
+                    page = parse(page_url, response)
+                pages.append((page_url, page))
+
+                if depth < self.max_depth:
+                    for link in self.discover_links(page_url, page.get('links', [])):
+                        if link not in seen:
+                            seen.add(link)
+                            next_frontier.append(link)
+            frontier = next_frontier
+            if not frontier:
+                break
+
+        return pages
@@ -0,0 +1,31 @@
+"""Search criteria offered in the UI and accepted by the bulk endpoint"""
+
+# Enhanced country list
+COUNTRIES = [
+    # European Countries
+    "United Kingdom", "Germany", "France", "Italy", "Spain", "Netherlands", 
+    "Switzerland", "Sweden", "Norway", "Denmark", "Ireland", "Belgium", 
+    "Austria", "Portugal", "Finland", "Poland", "Czech Republic", "Hungary", 
+    "Romania", "Greece",
+    
+    # Wealthy Asian Countries
+    "Japan", "South Korea", "Singapore", "Hong Kong", "Taiwan", 
+    "United Arab Emirates", "Qatar", "Saudi Arabia", "Israel", "Malaysia",
+    
+    # Others
+    "United States", "Canada", "Australia", "India", "Brazil", "Mexico"
+]
+
+JOB_TITLES = [
+    "CEO", "CFO", "CTO", "CMO", "COO", "President", "Vice President",
+    "Director", "Manager", "Senior Manager", "Executive Director",
+    "Managing Director", "Partner", "Owner", "Founder", "Board Member",
+    "Head of Department", "Team Lead", "Supervisor"
+]
+
+INDUSTRIES = [
+    "Technology", "Healthcare", "Finance", "Education", "Real Estate",
+    "Manufacturing", "Retail", "Construction", "Transportation",
+    "Hospitality", "Energy", "Telecommunications", "Marketing",
+    "Consulting", "Legal", "Insurance", "Pharmaceuticals"
+]
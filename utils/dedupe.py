@@ -0,0 +1,222 @@
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from .extractor import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+# Legal-form words ignored when comparing company names
+LEGAL_SUFFIXES = {
+    'ltd', 'limited', 'plc', 'llc', 'inc', 'incorporated', 'corp', 'corporation', 'co',
+    'company', 'gmbh', 'ag', 'kg', 'sa', 'sas', 'sarl', 'srl', 'spa', 'bv', 'nv', 'ab',
+    'as', 'oy', 'pte', 'pty', 'kk', 'group', 'holding', 'holdings',
+}
+
+_WORDS = re.compile(r'[a-z0-9]+')
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def normalize_domain(website='', email=''):
+    """Company domain from the website, else from the email address, without www."""
+    host = ''
+    if website:
+        host = urlparse(website if '://' in website else f'http://{website}').hostname or ''
+    elif '@' in (email or ''):
+        host = email.rsplit('@', 1)[1]
+    host = host.strip().lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def normalize_company(name):
+    """Lower-case company name without punctuation or legal-form words"""
+    words = _WORDS.findall((name or '').lower())
+    return ' '.join(word for word in words if word not in LEGAL_SUFFIXES)
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def jaccard(first, second):
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def contact_keys(lead):
+    """Exact-match keys for a lead: normalized phone and email"""
+    keys = []
+    phone = normalize_phone(lead.get('phone', '') or '') if lead.get('phone') else None
+    if phone:
+        keys.append(f'p:{phone}')
+    email = normalize_email(lead.get('email', ''))
+    if email:
+        keys.append(f'e:{email}')
+    return keys
+
+
+class DedupeIndex:
+    """Persistent index of leads already returned, for filtering repeat jobs down to net-new leads
+
+    A lead is a duplicate when its normalized phone or email was seen before,
+    or when a lead with the same person name and location was seen at the
+    same company domain or at a company whose name is a fuzzy match
+    (trigram Jaccard similarity >= threshold). Fuzzy candidates come from a
+    (name, location, trigram) index, so only leads sharing enough trigrams
+    are ever compared. Within one filter_new batch only phone and email
+    match: the name rules compare against earlier runs, since one search
+    can legitimately return namesakes at similar companies.
+    """
+
+    def __init__(self, path, threshold=0.7):
+        self.path = path
+        self.threshold = threshold
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS leads (
+                id INTEGER PRIMARY KEY,
+                person TEXT NOT NULL,
+                company TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS leads_person_domain ON leads (person, domain);
+            CREATE TABLE IF NOT EXISTS contact_keys (
+                key TEXT PRIMARY KEY,
+                lead_id INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS company_grams (
+                person TEXT NOT NULL,
+                gram TEXT NOT NULL,
+                lead_id INTEGER NOT NULL,
+                PRIMARY KEY (person, gram, lead_id)
+            ) WITHOUT ROWID;
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _person(lead):
+        # Block key for fuzzy matching: same person at the same location
+        name = ' '.join(_WORDS.findall((lead.get('name', '') or '').lower()))
+        location = (lead.get('location', '') or '').strip().lower()
+        return f'{name}|{location}' if name else ''
+
+    def _find(self, lead, before=None):
+        # Caller holds the lock. Returns the id of a matching stored lead, or None.
+        # The name rules only consider stored leads with id <= before, when given.
+        for key in contact_keys(lead):
+            row = self._conn.execute('SELECT lead_id FROM contact_keys WHERE key = ?', (key,)).fetchone()
+            if row:
+                return row[0]
+
+        person = self._person(lead)
+        if not person:
+            return None
+
+        domain = normalize_domain(lead.get('website', ''), lead.get('email', ''))
+        if domain:
+            row = self._conn.execute(
+                'SELECT id FROM leads WHERE person = ? AND domain = ? AND id <= ?',
+                (person, domain, self._newest(before))).fetchone()
+            if row:
+                return row[0]
+
+        company = normalize_company(lead.get('company', ''))
+        grams = trigrams(company) if company else set()
+        if not grams:
+            return None
+
+        # Jaccard >= t needs at least t * |grams| shared trigrams
+        needed = max(1, int(self.threshold * len(grams)))
+        placeholders = ','.join('?' * len(grams))
+        candidates = self._conn.execute(
+            f'SELECT lead_id FROM company_grams WHERE person = ? AND gram IN ({placeholders}) '
+            f'AND lead_id <= ? GROUP BY lead_id HAVING COUNT(*) >= ?',
+            (person, *grams, self._newest(before), needed)
+        ).fetchall()
+        for (lead_id,) in candidates:
+            row = self._conn.execute('SELECT company FROM leads WHERE id = ?', (lead_id,)).fetchone()
+            if row and jaccard(grams, trigrams(row[0])) >= self.threshold:
+                return lead_id
+        return None
+
+    @staticmethod
+    def _newest(before):
+        # SQLite integers top out at 2**63 - 1
+        return (1 << 63) - 1 if before is None else before
+
+    def _add(self, lead):
+        # Caller holds the lock
+        person = self._person(lead)
+        company = normalize_company(lead.get('company', ''))
+        domain = normalize_domain(lead.get('website', ''), lead.get('email', ''))
+        cursor = self._conn.execute(
+            'INSERT INTO leads (person, company, domain, created_at) VALUES (?, ?, ?, ?)',
+            (person, company, domain, time.time())
+        )
+        lead_id = cursor.lastrowid
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO contact_keys (key, lead_id) VALUES (?, ?)',
+            [(key, lead_id) for key in contact_keys(lead)]
+        )
+        if person and company:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO company_grams (person, gram, lead_id) VALUES (?, ?, ?)',
+                [(person, gram, lead_id) for gram in trigrams(company)]
+            )
+        return lead_id
+
+    def is_duplicate(self, lead):
+        with self._lock:
+            return self._find(lead) is not None
+
+    def filter_new(self, leads):
+        """Return only leads not seen before, and remember them for next time"""
+        new_leads = []
+        with self._lock:
+            before = self._conn.execute('SELECT COALESCE(MAX(id), 0) FROM leads').fetchone()[0]
+            for lead in leads:
+                if self._find(lead, before) is None:
+                    self._add(lead)
+                    new_leads.append(lead)
+            self._conn.commit()
+        logger.info(f"🧹 Dedupe index: {len(new_leads)} of {len(leads)} leads are new")
+        return new_leads
+
+    def stats(self):
+        with self._lock:
+            count = self._conn.execute('SELECT COUNT(*) FROM leads').fetchone()[0]
+        return {'leads': count, 'path': self.path}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_dedupe_index():
+    """Process-wide DedupeIndex stored at DEDUPE_INDEX_PATH"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DedupeIndex(
+                os.environ.get('DEDUPE_INDEX_PATH') or os.path.join(
+                    tempfile.gettempdir(), 'lead_generator_dedupe.db'),
+                threshold=float(os.environ.get('DEDUPE_FUZZY_THRESHOLD', 0.7))
+            )
+    return _index
@@ -0,0 +1,319 @@
+"""Lead enrichment: check that websites answer and email domains resolve
+
+Every lead gets a verification status. The domains of a batch of leads are
+collected first, so each one is checked once however many leads share it,
+and the checks run concurrently on a bounded pool. Outcomes are cached per
+domain (failures for less time), so later batches and runs skip domains
+already seen. submit() enriches a batch in the background, so the scraper
+can keep finding leads meanwhile.
+
+Leads read from a crawled website had their site just fetched, so only
+their email domain is checked. Search and synthetic leads make their
+domains up from company names, so their email domain gets an MX lookup
+and their website a DNS lookup and HEAD request, which weeds out the
+domains that do not exist; ENRICH_SYNTHETIC=0 leaves them unchecked.
+
+DNS goes through the system resolver (or dnspython MX lookups for email
+domains when it is installed). ENRICH_HOSTS points at a JSON map of
+{domain: "host:port"} that replaces DNS entirely, so tests and benchmarks
+can run against a local HTTP server.
+"""
+import contextvars
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+
+from .metrics import CACHE_EVENTS, timed
+from .models import WEBSITE_SOURCE
+from .result_cache import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Verification statuses
+VERIFIED = 'verified'        # every check passed
+PARTIAL = 'partial'          # some checks passed
+UNREACHABLE = 'unreachable'  # no check passed
+UNCHECKED = 'unchecked'      # nothing to check, or no answer within the budget
+
+
+def email_domain(email):
+    _, at, domain = (email or '').strip().rpartition('@')
+    return domain.lower().rstrip('.') if at else ''
+
+
+def website_host(website):
+    if not website:
+        return ''
+    try:
+        parts = urlsplit(website if '://' in website else f'http://{website}')
+        return (parts.hostname or '').rstrip('.')
+    except ValueError:
+        return ''
+
+
+def _dns_resolver():
+    try:
+        import dns.resolver
+        return dns.resolver
+    except ImportError:
+        return None
+
+
+class SystemResolver:
+    """Real DNS: address lookups through the OS, MX lookups through dnspython if available"""
+
+    def __init__(self, timeout=3):
+        self.timeout = timeout
+
+    def resolve(self, domain):
+        try:
+            return bool(socket.getaddrinfo(domain, None))
+        except (socket.gaierror, UnicodeError, OSError):
+            return False
+
+    def mail(self, domain):
+        """True if the domain can receive email: an MX record, or failing that an address"""
+        resolver = _dns_resolver()
+        if resolver is None:
+            return self.resolve(domain)
+        try:
+            return bool(resolver.resolve(domain, 'MX', lifetime=self.timeout))
+        except (resolver.NXDOMAIN, resolver.NoNameservers):
+            return False
+        except Exception:
+            # No MX record (or the lookup failed) - mail falls back to the A record
+            return self.resolve(domain)
+
+    def address(self, domain):
+        """Where to connect for domain - None means the normal address"""
+        return None
+
+
+class HostsResolver:
+    """Local DNS stand-in: only the listed domains resolve, each to a 'host:port'"""
+
+    def __init__(self, hosts):
+        self.hosts = {domain.lower(): address for domain, address in hosts.items()}
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def resolve(self, domain):
+        return bool(self.hosts.get(domain))
+
+    def mail(self, domain):
+        return self.resolve(domain)
+
+    def address(self, domain):
+        return self.hosts.get(domain)
+
+
+class DomainCache:
+    """Check outcomes by key with a TTL (shorter for failures), least recently used dropped first"""
+
+    def __init__(self, ttl=86400, negative_ttl=900, max_entries=50_000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(True, outcome) for a fresh entry, else (False, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                CACHE_EVENTS.inc(cache='enrichment', event='hit')
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+        CACHE_EVENTS.inc(cache='enrichment', event='miss')
+        return False, None
+
+    def put(self, key, ok):
+        expires = time.time() + (self.ttl if ok else self.negative_ttl)
+        with self._lock:
+            self._entries[key] = (expires, ok)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class Enricher:
+    """Tags leads with a verification status from concurrent, cached domain checks"""
+
+    def __init__(self, session, resolver=None, cache=None, workers=16, timeout=3, budget=10,
+                 check_synthetic=True):
+        self.session = session
+        self.resolver = resolver or SystemResolver(timeout)
+        self.cache = cache or DomainCache()
+        self.workers = workers
+        self.timeout = timeout
+        self.budget = budget
+        self.check_synthetic = check_synthetic
+        self._flight = SingleFlight()
+        self._pool = None
+        self._batch_pool = None
+        self._pool_lock = threading.Lock()
+
+    def _executor(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='enrich')
+            return self._pool
+
+    def submit(self, leads):
+        """Enrich a batch in the background; returns a future of the leads"""
+        with self._pool_lock:
+            # Separate from the check pool, whose workers a batch waits on
+            if self._batch_pool is None:
+                self._batch_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='enrich-batch')
+            pool = self._batch_pool
+        return pool.submit(contextvars.copy_context().run, self.enrich, leads)
+
+    def _checks(self, lead):
+        """{key: (check, *args)} for a lead, with None for checks that already passed"""
+        crawled = lead.get('source') == WEBSITE_SOURCE
+        if not (crawled or self.check_synthetic):
+            return {}
+        checks = {}
+        domain = email_domain(lead.get('email'))
+        if domain:
+            checks[f'mail:{domain}'] = (self.check_mail, domain)
+        host = website_host(lead.get('website'))
+        if host:
+            if crawled:
+                # The crawl just fetched this site
+                checks[f'http:{host}'] = None
+            else:
+                url = lead['website'] if '://' in lead['website'] else f'http://{lead["website"]}'
+                parts = urlsplit(url)
+                checks[f'http:{host}'] = (self.check_website, host, f'{parts.scheme}://{parts.netloc}/')
+        return checks
+
+    def check_mail(self, domain):
+        return self.resolver.mail(domain)
+
+    def check_website(self, host, url):
+        """True if the site answers an HTTP request with anything but a server error"""
+        address = self.resolver.address(host)
+        headers = {}
+        if address:
+            url = f'http://{address}/'
+            headers['Host'] = host
+        elif not self.resolver.resolve(host):
+            return False
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=False, headers=headers)
+            response.close()
+            return response.status_code < 500
+        except requests.RequestException:
+            return False
+
+    def _check(self, key, func, *args):
+        def run():
+            ok = bool(func(*args))
+            self.cache.put(key, ok)
+            return ok
+        return self._flight.do(key, run)
+
+    def enrich(self, leads):
+        """Set lead['verification'] on every lead; returns the leads"""
+        if not leads:
+            return leads
+        with timed('enrichment'):
+            lead_checks = [self._checks(lead) for lead in leads]
+            checks = {}
+            for found in lead_checks:
+                for key, check in found.items():
+                    if key not in checks or check is None:
+                        checks[key] = check
+
+            outcomes = {}
+            pending = {}
+            for key, check in checks.items():
+                if check is None:
+                    outcomes[key] = True
+                    continue
+                func, *args = check
+                cached, ok = self.cache.get(key)
+                if cached:
+                    outcomes[key] = ok
+                else:
+                    pending[self._executor().submit(self._check, key, func, *args)] = key
+            if pending:
+                done, not_done = wait(pending, timeout=self.budget)
+                for future in done:
+                    try:
+                        outcomes[pending[future]] = future.result()
+                    except Exception as e:
+                        logger.warning(f"⚠️ Domain check {pending[future]} failed: {e}")
+                if not_done:
+                    logger.warning(f"⏱️ {len(not_done)} domain checks missed the {self.budget}s budget")
+
+            for lead, found in zip(leads, lead_checks):
+                lead['verification'] = verification_status([outcomes.get(key) for key in found])
+        return leads
+
+    def close(self):
+        with self._pool_lock:
+            for pool in (self._pool, self._batch_pool):
+                if pool is not None:
+                    pool.shutdown(wait=False)
+            self._pool = self._batch_pool = None
+
+
+def verification_status(outcomes):
+    """Status from check outcomes (True, False, or None for no answer)"""
+    known = [ok for ok in outcomes if ok is not None]
+    if not known:
+        return UNCHECKED
+    if all(known):
+        return VERIFIED if len(known) == len(outcomes) else PARTIAL
+    return PARTIAL if any(known) else UNREACHABLE
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def create_enricher(session):
+    """Enricher configured from ENRICH_* env vars, or None when ENRICH_ENABLED=0
+
+    Enrichers share one domain cache per process, so every scraper benefits
+    from the domains any of them has checked.
+    """
+    global _cache
+    if os.environ.get('ENRICH_ENABLED', '1') == '0':
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = DomainCache(
+                ttl=int(os.environ.get('ENRICH_CACHE_TTL', 86400)),
+                negative_ttl=int(os.environ.get('ENRICH_NEGATIVE_TTL', 900)),
+                max_entries=int(os.environ.get('ENRICH_CACHE_MAX_ENTRIES', 50_000))
+            )
+    hosts = os.environ.get('ENRICH_HOSTS')
+    return Enricher(
+        session,
+        resolver=HostsResolver.from_file(hosts) if hosts else None,
+        cache=_cache,
+        workers=int(os.environ.get('ENRICH_WORKERS', 16)),
+        timeout=float(os.environ.get('ENRICH_TIMEOUT', 3)),
+        budget=float(os.environ.get('ENRICH_BUDGET', 10)),
+        check_synthetic=os.environ.get('ENRICH_SYNTHETIC', '1') != '0'
+    )
@@ -1,52 +1,225 @@
 import os
 import csv
+import io
 import logging
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+
+from .models import ALL_FIELDS, Lead
+from . import vcard
+from .pdf import write_table
 
 logger = logging.getLogger(__name__)
 
+HEADERS = ['Name', 'Title', 'Company', 'Phone', 'Email', 'Website', 'Industry', 'Location', 'Source', 'Verification']
+FIELDS = ALL_FIELDS
+
+# Streamed exports are flushed to the client in chunks of about this many characters
+STREAM_CHUNK_SIZE = 16384
+
+# 'native' writes vCards from templates; 'vobject' builds them with the vobject library
+VCARD_WRITER = os.environ.get('VCARD_WRITER', 'native')
+VCARD_VERSION = os.environ.get('VCARD_VERSION', '3.0')
+
+# 'table' draws ~50 leads per page with the built-in writer; 'records' is the FPDF one-lead-per-block report
+PDF_LAYOUT = os.environ.get('PDF_LAYOUT', 'table')
+
+def lead_row(lead, default=''):
+    """The lead's values in HEADERS order"""
+    if isinstance(lead, Lead):
+        return [*lead.as_row(), lead.verification]
+    return [lead.get(field, default) for field in FIELDS]
+
+def _chunked(pieces, size=STREAM_CHUNK_SIZE):
+    """Join small string pieces into chunks of roughly size characters"""
+    buffer = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= size:
+            yield ''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield ''.join(buffer)
+
+def _csv_renderer():
+    line = io.StringIO()
+    writer = csv.writer(line)
+
+    def render(values):
+        line.seek(0)
+        line.truncate()
+        writer.writerow(values)
+        return line.getvalue()
+
+    return render(HEADERS), lambda i, lead: render(lead_row(lead))
+
+def txt_block(i, lead):
+    """The plain text report entry for lead number i"""
+    row = lead_row(lead, 'N/A')
+    lines = [f"LEAD #{i}\n", "-" * 40 + "\n"]
+    lines.extend(f"{header}: {value}\n" for header, value in zip(HEADERS, row))
+    lines.append("\n" + "=" * 60 + "\n\n")
+    return ''.join(lines)
+
+def _txt_renderer():
+    return "BUSINESS LEADS REPORT\n" + "=" * 60 + "\n\n", txt_block
+
+def _vcf_renderer():
+    if VCARD_WRITER == 'vobject':
+        import vobject  # fail fast if unavailable, before any output is written
+        return '', lambda i, lead: vcard_for_lead(lead)
+    version = VCARD_VERSION
+    if version not in vcard.VERSIONS:
+        logger.warning(f"⚠️ Unsupported VCARD_VERSION {version}, writing vCard 3.0")
+        version = '3.0'
+    return '', lambda i, lead: vcard.serialize(lead, version)
+
+# Text formats rendered row by row: each factory returns (header text, render_row(i, lead))
+ROW_RENDERERS = {
+    'csv': _csv_renderer,
+    'txt': _txt_renderer,
+    'vcf': _vcf_renderer,
+}
+
+def _render_rows(format_type, leads):
+    head, render_row = ROW_RENDERERS[format_type]()
+
+    def pieces():
+        if head:
+            yield head
+        for i, lead in enumerate(leads, 1):
+            yield render_row(i, lead)
+    return _chunked(pieces())
+
+def iter_csv(leads):
+    """Yield CSV text for the leads, one bounded chunk at a time"""
+    return _render_rows('csv', leads)
+
+def iter_txt(leads):
+    """Yield the plain text report for the leads, one bounded chunk at a time"""
+    return _render_rows('txt', leads)
+
+def vcard_for_lead(lead):
+    """Serialize one lead as a vCard with vobject"""
+    import vobject
+    
+    vcard = vobject.vCard()
+    
+    # Add name
+    if lead.get('name'):
+        names = lead['name'].split(' ', 1)
+        vcard.add('n')
+        if len(names) == 1:
+            vcard.n.value = vobject.vcard.Name(family=names[0], given='')
+        else:
+            vcard.n.value = vobject.vcard.Name(family=names[1], given=names[0])
+    
+    # Add formatted name
+    if lead.get('name'):
+        vcard.add('fn')
+        vcard.fn.value = lead['name']
+    
+    # Add phone
+    if lead.get('phone'):
+        vcard.add('tel')
+        vcard.tel.value = lead['phone']
+        vcard.tel.type_param = 'WORK'
+    
+    # Add email
+    if lead.get('email'):
+        vcard.add('email')
+        vcard.email.value = lead['email']
+        vcard.email.type_param = 'WORK'
+    
+    # Add organization
+    if lead.get('company'):
+        vcard.add('org')
+        vcard.org.value = [lead['company']]
+    
+    # Add title
+    if lead.get('title'):
+        vcard.add('title')
+        vcard.title.value = lead['title']
+    
+    # Add note
+    note_parts = []
+    if lead.get('industry'):
+        note_parts.append(f"Industry: {lead['industry']}")
+    if lead.get('source'):
+        note_parts.append(f"Source: {lead['source']}")
+    
+    if note_parts:
+        vcard.add('note')
+        vcard.note.value = ' | '.join(note_parts)
+    
+    return vcard.serialize() + '\n'
+
+def iter_vcf(leads):
+    """Yield vCards for the leads, one bounded chunk at a time"""
+    return _render_rows('vcf', leads)
+
+# Formats that can be written straight into a streamed HTTP response
+STREAM_WRITERS = {
+    'csv': (iter_csv, 'text/csv'),
+    'txt': (iter_txt, 'text/plain'),
+    'vcf': (iter_vcf, 'text/vcard'),
+}
+
+# Format written instead when a library is missing or its export fails
+FALLBACK_FORMATS = {'xlsx': 'csv', 'pdf': 'txt', 'vcf': 'csv'}
+
+def fallback_filename(filename, format_type=None):
+    """Path a failed export of filename writes its fallback to - same name, fallback extension"""
+    return f"{os.path.splitext(filename)[0]}.{FALLBACK_FORMATS.get(format_type, 'csv')}"
+
 def export_xlsx(leads, filename):
     """Export leads to Excel format"""
     try:
         import openpyxl
         from openpyxl import Workbook
         
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Leads"
+        # Write-only mode streams rows to disk instead of keeping every cell in memory
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Leads")
         
         # Headers
-        headers = ['Name', 'Title', 'Company', 'Phone', 'Email', 'Website', 'Industry', 'Location', 'Source']
-        ws.append(headers)
+        ws.append(HEADERS)
         
         # Data
         for lead in leads:
-            row = [
-                lead.get('name', ''),
-                lead.get('title', ''),
-                lead.get('company', ''),
-                lead.get('phone', ''),
-                lead.get('email', ''),
-                lead.get('website', ''),
-                lead.get('industry', ''),
-                lead.get('location', ''),
-                lead.get('source', '')
-            ]
-            ws.append(row)
+            ws.append(lead_row(lead))
         
         wb.save(filename)
         logger.info(f"✅ Exported {len(leads)} leads to XLSX: {filename}")
         return True
     except ImportError:
         logger.warning("❌ openpyxl not available, falling back to CSV")
-        export_csv(leads, filename.replace('.xlsx', '.csv'))
+        export_csv(leads, fallback_filename(filename, 'xlsx'))
         return False
     except Exception as e:
         logger.error(f"❌ Error exporting to XLSX: {e}")
-        export_csv(leads, filename.replace('.xlsx', '.csv'))
+        export_csv(leads, fallback_filename(filename, 'xlsx'))
         return False
 
 def export_pdf(leads, filename):
     """Export leads to PDF format"""
+    if PDF_LAYOUT != 'records':
+        try:
+            pages = write_table(leads, filename)
+            logger.info(f"✅ Exported {len(leads)} leads to PDF ({pages} pages): {filename}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error writing PDF table, falling back to FPDF: {e}")
+    return export_pdf_records(leads, filename)
+
+def export_pdf_records(leads, filename):
+    """Export leads to PDF with FPDF, one block of lines per lead"""
     try:
         from fpdf import FPDF
         
@@ -75,7 +248,8 @@ def export_pdf(leads, filename):
                 f"Website: {lead.get('website', 'N/A')}",
                 f"Industry: {lead.get('industry', 'N/A')}",
                 f"Location: {lead.get('location', 'N/A')}",
-                f"Source: {lead.get('source', 'N/A')}"
+                f"Source: {lead.get('source', 'N/A')}",
+                f"Verification: {lead.get('verification') or 'N/A'}"
             ]
             
             for line in info:
@@ -87,102 +261,35 @@ def export_pdf(leads, filename):
         return True
     except ImportError:
         logger.warning("❌ fpdf not available, falling back to TXT")
-        export_txt(leads, filename.replace('.pdf', '.txt'))
+        export_txt(leads, fallback_filename(filename, 'pdf'))
         return False
     except Exception as e:
         logger.error(f"❌ Error exporting to PDF: {e}")
-        export_txt(leads, filename.replace('.pdf', '.txt'))
+        export_txt(leads, fallback_filename(filename, 'pdf'))
         return False
 
 def export_vcf(leads, filename):
     """Export leads to vCard format"""
     try:
-        import vobject
-        
         with open(filename, 'w', encoding='utf-8') as f:
-            for i, lead in enumerate(leads):
-                vcard = vobject.vCard()
-                
-                # Add name
-                if lead.get('name'):
-                    names = lead['name'].split(' ', 1)
-                    vcard.add('n')
-                    if len(names) == 1:
-                        vcard.n.value = vobject.vcard.Name(family=names[0], given='')
-                    else:
-                        vcard.n.value = vobject.vcard.Name(family=names[1], given=names[0])
-                
-                # Add formatted name
-                if lead.get('name'):
-                    vcard.add('fn')
-                    vcard.fn.value = lead['name']
-                
-                # Add phone
-                if lead.get('phone'):
-                    vcard.add('tel')
-                    vcard.tel.value = lead['phone']
-                    vcard.tel.type_param = 'WORK'
-                
-                # Add email
-                if lead.get('email'):
-                    vcard.add('email')
-                    vcard.email.value = lead['email']
-                    vcard.email.type_param = 'WORK'
-                
-                # Add organization
-                if lead.get('company'):
-                    vcard.add('org')
-                    vcard.org.value = [lead['company']]
-                
-                # Add title
-                if lead.get('title'):
-                    vcard.add('title')
-                    vcard.title.value = lead['title']
-                
-                # Add note
-                note_parts = []
-                if lead.get('industry'):
-                    note_parts.append(f"Industry: {lead['industry']}")
-                if lead.get('source'):
-                    note_parts.append(f"Source: {lead['source']}")
-                
-                if note_parts:
-                    vcard.add('note')
-                    vcard.note.value = ' | '.join(note_parts)
-                
-                f.write(vcard.serialize())
-                f.write('\n')
+            f.writelines(iter_vcf(leads))
         
         logger.info(f"✅ Exported {len(leads)} leads to VCF: {filename}")
         return True
     except ImportError:
         logger.warning("❌ vobject not available, falling back to CSV")
-        export_csv(leads, filename.replace('.vcf', '.csv'))
+        export_csv(leads, fallback_filename(filename, 'vcf'))
         return False
     except Exception as e:
         logger.error(f"❌ Error exporting to VCF: {e}")
-        export_csv(leads, filename.replace('.vcf', '.csv'))
+        export_csv(leads, fallback_filename(filename, 'vcf'))
         return False
 
 def export_csv(leads, filename):
     """Export leads to CSV format"""
     try:
         with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Name', 'Title', 'Company', 'Phone', 'Email', 'Website', 'Industry', 'Location', 'Source'])
-            
-            for lead in leads:
-                writer.writerow([
-                    lead.get('name', ''),
-                    lead.get('title', ''),
-                    lead.get('company', ''),
-                    lead.get('phone', ''),
-                    lead.get('email', ''),
-                    lead.get('website', ''),
-                    lead.get('industry', ''),
-                    lead.get('location', ''),
-                    lead.get('source', '')
-                ])
+            f.writelines(iter_csv(leads))
         logger.info(f"✅ Exported {len(leads)} leads to CSV: {filename}")
         return True
     except Exception as e:
@@ -193,22 +300,7 @@ def export_txt(leads, filename):
     """Export leads to simple text format"""
     try:
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write("BUSINESS LEADS REPORT\n")
-            f.write("=" * 60 + "\n\n")
-            
-            for i, lead in enumerate(leads, 1):
-                f.write(f"LEAD #{i}\n")
-                f.write("-" * 40 + "\n")
-                f.write(f"Name: {lead.get('name', 'N/A')}\n")
-                f.write(f"Title: {lead.get('title', 'N/A')}\n")
-                f.write(f"Company: {lead.get('company', 'N/A')}\n")
-                f.write(f"Phone: {lead.get('phone', 'N/A')}\n")
-                f.write(f"Email: {lead.get('email', 'N/A')}\n")
-                f.write(f"Website: {lead.get('website', 'N/A')}\n")
-                f.write(f"Industry: {lead.get('industry', 'N/A')}\n")
-                f.write(f"Location: {lead.get('location', 'N/A')}\n")
-                f.write(f"Source: {lead.get('source', 'N/A')}\n")
-                f.write("\n" + "=" * 60 + "\n\n")
+            f.writelines(iter_txt(leads))
         
         logger.info(f"✅ Exported {len(leads)} leads to TXT: {filename}")
         return True
@@ -239,14 +331,115 @@ def export_data(leads, filename, format_type):
             return export_txt(leads, filename)
         else:
             logger.warning(f"❌ Unknown format {format_type}, defaulting to CSV")
-            return export_csv(leads, filename.replace('.xlsx', '.csv').replace('.pdf', '.csv').replace('.vcf', '.csv'))
+            return export_csv(leads, fallback_filename(filename))
             
     except Exception as e:
         logger.error(f"❌ Error in export_data: {e}")
         # Last resort - try CSV
         try:
-            csv_filename = 'leads_export.csv'
-            return export_csv(leads, csv_filename)
+            return export_csv(leads, fallback_filename(filename))
         except Exception as final_error:
             logger.error(f"❌ Final export fallback failed: {final_error}")
-            return False
\ No newline at end of file
+            return False
+
+# Built as whole documents by third-party libraries - CPU-bound, so they get their own processes
+PROCESS_FORMATS = ('xlsx', 'pdf')
+
+_export_pool = None
+_export_pool_lock = threading.Lock()
+
+def get_export_pool():
+    """Process pool for XLSX/PDF exports (EXPORT_PROCESSES workers, 0 disables), created on first use"""
+    global _export_pool
+    workers = int(os.environ.get('EXPORT_PROCESSES', 2))
+    if workers <= 0:
+        return None
+    with _export_pool_lock:
+        if _export_pool is None:
+            # Never fork: the web worker runs thread pools, and a forked lock can deadlock the child.
+            # A forkserver starts children from a clean single-threaded process instead.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            if 'forkserver' in methods:
+                context.set_forkserver_preload([__name__])
+            _export_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            logger.info(f"🏭 Started export process pool with {workers} workers")
+        return _export_pool
+
+def close_export_pool():
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is not None:
+            _export_pool.shutdown(wait=True)
+            _export_pool = None
+
+def _discard_broken_pool(pool):
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is pool:
+            _export_pool = None
+
+def export_many(leads, targets, pool=None):
+    """Export leads to several formats in one pass; targets maps format -> filename
+
+    CSV, TXT and VCF rows are rendered side by side from a single walk over
+    the leads while XLSX and PDF are built concurrently on pool (a process
+    pool from get_export_pool, or threads when None). Returns {format: success}.
+    """
+    results = {}
+    executor = pool or ThreadPoolExecutor(max_workers=len(PROCESS_FORMATS))
+    futures = {}
+    for format_type in PROCESS_FORMATS:
+        if format_type in targets:
+            try:
+                futures[format_type] = executor.submit(export_data, leads, targets[format_type], format_type)
+            except BrokenProcessPool:
+                _discard_broken_pool(pool)
+    
+    try:
+        with ExitStack() as files:
+            writers = []
+            for format_type, filename in targets.items():
+                if format_type not in ROW_RENDERERS:
+                    continue
+                try:
+                    head, render_row = ROW_RENDERERS[format_type]()
+                except ImportError as e:
+                    logger.warning(f"❌ {format_type} export unavailable: {e}")
+                    results[format_type] = False
+                    continue
+                f = files.enter_context(open(filename, 'w', encoding='utf-8',
+                                             newline='' if format_type == 'csv' else None))
+                f.write(head)
+                writers.append((format_type, f.write, render_row))
+            
+            for i, lead in enumerate(leads, 1):
+                for _, write, render_row in writers:
+                    write(render_row(i, lead))
+        for format_type, _, _ in writers:
+            results[format_type] = True
+        if writers:
+            logger.info(f"✅ Exported {len(leads)} leads to {', '.join(f for f, _, _ in writers).upper()} in one pass")
+    except Exception as e:
+        logger.error(f"❌ Error in one-pass export: {e}")
+        for format_type in targets:
+            if format_type in ROW_RENDERERS:
+                results[format_type] = False
+    
+    for format_type in PROCESS_FORMATS:
+        if format_type not in targets:
+            continue
+        try:
+            results[format_type] = futures[format_type].result()
+        except Exception as e:
+            # Worker died or was never started - build the document here instead
+            logger.warning(f"⚠️ {format_type} export process failed ({e!r}), exporting in-process")
+            if isinstance(e, BrokenProcessPool) or format_type not in futures:
+                _discard_broken_pool(pool)
+            results[format_type] = export_data(leads, targets[format_type], format_type)
+    if pool is None:
+        executor.shutdown(wait=False)
+    
+    for format_type in targets:
+        results.setdefault(format_type, False)
+    return results
@@ -0,0 +1,150 @@
+import re
+
+from .metrics import timed
+
+# One alternation so a single scan finds both kinds of contact. The phone
+# branch is guarded by a cheap lookahead on its first character so most text
+# positions are rejected without entering the full phone expression.
+CONTACT_PATTERN = re.compile(r'''
+    (?=[+(0-9])(?<![\w+])(?P<phone>
+        # International: +49 30 1234567, 0044 20 7946 0958, +1 (555) 123-4567
+        (?:\+|00)[1-9][0-9]{0,2}(?:[-.\s]?\(?[0-9]{1,4}\)?){1,4}[-.\s]?[0-9]{2,4}
+        # North American: (555) 123-4567, 555.123.4567, 1-555-123-4567
+      | (?:1[-.\s]?)?(?:\([0-9]{3}\)|[0-9]{3})[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}
+    )\b(?![\w.%+-]*@)  # digits that are really the start of an email address
+  | (?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)
+''', re.VERBOSE)
+
+_NON_DIGITS = re.compile(r'[^0-9]')
+
+
+def normalize_phone(raw, dial_code=None):
+    """Convert a phone number to E.164 (+<country><number>), or None if it can't be one
+
+    A number without an international prefix needs dial_code; without one
+    its country is unknown and None is returned.
+    """
+    raw = raw.strip()
+    digits = _NON_DIGITS.sub('', raw)
+
+    if raw.startswith('+'):
+        number = digits
+    elif raw.startswith('00'):
+        number = digits[2:]
+    elif not dial_code:
+        return None
+    else:
+        country_digits = dial_code.lstrip('+')
+        if digits.startswith('0'):
+            # Drop the national trunk prefix (030 1234567 -> 30 1234567)
+            digits = digits[1:]
+        if digits.startswith(country_digits) and len(digits) > 10:
+            number = digits
+        else:
+            number = country_digits + digits
+
+    # E.164 allows at most 15 digits; shorter than 8 is never a full number
+    if not 8 <= len(number) <= 15 or number.startswith('0'):
+        return None
+    return '+' + number
+
+
+def found_phone(raw, dial_code=None):
+    """A phone number found in text: E.164 when its country is known, else as written; None if not a number"""
+    phone = normalize_phone(raw, dial_code)
+    if phone or dial_code or raw.lstrip().startswith(('+', '00')):
+        return phone
+    # National format and no country to read it in - keep it rather than guess one
+    if not 7 <= len(_NON_DIGITS.sub('', raw)) <= 15:
+        return None
+    return ' '.join(raw.split())
+
+
+class ContactExtractor:
+    """Finds phones and emails in one regex pass, deduplicated in first-seen order"""
+
+    def __init__(self, pattern=CONTACT_PATTERN):
+        self.pattern = pattern
+
+    def extract(self, text, dial_code=None):
+        """Return (phones, emails) found in text, phones in E.164 when dial_code (or a prefix) gives their country"""
+        if not text:
+            return [], []
+
+        phones = {}
+        emails = {}
+        with timed('contact_extraction'):
+            for match in self.pattern.finditer(text):
+                email = match.group('email')
+                if email:
+                    emails.setdefault(email.lower(), email)
+                    continue
+                phone = found_phone(match.group('phone'), dial_code)
+                if phone:
+                    phones.setdefault(phone, None)
+
+        return list(phones), list(emails.values())
+
+
+_default_extractor = ContactExtractor()
+
+
+def extract_contacts(text, dial_code=None):
+    """Module-level shortcut using the shared precompiled extractor"""
+    return _default_extractor.extract(text, dial_code)
+
+
+class StreamingExtraction:
+    """Incremental form of ContactExtractor.extract for text that arrives in pieces
+
+    Text is buffered and scanned once it exceeds chunk_size. The last
+    `overlap` characters are held back so a contact split across two pieces
+    is still seen whole on the next scan.
+    """
+
+    def __init__(self, pattern=CONTACT_PATTERN, dial_code=None, chunk_size=65536, overlap=256):
+        self.pattern = pattern
+        self.dial_code = dial_code
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self._buffer = ''
+        self._phones = {}
+        self._emails = {}
+
+    def feed(self, text):
+        self._buffer += text
+        if len(self._buffer) >= self.chunk_size:
+            self._scan(final=False)
+
+    def close(self):
+        """Scan whatever is left and return (phones, emails)"""
+        self._scan(final=True)
+        return list(self._phones), list(self._emails.values())
+
+    def _scan(self, final):
+        with timed('contact_extraction'):
+            self._scan_buffer(final)
+
+    def _scan_buffer(self, final):
+        buffer = self._buffer
+        cut = len(buffer) if final else len(buffer) - self.overlap
+        resume = cut
+        for match in self.pattern.finditer(buffer):
+            if match.start() >= cut:
+                break
+            if not final and match.end() >= len(buffer):
+                # Could continue into the next piece - rescan it then
+                resume = match.start()
+                break
+            self._record(match)
+            resume = max(cut, match.end())
+        self._buffer = buffer[resume:]
+
+    def _record(self, match):
+        email = match.group('email')
+        if email:
+            self._emails.setdefault(email.lower(), email)
+            return
+        phone = found_phone(match.group('phone'), self.dial_code)
+        if phone:
+            self._phones.setdefault(phone, None)
@@ -0,0 +1,212 @@
+import codecs
+import logging
+import re
+from html.parser import HTMLParser
+
+from .extractor import StreamingExtraction
+from .metrics import BYTES
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how much of one response body is read
+DEFAULT_MAX_BYTES = 2_000_000
+CHUNK_SIZE = 16384
+
+SKIP_TAGS = ('script', 'style')
+
+
+class StreamingPageParser(HTMLParser):
+    """Event-driven HTML parser that never builds a document tree
+
+    Text outside <script>/<style> goes straight to text_sink. Alongside it
+    collects the <title>, <a href> links, and the first <heading_tag> inside
+    each result container (e.g. div.g h3 on a Google results page).
+    """
+
+    def __init__(self, text_sink=None, result_container=None, heading_tag='h3', collect_links=False):
+        super().__init__(convert_charrefs=True)
+        self.text_sink = text_sink
+        self.result_container = result_container
+        self.heading_tag = heading_tag
+        self.collect_links = collect_links
+
+        self.title = None
+        self.links = []
+        self.results = []
+
+        self._skip = 0
+        self._in_title = False
+        self._title_parts = []
+        self._link = None
+        self._container_depth = 0
+        self._container_done = False
+        self._heading = None
+
+    def _separate(self):
+        # Text of adjacent elements must not run together: <td>Phone</td><td>+49 30 1234567</td>
+        if self.text_sink is not None and not self._skip:
+            self.text_sink(' ')
+
+    def handle_starttag(self, tag, attrs):
+        self._separate()
+        if tag in SKIP_TAGS:
+            self._skip += 1
+            return
+        if tag == 'title' and self.title is None:
+            self._in_title = True
+        elif tag == 'a' and self.collect_links:
+            href = dict(attrs).get('href')
+            if href:
+                self._link = [href, []]
+
+        if self.result_container:
+            container_tag, container_class = self.result_container
+            if tag == container_tag:
+                if self._container_depth:
+                    self._container_depth += 1
+                elif container_class in (dict(attrs).get('class') or '').split():
+                    self._container_depth = 1
+                    self._container_done = False
+            elif tag == self.heading_tag and self._container_depth and not self._container_done:
+                self._heading = []
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+            return
+        self._separate()
+        if tag == 'title' and self._in_title:
+            self._in_title = False
+            self.title = ''.join(self._title_parts).strip()
+        elif tag == 'a' and self._link is not None:
+            self.links.append((self._link[0], ' '.join(self._link[1]).strip()))
+            self._link = None
+
+        if self.result_container:
+            if tag == self.heading_tag and self._heading is not None:
+                text = ''.join(self._heading).strip()
+                if text:
+                    self.results.append(text)
+                self._heading = None
+                self._container_done = True
+            elif tag == self.result_container[0] and self._container_depth:
+                self._container_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._in_title:
+            self._title_parts.append(data)
+        if self._link is not None:
+            self._link[1].append(data.strip())
+        if self._heading is not None:
+            self._heading.append(data)
+        if self.text_sink is not None:
+            self.text_sink(data)
+
+
+_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+# HTML treats these labels as windows-1252 (WHATWG encoding standard)
+_WINDOWS_1252 = ('iso-8859-1', 'iso8859-1', 'latin-1', 'latin1', 'us-ascii', 'ascii')
+
+BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+
+def body_encoding(content_type, head):
+    """Encoding of an HTML body: the Content-Type charset, else a BOM or <meta charset> in head, else UTF-8
+
+    requests reports ISO-8859-1 for any text/html without a charset, so
+    response.encoding can't tell a declared charset from a guess.
+    """
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = _CHARSET.search(content_type or '') or _META_CHARSET.search(head[:4096])
+    if match:
+        label = match.group(1)
+        label = label.decode('ascii', 'ignore') if isinstance(label, bytes) else label
+        label = 'cp1252' if label.lower() in _WINDOWS_1252 else label
+        try:
+            return codecs.lookup(label).name
+        except LookupError:
+            logger.debug(f"Unknown charset {label!r}, reading as UTF-8")
+    return 'utf-8'
+
+
+def iter_body(response, max_bytes=DEFAULT_MAX_BYTES, chunk_size=CHUNK_SIZE):
+    """Yield decoded text chunks from a streamed response, stopping after max_bytes"""
+    decoder = None
+    read = 0
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if read + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - read]
+            read += len(chunk)
+            if decoder is None:
+                encoding = body_encoding(response.headers.get('Content-Type'), chunk)
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            yield decoder.decode(chunk)
+            if read >= max_bytes:
+                logger.info(f"✂️ Stopped reading {response.url} at {max_bytes} bytes")
+                break
+        if decoder is not None:
+            yield decoder.decode(b'', final=True)
+    finally:
+        BYTES.inc(read, kind='page_body')
+        response.close()
+
+
+def read_capped(response, max_bytes=DEFAULT_MAX_BYTES):
+    """Read at most max_bytes of a streamed response body as bytes"""
+    parts = []
+    read = 0
+    try:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            parts.append(chunk[:max_bytes - read])
+            read += len(parts[-1])
+            if read >= max_bytes:
+                break
+    finally:
+        BYTES.inc(read, kind='page_body')
+        response.close()
+    return b''.join(parts)
+
+
+def stream_page(response, max_bytes=DEFAULT_MAX_BYTES, dial_code=None, collect_links=False):
+    """Parse a company page incrementally: title, contacts and (optionally) links"""
+    return _parse_chunks(iter_body(response, max_bytes), dial_code, collect_links)
+
+
+def parse_html(html, dial_code=None, collect_links=False):
+    """stream_page for markup already in memory, e.g. a page rendered by a browser"""
+    return _parse_chunks((html[i:i + CHUNK_SIZE] for i in range(0, len(html), CHUNK_SIZE)),
+                             dial_code, collect_links)
+
+
+def _parse_chunks(chunks, dial_code=None, collect_links=False):
+    extraction = StreamingExtraction(dial_code=dial_code)
+    parser = StreamingPageParser(text_sink=extraction.feed, collect_links=collect_links)
+    for text in chunks:
+        parser.feed(text)
+    parser.close()
+    phones, emails = extraction.close()
+    return {
+        'title': parser.title or '',
+        'phones': phones,
+        'emails': emails,
+        'links': parser.links,
+    }
+
+
+def stream_search_results(response, container=('div', 'g'), heading_tag='h3',
+                          limit=5, max_bytes=DEFAULT_MAX_BYTES):
+    """Pull result headings out of a search results page without building a tree"""
+    parser = StreamingPageParser(result_container=container, heading_tag=heading_tag)
+    for text in iter_body(response, max_bytes):
+        parser.feed(text)
+        if len(parser.results) >= limit:
+            break
+    parser.close()
+    return parser.results[:limit]
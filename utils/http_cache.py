@@ -0,0 +1,370 @@
+import email.utils
+import io
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .metrics import BYTES, CACHE_EVENTS
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the wire encoding - cached bodies are stored decoded
+DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+
+def normalize_cache_key(url):
+    """Cache key for a GET: lower-case scheme/host, default port dropped, query sorted, no fragment"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    port = parts.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f'{host}:{port}'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+def cache_directives(headers):
+    """Cache-Control directives as {name: value}, names lower-cased"""
+    directives = {}
+    for part in headers.get('Cache-Control', '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def _http_date(value):
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers, default_ttl):
+    """Seconds a response may be served without revalidation, or None if it must not be stored
+
+    Responses marked no-store or private are not stored; no-cache ones are
+    stored for revalidation only (lifetime 0). Without max-age or Expires,
+    a response with Last-Modified gets the RFC 9111 heuristic - a tenth of
+    its age, capped at default_ttl - and one without gets 0.
+    """
+    directives = cache_directives(headers)
+    if 'no-store' in directives or 'private' in directives:
+        return None
+    if 'no-cache' in directives:
+        return 0
+    for name in ('s-maxage', 'max-age'):
+        if directives.get(name, '').isdigit():
+            return int(directives[name])
+    if headers.get('Expires'):
+        expires = _http_date(headers['Expires'])
+        return max(0, int(expires - time.time())) if expires is not None else 0
+    last_modified = _http_date(headers.get('Last-Modified'))
+    if last_modified is None:
+        return 0
+    date = _http_date(headers.get('Date')) or time.time()
+    return max(0, min(default_ttl, int((date - last_modified) / 10)))
+
+
+class ResponseCache:
+    """SQLite-backed store of GET responses with TTLs, validators and LRU eviction"""
+
+    def __init__(self, path, max_bytes=200_000_000, default_ttl=3600, min_ttl=0, max_entry_bytes=2_000_000,
+                 touch_batch=100, touch_interval=5.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_entry_bytes = max_entry_bytes
+        # Hits only note their access time; it is written out in batches
+        self.touch_batch = touch_batch
+        self.touch_interval = touch_interval
+        self._touches = {}
+        self._flushed_at = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)')
+        self._conn.commit()
+
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'revalidated': 0,
+            'stores': 0,
+            'evictions': 0,
+            'hit_bytes': 0,
+            'miss_bytes': 0,
+        }
+
+    def record(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+        if name.endswith('_bytes'):
+            BYTES.inc(amount, kind=f'http_cache_{name[:-6]}')
+        else:
+            CACHE_EVENTS.inc(amount, cache='http', event=name)
+
+    def get(self, key):
+        """Return the cached entry for key (fresh or stale), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, headers, body, etag, last_modified, expires_at FROM responses WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touches[key] = time.time()
+            if (len(self._touches) >= self.touch_batch
+                    or time.monotonic() - self._flushed_at >= self.touch_interval):
+                self._flush_touches()
+                self._conn.commit()
+        return {
+            'status': row[0],
+            'headers': json.loads(row[1]),
+            'body': row[2],
+            'etag': row[3],
+            'last_modified': row[4],
+            'fresh': row[5] > time.time(),
+        }
+
+    def _min_ttl(self, headers):
+        # The floor never overrides a server that asked for revalidation
+        return 0 if 'no-cache' in cache_directives(headers) else self.min_ttl
+
+    def put(self, key, status, headers, body):
+        """Store a response body; returns False if it isn't cacheable"""
+        ttl = freshness_lifetime(headers, self.default_ttl)
+        if ttl is None or len(body) > self.max_entry_bytes:
+            return False
+        ttl = max(ttl, self._min_ttl(headers))
+        if ttl == 0 and not (headers.get('ETag') or headers.get('Last-Modified')):
+            return False
+
+        stored_headers = {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS}
+        now = time.time()
+        with self._lock:
+            self._touches.pop(key, None)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, status, json.dumps(stored_headers), body, len(body),
+                 headers.get('ETag'), headers.get('Last-Modified'), now + ttl, now)
+            )
+            self._evict()
+            self._conn.commit()
+            self._counters['stores'] += 1
+        CACHE_EVENTS.inc(cache='http', event='stores')
+        return True
+
+    def refresh(self, key, headers):
+        """Extend an entry's lifetime after a 304 Not Modified"""
+        ttl = freshness_lifetime(headers, self.default_ttl)
+        ttl = max(ttl or 0, self._min_ttl(headers))
+        with self._lock:
+            self._conn.execute('UPDATE responses SET expires_at = ? WHERE key = ?', (time.time() + ttl, key))
+            self._conn.commit()
+
+    def _flush_touches(self):
+        # Caller holds the lock and commits
+        if self._touches:
+            self._conn.executemany('UPDATE responses SET last_access = ? WHERE key = ?',
+                                   [(at, key) for key, at in self._touches.items()])
+            self._touches.clear()
+        self._flushed_at = time.monotonic()
+
+    def _evict(self):
+        # Caller holds the lock. Drop least recently used entries until under budget.
+        self._flush_touches()
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY last_access').fetchall():
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._counters['evictions'] += 1
+            CACHE_EVENTS.inc(cache='http', event='evictions')
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+            stats = dict(self._counters)
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['entries'] = entries
+        stats['size_bytes'] = size
+        stats['max_bytes'] = self.max_bytes
+        stats['hit_ratio'] = round((stats['hits'] + stats['revalidated']) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._touches.clear()
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+
+class _ReplayStream(io.RawIOBase):
+    """Raw body that first replays bytes already read, then continues the original stream"""
+
+    def __init__(self, prefix, chunks, raw):
+        self._buffer = prefix
+        self._chunks = chunks
+        self._raw = raw
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._buffer + b''.join(self._chunks)
+            self._buffer = b''
+            return data
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, b'')
+            if not chunk:
+                break
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self):
+        self._raw.close()
+        super().close()
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that answers GETs from a ResponseCache when it can
+
+    Fresh entries are served without touching the network. Stale entries
+    with an ETag or Last-Modified are revalidated with a conditional request,
+    and a 304 is answered from the cache.
+    """
+
+    def __init__(self, cache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != 'GET' or 'no-cache' in request.headers.get('Cache-Control', ''):
+            return super().send(request, stream=stream, **kwargs)
+
+        key = normalize_cache_key(request.url)
+        entry = self.cache.get(key)
+        if entry and entry['fresh']:
+            self.cache.record('hits')
+            self.cache.record('hit_bytes', len(entry['body']))
+            return self._cached_response(request, entry)
+
+        if entry:
+            request = request.copy()
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, stream=True, **kwargs)
+
+        if entry and response.status_code == 304:
+            response.close()
+            self.cache.refresh(key, response.headers)
+            self.cache.record('revalidated')
+            self.cache.record('hit_bytes', len(entry['body']))
+            return self._cached_response(request, entry)
+
+        self.cache.record('misses')
+        if response.status_code == 200:
+            self._store(key, response)
+        return response
+
+    def _store(self, key, response):
+        """Read the body (up to the entry size limit) into the cache"""
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit() and int(length) > self.cache.max_entry_bytes:
+            return
+
+        chunks = []
+        read = 0
+        stream = response.raw.stream(65536, decode_content=True)
+        for chunk in stream:
+            chunks.append(chunk)
+            read += len(chunk)
+            if read > self.cache.max_entry_bytes:
+                # Too big to cache - hand back what was read plus the rest of the stream
+                response.raw = _ReplayStream(b''.join(chunks), stream, response.raw)
+                self.cache.record('miss_bytes', read)
+                return
+
+        body = b''.join(chunks)
+        response._content = body
+        response._content_consumed = True
+        response.raw.release_conn()
+        self.cache.record('miss_bytes', len(body))
+        self.cache.put(key, response.status_code, response.headers, body)
+
+    def _cached_response(self, request, entry):
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = entry['body']
+        response._content_consumed = True
+        response.from_cache = True
+        return response
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Process-wide ResponseCache configured from HTTP_CACHE_* env vars, or None if disabled"""
+    global _cache
+    if os.environ.get('HTTP_CACHE_ENABLED', '1').lower() in ('0', 'false', 'no'):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                os.environ.get('HTTP_CACHE_PATH') or os.path.join(
+                    tempfile.gettempdir(), 'lead_generator_http_cache.db'),
+                max_bytes=int(os.environ.get('HTTP_CACHE_MAX_BYTES', 200_000_000)),
+                default_ttl=int(os.environ.get('HTTP_CACHE_TTL', 3600)),
+                min_ttl=int(os.environ.get('HTTP_CACHE_MIN_TTL', 0)),
+                max_entry_bytes=int(os.environ.get('HTTP_CACHE_MAX_ENTRY_BYTES', 2_000_000)),
+                touch_batch=int(os.environ.get('HTTP_CACHE_TOUCH_BATCH', 100))
+            )
+            logger.info(f"🗄️ HTTP response cache at {_cache.path}")
+    return _cache
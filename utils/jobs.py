@@ -0,0 +1,264 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import ERRORS, Timings
+from .progress import ProgressChannel
+
+logger = logging.getLogger(__name__)
+
+# Job states
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Why a job failed: nothing matched (e.g. no leads found) or something broke
+NOT_FOUND = 'not_found'
+ERROR = 'error'
+
+
+def _json_default(value):
+    # Lead records (and anything else with a dict view) are stored as dicts
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue cannot accept more work"""
+
+
+class MemoryJobStore:
+    """Keeps jobs in a dict - only visible to the process that created them"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id, payload):
+        now = time.time()
+        job = {
+            'id': job_id,
+            'status': PENDING,
+            'payload': payload,
+            'result': None,
+            'error': None,
+            'error_kind': None,
+            'created_at': now,
+            'updated_at': now,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        return dict(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.update(fields)
+            job['updated_at'] = time.time()
+            return dict(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def purge(self, older_than):
+        """Drop finished jobs last updated before the given timestamp"""
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job['status'] in (DONE, FAILED) and job['updated_at'] < older_than]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+
+class SQLiteJobStore:
+    """Keeps jobs in a SQLite file so every gunicorn worker can answer status polls"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._conn = None
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                error_kind TEXT
+            )
+        """)
+        columns = [row[1] for row in self._db.execute('PRAGMA table_info(jobs)')]
+        if 'error_kind' not in columns:
+            # Job files from before error kinds were recorded
+            self._db.execute('ALTER TABLE jobs ADD COLUMN error_kind TEXT')
+        self._db.commit()
+
+    @property
+    def _db(self):
+        # A connection must not cross a fork (gunicorn preload_app), so each process opens its own
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._pid = os.getpid()
+        return self._conn
+
+    def _row_to_job(self, row):
+        if row is None:
+            return None
+        return {
+            'id': row[0],
+            'status': row[1],
+            'payload': json.loads(row[2]) if row[2] else None,
+            'result': json.loads(row[3]) if row[3] else None,
+            'error': row[4],
+            'created_at': row[5],
+            'updated_at': row[6],
+            'error_kind': row[7],
+        }
+
+    def create(self, job_id, payload):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO jobs (id, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+                (job_id, PENDING, json.dumps(payload, default=_json_default), now, now)
+            )
+            self._db.commit()
+        return self.get(job_id)
+
+    def update(self, job_id, **fields):
+        columns = []
+        values = []
+        for key in ('status', 'result', 'error', 'error_kind'):
+            if key in fields:
+                value = fields[key]
+                if key == 'result' and value is not None:
+                    value = json.dumps(value, default=_json_default)
+                columns.append(f'{key} = ?')
+                values.append(value)
+        columns.append('updated_at = ?')
+        values.append(time.time())
+        values.append(job_id)
+        with self._lock:
+            self._db.execute(f"UPDATE jobs SET {', '.join(columns)} WHERE id = ?", values)
+            self._db.commit()
+        return self.get(job_id)
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._db.execute(
+                'SELECT id, status, payload, result, error, created_at, updated_at, error_kind FROM jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+        return self._row_to_job(row)
+
+    def purge(self, older_than):
+        """Drop finished jobs last updated before the given timestamp"""
+        with self._lock:
+            cursor = self._db.execute(
+                'DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?',
+                (DONE, FAILED, older_than)
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+
+def create_job_store(kind=None, path=None):
+    """Build a job store from settings or the JOB_STORE / JOB_DB_PATH env vars"""
+    kind = kind or os.environ.get('JOB_STORE', 'memory')
+    if kind == 'sqlite':
+        path = path or os.environ.get('JOB_DB_PATH') or os.path.join(
+            tempfile.gettempdir(), 'lead_generator_jobs.db')
+        return SQLiteJobStore(path)
+    if kind != 'memory':
+        logger.warning(f"❌ Unknown job store {kind}, defaulting to memory")
+    return MemoryJobStore()
+
+
+class JobQueue:
+    """Runs jobs on a bounded thread pool and records their progress in a store"""
+
+    def __init__(self, store, max_workers=4, max_pending=100, ttl=3600):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='lead-job')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._channels = {}
+
+    def submit(self, func, payload):
+        """Queue func(payload) and return the new job record"""
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError('Too many jobs in progress, please retry shortly')
+
+        job_id = uuid.uuid4().hex
+        try:
+            job = self.store.create(job_id, payload)
+            self._channels[job_id] = ProgressChannel()
+            self._executor.submit(self._run, job_id, func, payload)
+        except Exception:
+            self._channels.pop(job_id, None)
+            self._slots.release()
+            raise
+        self.store.purge(time.time() - self.ttl)
+        return job
+
+    def record(self, payload, result):
+        """Store a job that is already finished, e.g. one answered from a cache"""
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, payload)
+        return self.store.update(job_id, status=DONE, result=result)
+
+    def _run(self, job_id, func, payload):
+        timings = Timings()
+        channel = self._channels.get(job_id) or ProgressChannel()
+        try:
+            self.store.update(job_id, status=RUNNING)
+            with timings.activate(), channel.activate():
+                result = func(payload)
+            # Per-stage breakdown of where this job spent its time
+            if isinstance(result, dict):
+                result['timings'] = timings.as_dict()
+            self.store.update(job_id, status=DONE, result=result)
+        except LookupError as e:
+            # The search found nothing - an answer for the client, not a fault
+            logger.info(f"🔍 Job {job_id} found nothing ({payload.get('request_id', '-')}): {e}")
+            self.store.update(job_id, status=FAILED, error=str(e), error_kind=NOT_FOUND)
+        except Exception as e:
+            ERRORS.inc(stage='job')
+            logger.error(f"❌ Job {job_id} failed ({payload.get('request_id', '-')}): {e}")
+            self.store.update(job_id, status=FAILED, error=str(e), error_kind=ERROR)
+        finally:
+            # Readers keep their reference; the job record has the outcome
+            self._channels.pop(job_id, None)
+            channel.close()
+            self._slots.release()
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def progress(self, job_id):
+        """ProgressChannel of a job still running in this process, else None"""
+        return self._channels.get(job_id)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
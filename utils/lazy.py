@@ -0,0 +1,104 @@
+"""Load heavy modules on first use instead of at startup
+
+app.py imports the scraper stack (requests, urllib3, BeautifulSoup) through
+lazy_import, so a worker starts serving without paying for it until a
+search needs it. warm_up() imports a configured list ahead of time: from
+gunicorn's post_worker_init, or once in the master with preload_app so
+every forked worker starts with them already loaded.
+
+benchmarks/bench_startup.py reports what each dependency costs to import.
+"""
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Imported by warm_up() unless WARMUP_MODULES says otherwise
+DEFAULT_WARMUP_MODULES = ('utils.scraper', 'utils.http_cache', 'bs4')
+
+# Seconds each module took to load through this layer, by name
+IMPORT_SECONDS = {}
+
+_import_lock = threading.RLock()
+
+
+def load(name):
+    """Import a module by name, recording how long a first import took"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    with _import_lock:
+        if name not in sys.modules:
+            started = time.perf_counter()
+            importlib.import_module(name)
+            IMPORT_SECONDS[name] = time.perf_counter() - started
+            logger.info(f"📦 Loaded {name} in {IMPORT_SECONDS[name] * 1000:.0f}ms")
+    return sys.modules[name]
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__['_lazy_name'] = name
+
+    def __getattr__(self, attr):
+        return getattr(load(self._lazy_name), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(load(self._lazy_name), attr, value)
+
+    def __repr__(self):
+        state = 'loaded' if loaded(self._lazy_name) else 'not loaded'
+        return f'<lazy module {self._lazy_name!r} ({state})>'
+
+
+def lazy_import(name):
+    """A LazyModule for name - nothing is imported until it is used"""
+    return LazyModule(name)
+
+
+def loaded(name):
+    return name in sys.modules
+
+
+def missing_modules(*names):
+    """The names that cannot be imported, found without importing anything"""
+    missing = []
+    for name in names:
+        try:
+            if importlib.util.find_spec(name) is None:
+                missing.append(name)
+        except (ImportError, ValueError):
+            missing.append(name)
+    return missing
+
+
+def warmup_modules():
+    """Modules to load ahead of traffic, from the comma-separated WARMUP_MODULES env var"""
+    setting = os.environ.get('WARMUP_MODULES')
+    if setting is None:
+        return DEFAULT_WARMUP_MODULES
+    return tuple(name.strip() for name in setting.split(',') if name.strip())
+
+
+def warm_up(names=None):
+    """Import every module in names (default: warmup_modules()); returns {name: seconds}"""
+    timings = {}
+    started = time.perf_counter()
+    for name in warmup_modules() if names is None else names:
+        if loaded(name):
+            continue
+        try:
+            load(name)
+            timings[name] = IMPORT_SECONDS.get(name, 0.0)
+        except ImportError as e:
+            logger.warning(f"⚠️ Could not warm up {name}: {e}")
+    if timings:
+        logger.info(f"🔥 Warmed up {len(timings)} modules in {(time.perf_counter() - started) * 1000:.0f}ms")
+    return timings
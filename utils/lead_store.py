@@ -0,0 +1,214 @@
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from .dedupe import normalize_email
+from .extractor import normalize_phone
+from .models import ALL_FIELDS, Lead
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that filter on an indexed column (exact match)
+FILTERS = ('industry', 'country', 'title', 'source')
+
+MAX_PAGE_SIZE = 1000
+
+
+def lead_key(lead):
+    """Identity of a lead in the store: its phone/email pair as dedupe_leads compares them, else name at company"""
+    phone = (lead.get('phone') or '').strip()
+    phone = normalize_phone(phone) or phone if phone else ''
+    email = normalize_email(lead.get('email'))
+    if phone or email:
+        return f'c:{phone}_{email}'
+    return f"n:{(lead.get('name') or '').strip().lower()}|{(lead.get('company') or '').strip().lower()}"
+
+
+class LeadStore:
+    """Every lead the scraper finds, in a SQLite file that can be filtered and paged without scraping again
+
+    A lead seen again (same phone and email, or same name at company when
+    it has neither) updates its row in place, keeping its id and first-seen
+    time. Every write gives the row the next seen_order, so pages list the
+    most recently seen leads first. Pages are keyset paginated on
+    seen_order: the cursor is the last seen_order of a page, so each page is
+    one index range scan however deep the client pages.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._conn = None
+        fields = ', '.join(f'{field} TEXT NOT NULL' for field in ALL_FIELDS)
+        self._db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS leads (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                {fields},
+                country TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                seen_order INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+        self._migrate()
+        self._db.executescript("""
+            CREATE INDEX IF NOT EXISTS leads_seen_order ON leads (seen_order);
+            CREATE INDEX IF NOT EXISTS leads_industry_seen ON leads (industry, seen_order);
+            CREATE INDEX IF NOT EXISTS leads_country_seen ON leads (country, seen_order);
+            CREATE INDEX IF NOT EXISTS leads_title_seen ON leads (title, seen_order);
+            CREATE INDEX IF NOT EXISTS leads_source_seen ON leads (source, seen_order);
+            CREATE INDEX IF NOT EXISTS leads_created_at ON leads (created_at);
+        """)
+        self._db.commit()
+
+    def _migrate(self):
+        # Lead files from before seen_order, which were paged on id and keyed on email first
+        columns = [row[1] for row in self._db.execute('PRAGMA table_info(leads)')]
+        if 'seen_order' in columns:
+            return
+        self._db.execute('ALTER TABLE leads ADD COLUMN seen_order INTEGER NOT NULL DEFAULT 0')
+        self._db.execute('UPDATE leads SET seen_order = id')
+        rows = self._db.execute('SELECT id, name, company, phone, email FROM leads').fetchall()
+        # A row whose new key is already taken keeps its old one
+        self._db.executemany(
+            'UPDATE OR IGNORE leads SET key = ? WHERE id = ?',
+            [(lead_key(dict(zip(('name', 'company', 'phone', 'email'), row[1:]))), row[0]) for row in rows]
+        )
+        for field in ('industry', 'country', 'title', 'source'):
+            self._db.execute(f'DROP INDEX IF EXISTS leads_{field}')
+        logger.info(f"🗃️ Migrated {len(rows)} stored leads to seen_order paging")
+
+    @property
+    def _db(self):
+        # A connection must not cross a fork (gunicorn preload_app), so each process opens its own
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._pid = os.getpid()
+        return self._conn
+
+    def add(self, leads, search_data=None):
+        """Insert or refresh a batch of leads in one transaction; returns how many were written"""
+        search_data = search_data or {}
+        now = time.time()
+        rows = []
+        for lead in leads:
+            values = [lead.get(field) or '' for field in ALL_FIELDS]
+            # Filter on the country searched for; website leads may not carry a location
+            country = search_data.get('country') or lead.get('location') or ''
+            rows.append([lead_key(lead), *values, country, now, now])
+        if not rows:
+            return 0
+
+        columns = ', '.join(ALL_FIELDS)
+        updates = ', '.join(f'{field} = excluded.{field}'
+                            for field in ALL_FIELDS + ('country', 'updated_at', 'seen_order'))
+        placeholders = ', '.join('?' * (len(ALL_FIELDS) + 5))
+        with self._lock:
+            db = self._db
+            # Take the write lock before reading the last seen_order, so other processes can't reuse it
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                last = db.execute('SELECT COALESCE(MAX(seen_order), 0) FROM leads').fetchone()[0]
+                for order, row in enumerate(rows, last + 1):
+                    row.append(order)
+                db.executemany(
+                    f'INSERT INTO leads (key, {columns}, country, created_at, updated_at, seen_order) '
+                    f'VALUES ({placeholders}) ON CONFLICT (key) DO UPDATE SET {updates}',
+                    rows
+                )
+                db.commit()
+            except BaseException:
+                db.rollback()
+                raise
+        return len(rows)
+
+    def _where(self, filters, cursor=None):
+        clauses = []
+        values = []
+        for field in FILTERS:
+            if filters.get(field):
+                clauses.append(f'{field} = ?')
+                values.append(filters[field])
+        if filters.get('since') is not None:
+            clauses.append('created_at >= ?')
+            values.append(filters['since'])
+        if filters.get('until') is not None:
+            clauses.append('created_at < ?')
+            values.append(filters['until'])
+        if cursor is not None:
+            clauses.append('seen_order < ?')
+            values.append(cursor)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ''), values
+
+    def page(self, filters, cursor=None, limit=100):
+        """(records, next_cursor) for one page of matching leads, most recently seen first
+
+        Records are lead dicts plus id, country, created_at and last_seen;
+        next_cursor is None on the last page.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        where, values = self._where(filters, cursor)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT id, {', '.join(ALL_FIELDS)}, country, created_at, updated_at, seen_order FROM leads "
+                f"{where} ORDER BY seen_order DESC LIMIT ?",
+                (*values, limit + 1)
+            ).fetchall()
+        records = []
+        for row in rows[:limit]:
+            record = dict(zip(ALL_FIELDS, row[1:-4]))
+            record.update(id=row[0], country=row[-4], created_at=row[-3], last_seen=row[-2])
+            records.append(record)
+        next_cursor = rows[limit - 1][-1] if len(rows) > limit else None
+        return records, next_cursor
+
+    def iter_leads(self, filters, limit=None, page_size=MAX_PAGE_SIZE):
+        """Yield every matching Lead, most recently seen first, reading one page at a time"""
+        cursor = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            records, cursor = self.page(filters, cursor, size)
+            for record in records:
+                yield Lead.from_dict(record)
+            if remaining is not None:
+                remaining -= len(records)
+            if cursor is None:
+                return
+
+    def count(self, filters):
+        where, values = self._where(filters)
+        with self._lock:
+            return self._db.execute(f'SELECT COUNT(*) FROM leads {where}', values).fetchone()[0]
+
+    def stats(self):
+        return {'leads': self.count({}), 'path': self.path}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_lead_store():
+    """Process-wide LeadStore at LEAD_STORE_PATH, or None when LEAD_STORE_ENABLED=0"""
+    global _store
+    if os.environ.get('LEAD_STORE_ENABLED', '1').lower() in ('0', 'false', 'no'):
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = LeadStore(
+                os.environ.get('LEAD_STORE_PATH') or os.path.join(
+                    tempfile.gettempdir(), 'lead_generator_leads.db')
+            )
+            logger.info(f"🗃️ Lead store at {_store.path}")
+    return _store
@@ -0,0 +1,97 @@
+"""Country/locale registry: dial code, TLD, search domain, name pools and legal suffixes
+
+The data lives in data/locales.json and is parsed once, on first use,
+into read-only mappings with the lookups precomputed. app.py loads it at
+import, so with gunicorn's preload_app the master builds it once and
+every forked worker shares those pages copy-on-write.
+"""
+import json
+import logging
+import os
+import threading
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+LOCALES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'locales.json')
+
+# TLDs that say nothing about where a site is (.com is listed for the United States only for search)
+GENERIC_TLDS = frozenset(('com', 'net', 'org', 'info', 'biz', 'io', 'co', 'eu'))
+
+
+class LocaleRegistry:
+    """Read-only country -> locale mapping plus a reverse lookup by TLD
+
+    Each locale is a read-only mapping with code, tld, search_engine,
+    first_names, last_names and suffixes (tuples), so it can be passed
+    anywhere a country_info dict was accepted.
+    """
+
+    __slots__ = ('countries', 'default', 'by_tld')
+
+    def __init__(self, data):
+        pools = {name: (tuple(pool['first']), tuple(pool['last'])) for name, pool in data['name_pools'].items()}
+
+        def build(name, entry):
+            first_names, last_names = pools[entry['names']]
+            return MappingProxyType({
+                'name': name,
+                'code': entry['code'],
+                'tld': entry['tld'],
+                'search_engine': entry['search_engine'],
+                'first_names': first_names,
+                'last_names': last_names,
+                'suffixes': tuple(entry['suffixes']),
+            })
+
+        countries = {name: build(name, entry) for name, entry in data['countries'].items()}
+
+        self.countries = MappingProxyType(countries)
+        self.default = build('', data['default'])
+        self.by_tld = MappingProxyType({locale['tld']: name for name, locale in countries.items()})
+
+    def country_for_host(self, host):
+        """Country whose TLD host ends with (co.uk before uk), or None for generic and unknown TLDs"""
+        labels = (host or '').lower().rstrip('.').split('.')
+        for start in range(1, len(labels)):
+            suffix = '.'.join(labels[start:])
+            if suffix in GENERIC_TLDS:
+                return None
+            if suffix in self.by_tld:
+                return self.by_tld[suffix]
+        return None
+
+    def info(self, country):
+        """Locale for a country, or the default locale for unknown ones"""
+        return self.countries.get(country, self.default)
+
+    def get(self, country, default=None):
+        return self.countries.get(country, default)
+
+    def __getitem__(self, country):
+        return self.countries[country]
+
+    def __contains__(self, country):
+        return country in self.countries
+
+    def __iter__(self):
+        return iter(self.countries)
+
+    def __len__(self):
+        return len(self.countries)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def locales():
+    """The process-wide LocaleRegistry, loaded from LOCALES_PATH on first call"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                with open(LOCALES_PATH, encoding='utf-8') as f:
+                    _registry = LocaleRegistry(json.load(f))
+                logger.info(f"🌍 Loaded {len(_registry)} locales")
+    return _registry
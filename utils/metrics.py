@@ -0,0 +1,174 @@
+"""In-process metrics: stage timings, byte counts, cache and error counters
+
+Everything is exposed in the Prometheus text format by render() (served on
+/metrics). timed(stage) also adds to the Timings of the job being worked
+on, so each response can carry its own breakdown.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds: 1ms .. 60s
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield f'{self.name}{_label_text(self.labelnames, key)} {value}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            series['counts'][index] += 1
+            series['sum'] += value
+
+    def samples(self):
+        with self._lock:
+            series = {key: (list(s['counts']), s['sum']) for key, s in self._series.items()}
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            labels = _label_text(self.labelnames, key)
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                bucket_labels = _label_text(self.labelnames, key, 'le="%s"' % bound)
+                yield f'{self.name}_bucket{bucket_labels} {cumulative}'
+            yield f'{self.name}_sum{labels} {total}'
+            yield f'{self.name}_count{labels} {cumulative}'
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'leadgen_stage_seconds', 'Time spent in each pipeline stage', ['stage']))
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'leadgen_http_request_seconds', 'Time to answer an HTTP request', ['endpoint', 'status']))
+BYTES = REGISTRY.register(Counter(
+    'leadgen_bytes_total', 'Bytes read from the network, served from cache or exported', ['kind']))
+CACHE_EVENTS = REGISTRY.register(Counter(
+    'leadgen_cache_events_total', 'Cache lookups by cache and outcome', ['cache', 'event']))
+ERRORS = REGISTRY.register(Counter(
+    'leadgen_errors_total', 'Errors by pipeline stage', ['stage']))
+
+_current_timings = contextvars.ContextVar('timings', default=None)
+
+
+class Timings:
+    """Per-job breakdown: total seconds and call count for each stage
+
+    Stages may nest (html_parse includes contact_extraction) and run in
+    parallel, so the stage totals can add up to more than the wall time.
+    """
+
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            total, calls = self._stages.get(stage, (0.0, 0))
+            self._stages[stage] = (total + seconds, calls + 1)
+
+    @contextmanager
+    def activate(self):
+        """Attribute timed() stages in this context (and contexts copied from it) to these timings"""
+        token = _current_timings.set(self)
+        try:
+            yield self
+        finally:
+            _current_timings.reset(token)
+
+    def as_dict(self):
+        """{'total_ms': ..., 'stages': {stage: {'ms': ..., 'calls': ...}}}"""
+        with self._lock:
+            stages = {stage: {'ms': round(total * 1000, 2), 'calls': calls}
+                      for stage, (total, calls) in self._stages.items()}
+        return {'total_ms': round((time.perf_counter() - self._started) * 1000, 2), 'stages': stages}
+
+
+@contextmanager
+def timed(stage):
+    """Time a block into STAGE_SECONDS (and the active Timings); count it as an error if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add(stage, elapsed)
+
+
+def render():
+    return REGISTRY.render()
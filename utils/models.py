@@ -0,0 +1,84 @@
+LEAD_FIELDS = ('name', 'title', 'company', 'phone', 'email', 'website', 'industry', 'location', 'source')
+
+# Set by pipeline stages after a lead is found; exported, but not part of what identifies a lead
+ENRICHMENT_FIELDS = ('verification',)
+ALL_FIELDS = LEAD_FIELDS + ENRICHMENT_FIELDS
+
+# Source of leads read from a crawled website; every other source makes up its contact details
+WEBSITE_SOURCE = 'Website Scraping'
+
+
+class Lead:
+    """One lead, stored in __slots__ instead of a per-instance dict
+
+    Supports the read side of the dict interface (lead['name'],
+    lead.get('email', ''), keys(), dict(lead)) so code written for the old
+    9-key dicts keeps working. to_dict() gives the JSON view.
+    """
+
+    __slots__ = ALL_FIELDS
+
+    def __init__(self, name='', title='', company='', phone='', email='', website='',
+                 industry='', location='', source='', verification=''):
+        self.name = name
+        self.title = title
+        self.company = company
+        self.phone = phone
+        self.email = email
+        self.website = website
+        self.industry = industry
+        self.location = location
+        self.source = source
+        self.verification = verification
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data.get(field, '') for field in ALL_FIELDS})
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in ALL_FIELDS}
+
+    def as_row(self):
+        """Field values as a tuple in LEAD_FIELDS order"""
+        return (self.name, self.title, self.company, self.phone, self.email,
+                self.website, self.industry, self.location, self.source)
+
+    def keys(self):
+        return ALL_FIELDS
+
+    def get(self, field, default=None):
+        if field in ALL_FIELDS:
+            return getattr(self, field)
+        return default
+
+    def __getitem__(self, field):
+        if field not in ALL_FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field, value):
+        if field not in ALL_FIELDS:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def __contains__(self, field):
+        return field in ALL_FIELDS
+
+    def __eq__(self, other):
+        # Leads compare on LEAD_FIELDS: enrichment results such as verification
+        # describe a lead, they don't make it a different one
+        if isinstance(other, Lead):
+            return self.as_row() == other.as_row()
+        return NotImplemented
+
+    def __hash__(self):
+        # Consistent with __eq__; don't change a lead's fields while it is in a set or dict key
+        return hash(self.as_row())
+
+    def __repr__(self):
+        return f"Lead(name={self.name!r}, company={self.company!r}, email={self.email!r})"
+
+
+def to_lead(lead):
+    """Accept either a Lead or a legacy lead dict"""
+    return lead if isinstance(lead, Lead) else Lead.from_dict(lead)
@@ -0,0 +1,177 @@
+"""Minimal PDF writer for lead tables
+
+Writes an A4 landscape table (about 50 leads per page) with the standard
+Helvetica fonts, so no font files or PDF library are needed. Each page's
+content stream is built as one string and deflated, and pages are written
+to the file as they fill, so memory stays flat however many leads there
+are. Column values are truncated to fit using Helvetica's width table,
+with the results cached since titles, industries and locations repeat.
+"""
+import zlib
+from functools import lru_cache
+
+# Helvetica advance widths (1/1000 em) for WinAnsi bytes 32..255
+HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584, 350,
+    556, 350, 222, 556, 333, 1000, 556, 556, 333, 1000, 667, 333, 1000, 350, 611, 350,
+    350, 222, 222, 333, 333, 350, 556, 1000, 333, 1000, 500, 333, 944, 350, 500, 667,
+    278, 333, 556, 556, 556, 556, 260, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+    400, 584, 333, 333, 333, 556, 537, 278, 333, 333, 365, 556, 834, 834, 834, 611,
+    667, 667, 667, 667, 667, 667, 1000, 722, 667, 667, 667, 667, 278, 278, 278, 278,
+    722, 722, 778, 778, 778, 778, 778, 584, 778, 722, 722, 722, 722, 667, 667, 611,
+    556, 556, 556, 556, 556, 556, 889, 500, 556, 556, 556, 556, 278, 278, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 584, 611, 556, 556, 556, 556, 500, 556, 500,
+)
+_WIDTHS = (0,) * 32 + HELVETICA_WIDTHS
+
+PAGE_WIDTH = 842   # A4 landscape, points
+PAGE_HEIGHT = 595
+MARGIN = 28
+FONT_SIZE = 7
+ROW_HEIGHT = 10
+CELL_PADDING = 3
+
+# (header, lead field, column width in points) - widths add up to PAGE_WIDTH - 2 * MARGIN
+COLUMNS = (
+    ('#', None, 28),
+    ('Name', 'name', 78),
+    ('Title', 'title', 64),
+    ('Company', 'company', 94),
+    ('Phone', 'phone', 78),
+    ('Email', 'email', 112),
+    ('Website', 'website', 94),
+    ('Industry', 'industry', 58),
+    ('Location', 'location', 62),
+    ('Source', 'source', 66),
+    ('Verification', 'verification', 52),
+)
+
+_TRANSLATE = str.maketrans({'\\': '\\\\', '(': '\\(', ')': '\\)', '\r': ' ', '\n': ' ', '\t': ' '})
+
+
+def encode(text):
+    """Text as WinAnsi bytes for a Helvetica string; unsupported characters become '?'"""
+    return str(text).translate(_TRANSLATE).encode('cp1252', 'replace')
+
+
+def text_width(data, size=FONT_SIZE):
+    """Width in points of encoded text at the given font size"""
+    return sum(_WIDTHS[b] for b in data) * size / 1000
+
+
+@lru_cache(maxsize=65536)
+def fit(text, width):
+    """PDF string literal of text, cut short with '...' so it fits in width points"""
+    data = encode(text)
+    if text_width(data) <= width:
+        return data
+    units = (width - text_width(b'...')) * 1000 / FONT_SIZE
+    total = 0
+    for i, byte in enumerate(data):
+        total += _WIDTHS[byte]
+        if total > units:
+            # Never cut in the middle of an escape sequence
+            cut = data[:i].rstrip(b'\\')
+            return cut + b'...'
+    return data
+
+
+class TableWriter:
+    """Stream a lead table into a PDF file: add rows, then close()"""
+
+    def __init__(self, f, title='Business Leads Report'):
+        self.f = f
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = 5  # 1 catalog, 2 page tree, 3 and 4 fonts
+        self.position = 0
+        self.rows = []
+        self.title = title
+        self.count = 0
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+        self._object(4, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>')
+        self.top = PAGE_HEIGHT - MARGIN - 24  # first page leaves room for the title
+        self._rows_per_page = int((self.top - MARGIN) / ROW_HEIGHT) - 1
+
+    def _write(self, data):
+        self.f.write(data)
+        self.position += len(data)
+
+    def _object(self, number, body):
+        self.offsets[number] = self.position
+        self._write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+
+    def add(self, lead):
+        self.count += 1
+        self.rows.append((self.count, lead))
+        if len(self.rows) >= self._rows_per_page:
+            self._flush_page()
+
+    def _row_ops(self, values, font):
+        """Text operators for one table row, moving from column to column with Td"""
+        ops = [b'BT /%s %d Tf %d %.1f Td' % (font, FONT_SIZE, MARGIN + CELL_PADDING, self.y)]
+        previous = 0
+        for (_, _, width), value in zip(COLUMNS, values):
+            if previous:
+                ops.append(b'%d 0 Td' % previous)
+            ops.append(b'(' + fit(value, width - 2 * CELL_PADDING) + b') Tj')
+            previous = width
+        ops.append(b'ET')
+        self.y -= ROW_HEIGHT
+        return b' '.join(ops)
+
+    def _flush_page(self):
+        if not self.rows and self.page_ids:
+            return
+        ops = []
+        top = self.top
+        if not self.page_ids:
+            ops.append(b'BT /F2 14 Tf %d %d Td (%s) Tj ET' % (MARGIN, PAGE_HEIGHT - MARGIN - 10, encode(self.title)))
+        self.y = top - FONT_SIZE
+        ops.append(self._row_ops([header for header, _, _ in COLUMNS], b'F2'))
+        rule = self.y + ROW_HEIGHT - 3
+        ops.append(b'0.6 G 0.5 w %d %.1f m %d %.1f l S' % (MARGIN, rule, PAGE_WIDTH - MARGIN, rule))
+        for number, lead in self.rows:
+            get = lead.get
+            ops.append(self._row_ops([number] + [get(field) or '' for _, field, _ in COLUMNS[1:]], b'F1'))
+        self.rows = []
+
+        stream = zlib.compress(b'\n'.join(ops), 6)
+        page_id, content_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self._object(content_id, b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        self._object(page_id, b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+                              b'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>'
+                     % (PAGE_WIDTH, PAGE_HEIGHT, content_id))
+        self.page_ids.append(page_id)
+        # Later pages have no title, so the table starts higher
+        self.top = PAGE_HEIGHT - MARGIN
+        self._rows_per_page = int((self.top - MARGIN) / ROW_HEIGHT) - 1
+
+    def close(self):
+        self._flush_page()
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in self.page_ids)
+        self._object(2, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self.page_ids)))
+        self._object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+        xref = self.position
+        size = self.next_id
+        entries = [b'0000000000 65535 f \n']
+        entries.extend(b'%010d 00000 n \n' % self.offsets[number] for number in range(1, size))
+        self._write(b'xref\n0 %d\n' % size + b''.join(entries))
+        self._write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%EOF\n' % (size, xref))
+
+
+def write_table(leads, filename, title='Business Leads Report'):
+    """Write the leads as a PDF table; returns the number of pages"""
+    with open(filename, 'wb') as f:
+        writer = TableWriter(f, title)
+        for lead in leads:
+            writer.add(lead)
+        writer.close()
+        return len(writer.page_ids)
@@ -0,0 +1,67 @@
+"""Progress events for the job being worked on
+
+A job run by JobQueue gets a ProgressChannel; code running for it (in the
+job thread, or in contexts copied from it) calls report() to publish stage
+changes and leads as they are found. /generate-leads/stream follows the
+channel and forwards each event to the browser as it happens.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+_current_channel = contextvars.ContextVar('progress_channel', default=None)
+
+
+class ProgressChannel:
+    """Append-only event log for one job that any number of readers can follow"""
+
+    def __init__(self):
+        self._events = []
+        self._closed = False
+        self._changed = threading.Condition()
+
+    def emit(self, event):
+        with self._changed:
+            self._events.append(event)
+            self._changed.notify_all()
+
+    def close(self):
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    @contextmanager
+    def activate(self):
+        """Send report() calls in this context (and contexts copied from it) to this channel"""
+        token = _current_channel.set(self)
+        try:
+            yield self
+        finally:
+            _current_channel.reset(token)
+
+    def follow(self, heartbeat=15):
+        """Yield every event from the first until the channel closes, or None after heartbeat idle seconds"""
+        index = 0
+        while True:
+            with self._changed:
+                if index >= len(self._events) and not self._closed:
+                    self._changed.wait(heartbeat)
+                events = self._events[index:]
+                closed = self._closed
+            index += len(events)
+            for event in events:
+                yield event
+            if closed and not events:
+                return
+            if not events:
+                yield None
+
+
+def report(event_type, **data):
+    """Publish an event to the current job's channel; a no-op outside a job"""
+    channel = _current_channel.get()
+    if channel is not None:
+        data['type'] = event_type
+        data['time'] = time.time()
+        channel.emit(data)
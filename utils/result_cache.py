@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .metrics import CACHE_EVENTS
+
+logger = logging.getLogger(__name__)
+
+
+def result_cache_key(search_data, max_results):
+    """Stable key for a search: criteria trimmed and lower-cased, URL lists sorted"""
+    normalized = {}
+    for field, value in search_data.items():
+        if isinstance(value, str):
+            value = value.strip().lower()
+        elif isinstance(value, (list, tuple)):
+            value = sorted(str(item).strip().lower() for item in value)
+        if value:
+            normalized[field] = value
+    normalized['max_results'] = max_results
+    encoded = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one computation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+
+        if not leader:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = func()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['event'].set()
+
+
+class ResultCache:
+    """LRU cache of lead lists and the paths of their exported files, keyed on search criteria
+
+    Entries expire after ttl seconds and at most max_entries lead lists are
+    kept in memory. The files themselves belong to the artifact store, which
+    expires them on its own schedule - a path is only returned while it exists.
+    """
+
+    def __init__(self, ttl=900, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_entry(self, key):
+        # Caller holds the lock
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry['expires_at'] < time.time():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get_leads(self, key):
+        with self._lock:
+            entry = self._get_entry(key)
+            return entry['leads'] if entry else None
+
+    def get_file(self, key, format_type):
+        """Path of an already exported file for this search and format, if still on disk"""
+        with self._lock:
+            entry = self._get_entry(key)
+            path = entry['files'].get(format_type) if entry else None
+        if path and os.path.exists(path):
+            return path
+        return None
+
+    def cached_export(self, key, format_type):
+        """Like get_file, but counted as a cache hit - for answering a request straight away"""
+        path = self.get_file(key, format_type)
+        if path:
+            with self._lock:
+                self.hits += 1
+            CACHE_EVENTS.inc(cache='result', event='hit')
+        return path
+
+    def get_or_compute_leads(self, key, compute):
+        """Cached leads for key, or compute() them once even if many callers ask at once"""
+        leads = self.get_leads(key)
+        if leads is not None:
+            with self._lock:
+                self.hits += 1
+            CACHE_EVENTS.inc(cache='result', event='hit')
+            return leads
+
+        def load():
+            # Another caller may have filled the cache while we waited for the flight
+            cached = self.get_leads(key)
+            if cached is not None:
+                return cached
+            with self._lock:
+                self.misses += 1
+            CACHE_EVENTS.inc(cache='result', event='miss')
+            result = compute()
+            if result:
+                self.put_leads(key, result)
+            return result
+
+        return self._flight.do(('leads', key), load)
+
+    def get_or_export(self, key, format_type, export):
+        """Cached export path for key/format, or run export() once and remember its path"""
+        path = self.get_file(key, format_type)
+        if path:
+            return path
+
+        def load():
+            cached = self.get_file(key, format_type)
+            if cached:
+                return cached
+            path = export()
+            self.add_file(key, format_type, path)
+            return path
+
+        return self._flight.do(('file', key, format_type), load)
+
+    def put_leads(self, key, leads):
+        with self._lock:
+            self._entries[key] = {
+                'leads': leads,
+                'files': {},
+                'expires_at': time.time() + self.ttl
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def add_file(self, key, format_type, path):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry['files'][format_type] = path
+
+    def _drop(self, key):
+        # Caller holds the lock
+        self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
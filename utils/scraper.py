@@ -1,18 +1,69 @@
+import collections
 import requests
-from bs4 import BeautifulSoup
-import re
 import time
 import logging
 import random
 import json
+import os
+import sqlite3
+import threading
 from urllib.parse import quote, urljoin, urlparse
 import urllib3
+from requests.adapters import HTTPAdapter
+
+from .browser import get_browser_pool
+from .crawler import BatchCrawler, ContactPageCrawler
+from .dedupe import normalize_email
+from .enrich import create_enricher
+from .extractor import extract_contacts, normalize_phone
+from .lead_store import get_lead_store
+from .lazy import lazy_import
+from .locales import locales
+from .metrics import ERRORS, timed
+from .progress import report
+from .models import WEBSITE_SOURCE, Lead
+from .synthetic import generate_leads
+from .http_cache import CachingAdapter, get_response_cache
+from .html_stream import DEFAULT_MAX_BYTES, parse_html, read_capped, stream_page
+from .search import MultiSearch, create_backends
+
+# Only needed for SCRAPER_PARSE_MODE=soup
+bs4 = lazy_import('bs4')
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+def merge_unique(first, second):
+    """Concatenate two lists, dropping repeats but keeping first-seen order"""
+    return list(dict.fromkeys(list(first) + list(second)))
+
+def dedupe_leads(leads, seen_contacts=None):
+    """Drop leads whose phone/email pair was already seen, keeping first-seen order
+
+    Phones are compared in E.164 form and emails case-insensitively, so the
+    same contact written two ways counts once.
+    """
+    unique_leads = []
+    seen_contacts = set() if seen_contacts is None else seen_contacts
+    
+    for lead in leads:
+        phone = (lead.get('phone', '') or '').strip()
+        phone = normalize_phone(phone) or phone if phone else ''
+        contact_id = f"{phone}_{normalize_email(lead.get('email', ''))}"
+        if contact_id not in seen_contacts and contact_id != '_':
+            seen_contacts.add(contact_id)
+            unique_leads.append(lead)
+    
+    return unique_leads
+
+def company_from_title(title):
+    """Best guess at a company name from a page title ("Acme Ltd | Home" -> "Acme Ltd")"""
+    return (title or '').split('|')[0].split('-')[0].strip()
+
 class IntelligentLeadScraper:
-    def __init__(self):
+    def __init__(self, crawl_depth=1, crawl_max_pages=5, parse_mode=None, max_page_bytes=DEFAULT_MAX_BYTES,
+                 pool_connections=None, pool_maxsize=None, synthetic_count=None, synthetic_seed=None,
+                 search_backends=None):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -20,231 +71,440 @@ class IntelligentLeadScraper:
             'Accept-Language': 'en-US,en;q=0.5',
         })
         
-        # Enhanced country database
-        self.countries = {
-            # European Countries
-            "United Kingdom": {"code": "+44", "tld": "co.uk", "search_engine": "google.co.uk"},
-            "Germany": {"code": "+49", "tld": "de", "search_engine": "google.de"},
-            "France": {"code": "+33", "tld": "fr", "search_engine": "google.fr"},
-            "Italy": {"code": "+39", "tld": "it", "search_engine": "google.it"},
-            "Spain": {"code": "+34", "tld": "es", "search_engine": "google.es"},
-            "Netherlands": {"code": "+31", "tld": "nl", "search_engine": "google.nl"},
-            
-            # Wealthy Asian Countries
-            "Japan": {"code": "+81", "tld": "jp", "search_engine": "google.co.jp"},
-            "South Korea": {"code": "+82", "tld": "kr", "search_engine": "google.co.kr"},
-            "Singapore": {"code": "+65", "tld": "sg", "search_engine": "google.com.sg"},
-            "Hong Kong": {"code": "+852", "tld": "hk", "search_engine": "google.com.hk"},
-            "United Arab Emirates": {"code": "+971", "tld": "ae", "search_engine": "google.ae"},
-            
-            # Others
-            "United States": {"code": "+1", "tld": "com", "search_engine": "google.com"},
-            "Canada": {"code": "+1", "tld": "ca", "search_engine": "google.ca"},
-            "Australia": {"code": "+61", "tld": "com.au", "search_engine": "google.com.au"},
+        # Connection pool: pool_connections hosts kept, pool_maxsize connections per host
+        pool_options = {
+            'pool_connections': pool_connections or int(os.environ.get('HTTP_POOL_CONNECTIONS', 50)),
+            'pool_maxsize': pool_maxsize or int(os.environ.get('HTTP_POOL_MAXSIZE', 20)),
         }
-
-    def extract_contacts_from_text(self, text):
-        """Extract phone numbers and emails from text"""
-        if not text:
-            return [], []
-            
-        # Phone patterns
-        phone_patterns = [
-            r'\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',
-            r'\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4}',
-            r'[0-9]{3}-[0-9]{3}-[0-9]{4}',
-        ]
         
-        phones = []
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            phones.extend(matches)
+        # Serve repeated GETs from the on-disk response cache
+        cache = get_response_cache()
+        if cache is not None:
+            adapter = CachingAdapter(cache, **pool_options)
+        else:
+            adapter = HTTPAdapter(**pool_options)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Contact-page discovery limits for scrape_website_contacts
+        self.crawl_depth = crawl_depth
+        self.crawl_max_pages = crawl_max_pages
         
-        # Email pattern
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        # Concurrency and politeness limits for batch website crawls
+        self.crawler_options = {
+            'max_concurrency': int(os.environ.get('CRAWL_CONCURRENCY', 20)),
+            'per_host': int(os.environ.get('CRAWL_PER_HOST', 2)),
+            'host_delay': float(os.environ.get('CRAWL_HOST_DELAY', 0.5)),
+        }
+        
+        # 'stream' parses pages incrementally, 'soup' builds a full BeautifulSoup tree
+        self.parse_mode = parse_mode or os.environ.get('SCRAPER_PARSE_MODE', 'stream')
+        self.max_page_bytes = max_page_bytes
+        
+        # Country registry (read-only, shared by every scraper in the process)
+        self.countries = locales()
+        
+        # Generated leads per search; a seed makes them reproducible
+        self.synthetic_count = synthetic_count or int(os.environ.get('SYNTHETIC_LEADS', 20))
+        seed = synthetic_seed if synthetic_seed is not None else os.environ.get('SYNTHETIC_SEED')
+        self.synthetic_seed = int(seed) if seed not in (None, '') else None
+        
+        # Web search: engines queried in parallel, each with its own deadline
+        self.search_max_results = int(os.environ.get('SEARCH_MAX_RESULTS', 20))
+        self.search_engines = MultiSearch(create_backends(
+            search_backends,
+            session=self.session,
+            parse_mode=self.parse_mode,
+            max_bytes=self.max_page_bytes,
+            deadline=float(os.environ.get('SEARCH_DEADLINE', 8)),
+            max_pages=int(os.environ.get('SEARCH_MAX_PAGES', 3))
+        ))
+        
+        # Verification of lead websites and email domains (None when ENRICH_ENABLED=0)
+        self.enricher = create_enricher(self.session)
         
-        return list(set(phones)), list(set(emails))
+        # Every lead found is kept for /leads queries (None when LEAD_STORE_ENABLED=0)
+        self.lead_store = get_lead_store()
+        
+        # Headless browser for sites whose static HTML has no contacts (None unless BROWSER_RENDERING=1)
+        self.browser_pool = get_browser_pool()
+        self.render_max_pages = int(os.environ.get('BROWSER_MAX_PAGES', 3))
+        self.render_settle = float(os.environ.get('BROWSER_SETTLE_TIMEOUT', 2))
+
+    def dial_code(self, country=None, url=None):
+        """Dial code for numbers written without one: the searched country's, else the site's country TLD's"""
+        if not country and url:
+            country = self.countries.country_for_host(urlparse(url).hostname)
+        return self.countries.get(country, {}).get('code') if country else None
+
+    def extract_contacts_from_text(self, text, country=None, url=None):
+        """Extract phone numbers (as E.164 where their country is known) and emails from text"""
+        return extract_contacts(text, self.dial_code(country, url))
 
-    def scrape_website_contacts(self, url):
-        """Scrape contact information from a website"""
+    def scrape_website_contacts(self, url, max_depth=None, max_pages=None, country=None):
+        """Scrape contact information from a website and its contact/about pages
+
+        Falls back to rendering the site in a headless browser when the
+        static pages have no contacts and BROWSER_RENDERING=1.
+        """
+        website_data = self.fetch_website_contacts(url, max_depth, max_pages, country)
+        return self.render_if_empty(url, website_data, country)
+
+    def fetch_website_contacts(self, url, max_depth=None, max_pages=None, country=None):
+        """Contacts from a website's static HTML and its contact/about pages"""
         try:
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove scripts and styles
-            for script in soup(["script", "style"]):
-                script.decompose()
+            crawler = ContactPageCrawler(
+                self.session,
+                max_depth=self.crawl_depth if max_depth is None else max_depth,
+                max_pages=self.crawl_max_pages if max_pages is None else max_pages
+            )
+            pages = crawler.crawl(url, lambda page_url, response: self.parse_page(page_url, response, country))
+            if not pages:
+                return None
             
-            text = soup.get_text()
-            phones, emails = self.extract_contacts_from_text(text)
-            
-            # Extract company name from title
-            company_name = ""
-            if soup.title:
-                company_name = soup.title.string.split('|')[0].split('-')[0].strip()
-            
-            return {
-                'company': company_name,
-                'phones': phones,
-                'emails': emails,
-                'website': url
-            }
+            # Company name comes from the landing page, contacts from every page
+            website_data = pages[0][1]
+            for page_url, page_data in pages[1:]:
+                website_data['phones'] = merge_unique(website_data['phones'], page_data['phones'])
+                website_data['emails'] = merge_unique(website_data['emails'], page_data['emails'])
+            website_data['pages'] = [page_url for page_url, _ in pages]
+            website_data.pop('links', None)
+            return website_data
             
         except Exception as e:
+            ERRORS.inc(stage='website_scrape')
             logging.error(f"Error scraping website {url}: {e}")
             return None
 
-    def generate_realistic_leads(self, industry, country, count=10):
-        """Generate realistic lead data"""
-        leads = []
-        country_info = self.countries.get(country, {"code": "+1", "tld": "com"})
-        
-        # Real company name patterns
-        company_patterns = {
-            "United Kingdom": ["Ltd", "PLC", "Group", "Solutions"],
-            "Germany": ["GmbH", "AG", "Group"],
-            "France": ["SA", "SAS", "Group"],
-            "United States": ["Inc", "Corp", "LLC", "Group"],
-            "Japan": ["Corporation", "Co., Ltd."],
-        }
-        
-        suffixes = company_patterns.get(country, ["Ltd", "Inc"])
-        
-        for i in range(count):
-            # Realistic names based on country
-            if country in ["United Kingdom", "United States", "Canada", "Australia"]:
-                first_names = ["James", "John", "Robert", "Michael", "William", "David"]
-                last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Miller"]
-            elif country in ["Germany", "Austria", "Switzerland"]:
-                first_names = ["Thomas", "Michael", "Andreas", "Stefan", "Christian"]
-                last_names = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber"]
-            elif country in ["France", "Belgium"]:
-                first_names = ["Jean", "Pierre", "Michel", "Philippe", "Alain"]
-                last_names = ["Martin", "Bernard", "Dubois", "Thomas", "Robert"]
-            else:
-                first_names = ["John", "David", "Michael", "Chris", "Alex"]
-                last_names = ["Smith", "Johnson", "Brown", "Taylor", "Lee"]
-            
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
-            company_suffix = random.choice(suffixes)
-            
-            lead = {
-                'name': f"{first_name} {last_name}",
-                'title': "CEO",
-                'company': f"{industry} {random.choice(['Global', 'International', 'Solutions'])} {company_suffix}",
-                'phone': f"{country_info['code']}{random.randint(100000000, 999999999)}",
-                'email': f"{first_name.lower()}.{last_name.lower()}@{industry.lower().replace(' ', '')}.{country_info['tld']}",
-                'website': f"https://www.{industry.lower().replace(' ', '')}.{country_info['tld']}",
-                'industry': industry,
-                'location': country,
-                'source': 'Enhanced Search'
+    def parse_page(self, url, response, country=None):
+        """Parse a streamed response with the configured parse mode"""
+        if self.parse_mode == 'stream':
+            page = stream_page(response, self.max_page_bytes, dial_code=self.dial_code(country, url),
+                               collect_links=True)
+            return {
+                'company': company_from_title(page['title']),
+                'phones': page['phones'],
+                'emails': page['emails'],
+                'website': url,
+                'links': page['links']
             }
-            leads.append(lead)
+        return self.parse_website_contacts(url, read_capped(response, self.max_page_bytes), country)
+
+    def parse_website_contacts(self, url, content, country=None):
+        """Extract company name, contacts and links from a fetched page"""
+        soup = bs4.BeautifulSoup(content, 'html.parser')
         
-        return leads
+        # Remove scripts and styles
+        for script in soup(["script", "style"]):
+            script.decompose()
+        
+        text = soup.get_text(' ')
+        phones, emails = self.extract_contacts_from_text(text, country, url)
+        
+        # Extract company name from title
+        company_name = ""
+        if soup.title and soup.title.string:
+            company_name = company_from_title(soup.title.string)
+        
+        return {
+            'company': company_name,
+            'phones': phones,
+            'emails': emails,
+            'website': url,
+            'links': [(a['href'], a.get_text(' ', strip=True)) for a in soup.find_all('a', href=True)]
+        }
+
+    def scrape_websites(self, urls, country=None, **crawler_options):
+        """Scrape many websites concurrently, yielding contact data as each site finishes"""
+        def parse(url, response):
+            try:
+                return self.parse_page(url, response, country)
+            except Exception as e:
+                ERRORS.inc(stage='html_parse')
+                logging.error(f"Error parsing website {url}: {e}")
+                return None
+
+        crawler = BatchCrawler(self.session, parse=parse, **dict(self.crawler_options, **crawler_options))
+        for result in crawler.iter_crawl(urls):
+            if result['data'] is not None:
+                result['data'].pop('links', None)
+                yield self.render_if_empty(result['data']['website'], result['data'], country)
+
+    def render_if_empty(self, url, website_data, country=None):
+        """website_data, or the rendered site's contacts if it has none and a browser pool is set up"""
+        if self.browser_pool is None or (website_data and (website_data['phones'] or website_data['emails'])):
+            return website_data
+        rendered = self.render_website_contacts(url, country)
+        if rendered is None:
+            return website_data
+        if website_data and not rendered['company']:
+            rendered['company'] = website_data['company']
+        return rendered
+
+    def render_website_contacts(self, url, country=None):
+        """Contacts from a site rendered in a headless browser: the landing page, then its contact pages
+
+        Stops at the first page with contacts, after render_max_pages pages.
+        Returns None if no page could be rendered.
+        """
+        dial_code = self.dial_code(country, url)
 
-    def search_google_business(self, query, country):
-        """Search for business contacts on Google"""
+        def has_contacts(html):
+            page = parse_html(html, dial_code)
+            return bool(page['phones'] or page['emails'])
+
+        pages = []
+        frontier = [url]
+        with self.browser_pool.browser() as browser:
+            if browser is None:
+                return None
+            for page_url in frontier:
+                if len(pages) >= self.render_max_pages:
+                    break
+                with timed('browser_render'):
+                    html = browser.render(page_url, has_contacts, self.render_settle)
+                if html is None:
+                    continue
+                with timed('html_parse'):
+                    page = parse_html(html, dial_code, collect_links=page_url == url)
+                pages.append((page_url, page))
+                if page['phones'] or page['emails']:
+                    break
+                if page_url == url:
+                    frontier.extend(ContactPageCrawler(self.session).discover_links(url, page['links']))
+        if not pages:
+            return None
+
+        phones = []
+        emails = []
+        for _, page in pages:
+            phones = merge_unique(phones, page['phones'])
+            emails = merge_unique(emails, page['emails'])
+        logging.info(f"🌐 Rendered {len(pages)} pages of {url}: {len(phones)} phones, {len(emails)} emails")
+        return {
+            'company': company_from_title(pages[0][1]['title']),
+            'phones': phones,
+            'emails': emails,
+            'website': url,
+            'pages': [page_url for page_url, _ in pages],
+            'rendered': True
+        }
+
+    def create_lead_from_website(self, website_data, search_data):
+        """Create a lead from scraped website contacts, or None if it has none"""
+        if not website_data or not (website_data['emails'] or website_data['phones']):
+            return None
+        return Lead(
+            name='Website Contact',
+            title=search_data.get('title', '') or 'Contact',
+            company=website_data['company'],
+            phone=website_data['phones'][0] if website_data['phones'] else '',
+            email=website_data['emails'][0] if website_data['emails'] else '',
+            website=website_data['website'],
+            industry=search_data.get('industry', '') or 'Various',
+            location=search_data.get('country', '') or 'Unknown',
+            source=WEBSITE_SOURCE
+        )
+
+    def generate_realistic_leads(self, industry, country, count=10, seed=None):
+        """Generate realistic lead data"""
+        country_info = self.countries.info(country)
+        with timed('lead_generation'):
+            return generate_leads(industry, country, count, country_info, seed)
+
+    def search_business(self, query, country, max_results=None):
+        """Search the configured engines for businesses and turn the results into leads"""
+        country_info = self.countries.info(country)
+        max_results = min(max_results or self.search_max_results, self.search_max_results)
+        
         try:
-            country_info = self.countries.get(country, {"search_engine": "google.com"})
-            base_url = f"https://{country_info['search_engine']}/search"
-            params = {'q': f"{query} business contact email phone"}
-            
-            response = self.session.get(base_url, params=params, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            leads = []
-            # Extract from search results (simplified)
-            results = soup.find_all('div', class_='g')[:5]
-            
-            for result in results:
-                title_elem = result.find('h3')
-                if title_elem:
-                    company_name = title_elem.get_text()
-                    # Generate realistic contact based on search result
-                    lead = self.create_lead_from_company(company_name, query, country)
-                    if lead:
-                        leads.append(lead)
-            
-            return leads
-            
+            with timed('search'):
+                results = self.search_engines.search(
+                    f"{query} business contact email phone", country_info, max_results, with_sources=True)
         except Exception as e:
-            logging.error(f"Google search error: {e}")
+            logging.error(f"Search error: {e}")
             return []
+        
+        leads = []
+        for company_name, source in results:
+            # Generate realistic contact based on search result
+            lead = self.create_lead_from_company(company_name, query, country, source)
+            if lead:
+                leads.append(lead)
+        
+        return leads
 
-    def create_lead_from_company(self, company_name, industry, country):
+    def create_lead_from_company(self, company_name, industry, country, source):
         """Create a realistic lead from company name"""
-        country_info = self.countries.get(country, {"code": "+1", "tld": "com"})
+        country_info = self.countries.info(country)
         
-        # Extract first name and last name patterns
-        names = ["James Smith", "John Johnson", "Robert Williams", "Michael Brown", "David Jones"]
-        name = random.choice(names)
+        # A contact name typical for the country
+        name = f"{random.choice(country_info['first_names'])} {random.choice(country_info['last_names'])}"
         
-        return {
-            'name': name,
-            'title': "CEO",
-            'company': company_name[:50],
-            'phone': f"{country_info['code']}{random.randint(100000000, 999999999)}",
-            'email': f"contact@{company_name.lower().replace(' ', '').replace('.', '')[:20]}.{country_info['tld']}",
-            'website': f"https://www.{company_name.lower().replace(' ', '').replace('.', '')[:15]}.{country_info['tld']}",
-            'industry': industry,
-            'location': country,
-            'source': 'Google Search'
-        }
+        return Lead(
+            name=name,
+            title="CEO",
+            company=company_name[:50],
+            phone=f"{country_info['code']}{random.randint(100000000, 999999999)}",
+            email=f"contact@{company_name.lower().replace(' ', '').replace('.', '')[:20]}.{country_info['tld']}",
+            website=f"https://www.{company_name.lower().replace(' ', '').replace('.', '')[:15]}.{country_info['tld']}",
+            industry=industry,
+            location=country,
+            source=source
+        )
 
     def scrape_leads(self, search_data, max_results=50):
         """Main method to scrape leads"""
-        all_leads = []
+        return list(self.iter_leads(search_data, max_results))
+
+    def iter_leads(self, search_data, max_results=50):
+        """Yield unique leads as soon as each source finds them, up to max_results
+
+        Each batch is deduplicated, enriched with a verification status and
+        saved to the lead store, and each lead is reported to the running
+        job's progress channel, so a streaming client sees it straight away.
+        Enrichment runs in the background while the next batch is found;
+        batches are still yielded in order. Later sources are skipped once
+        max_results leads have been found.
+        """
+        seen_contacts = set()
+        taken = 0
+        found = 0
+        pending = collections.deque()
+        for batch in self._lead_batches(search_data, max_results):
+            with timed('dedupe'):
+                unique_leads = dedupe_leads(batch, seen_contacts)[:max_results - taken]
+            taken += len(unique_leads)
+            enriching = self.enricher.submit(unique_leads) if self.enricher is not None and unique_leads else None
+            pending.append((unique_leads, enriching))
+            # Hand over every batch at the front whose enrichment is done; the rest wait for the next batch
+            while pending and (pending[0][1] is None or pending[0][1].done()):
+                for lead in self._finish_batch(*pending.popleft(), search_data):
+                    found += 1
+                    report('lead', lead=lead, count=found)
+                    yield lead
+            if taken >= max_results:
+                break
+
+        while pending:
+            for lead in self._finish_batch(*pending.popleft(), search_data):
+                found += 1
+                report('lead', lead=lead, count=found)
+                yield lead
         
+        logging.info(f"Found {found} unique leads")
+
+    def _finish_batch(self, leads, enriching, search_data):
+        """Wait for a batch's enrichment, then save it to the lead store"""
+        if enriching is not None:
+            try:
+                enriching.result()
+            except Exception as e:
+                ERRORS.inc(stage='enrichment')
+                logging.warning(f"⚠️ Could not enrich {len(leads)} leads: {e}")
+        if self.lead_store is not None and leads:
+            self.store_leads(leads, search_data)
+        return leads
+
+    def store_leads(self, leads, search_data):
+        """Save a batch to the lead store - a failed write is logged, not raised"""
+        try:
+            with timed('lead_store'):
+                self.lead_store.add(leads, search_data)
+        except sqlite3.Error as e:
+            ERRORS.inc(stage='lead_store')
+            logging.warning(f"⚠️ Could not save {len(leads)} leads to the lead store: {e}")
+
+    def _lead_batches(self, search_data, max_results):
+        """Yield lists of leads from each source in priority order, reporting each stage"""
         title = search_data.get('title', '')
         industry = search_data.get('industry', '')
         country = search_data.get('country', '')
         website_url = search_data.get('website_url', '')
+        website_urls = search_data.get('website_urls') or []
         
         logging.info(f"Starting lead search: {title}, {industry}, {country}")
         
         # 1. Scrape from provided website
         if website_url:
             logging.info(f"Scraping website: {website_url}")
-            website_data = self.scrape_website_contacts(website_url)
-            if website_data and (website_data['emails'] or website_data['phones']):
-                lead = {
-                    'name': 'Website Contact',
-                    'title': title or 'Contact',
-                    'company': website_data['company'],
-                    'phone': website_data['phones'][0] if website_data['phones'] else '',
-                    'email': website_data['emails'][0] if website_data['emails'] else '',
-                    'website': website_url,
-                    'industry': industry or 'Various',
-                    'location': country or 'Unknown',
-                    'source': 'Website Scraping'
-                }
-                all_leads.append(lead)
-        
-        # 2. Google Search
+            report('stage', stage='website', message=f'Scraping {website_url}')
+            website_data = self.scrape_website_contacts(website_url, country=country)
+            lead = self.create_lead_from_website(website_data, search_data)
+            if lead:
+                yield [lead]
+        
+        # 1b. Scrape a batch of websites concurrently
+        if website_urls:
+            logging.info(f"Scraping {len(website_urls)} websites")
+            report('stage', stage='websites', message=f'Scraping {len(website_urls)} websites',
+                   total=len(website_urls))
+            for done, website_data in enumerate(self.scrape_websites(website_urls, country=country), 1):
+                report('progress', stage='websites', done=done, total=len(website_urls))
+                lead = self.create_lead_from_website(website_data, search_data)
+                if lead:
+                    yield [lead]
+        
+        # 2. Web search (all configured engines in parallel)
         if industry and country:
-            logging.info("Searching Google...")
+            logging.info("Searching the web...")
+            report('stage', stage='search', message='Searching the web')
             query = f"{title} {industry}" if title else industry
-            google_leads = self.search_google_business(query, country)
-            all_leads.extend(google_leads)
+            yield self.search_business(query, country, max_results)
         
         # 3. Generate realistic leads as primary source
         if industry and country:
             logging.info("Generating enhanced leads...")
-            enhanced_leads = self.generate_realistic_leads(industry, country, 20)
-            all_leads.extend(enhanced_leads)
-        
-        # Remove duplicates
-        unique_leads = []
-        seen_contacts = set()
-        
-        for lead in all_leads:
-            contact_id = f"{lead.get('phone', '')}_{lead.get('email', '')}"
-            if contact_id not in seen_contacts and contact_id != '_':
-                seen_contacts.add(contact_id)
-                unique_leads.append(lead)
-        
-        logging.info(f"Found {len(unique_leads)} unique leads")
-        return unique_leads[:max_results]
\ No newline at end of file
+            report('stage', stage='lead_generation', message='Generating leads')
+            yield self.generate_realistic_leads(industry, country, self.synthetic_count, self.synthetic_seed)
+
+    def connection_stats(self):
+        """Connection reuse across the session's per-host pools"""
+        pools = 0
+        connections = 0
+        requests_sent = 0
+        for adapter in set(self.session.adapters.values()):
+            manager = adapter.poolmanager
+            for key in manager.pools.keys():
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                pools += 1
+                connections += pool.num_connections
+                requests_sent += pool.num_requests
+        return {
+            'pools': pools,
+            'connections_opened': connections,
+            'requests': requests_sent,
+            'connections_reused': max(0, requests_sent - connections),
+            'reuse_ratio': round(1 - connections / requests_sent, 3) if requests_sent else 0.0
+        }
+
+    def close(self):
+        if self.enricher is not None:
+            self.enricher.close()
+        self.session.close()
+
+_shared_scraper = None
+_shared_lock = threading.Lock()
+
+def get_scraper():
+    """Process-wide scraper so requests share one session and its keep-alive connections"""
+    global _shared_scraper
+    if _shared_scraper is None:
+        with _shared_lock:
+            if _shared_scraper is None:
+                _shared_scraper = IntelligentLeadScraper()
+    return _shared_scraper
+
+def peek_scraper():
+    """The shared scraper if one has been created, without creating it"""
+    return _shared_scraper
+
+def close_scraper():
+    """Close the shared scraper's connections (e.g. when a worker exits)"""
+    global _shared_scraper
+    with _shared_lock:
+        if _shared_scraper is not None:
+            _shared_scraper.close()
+            _shared_scraper = None
@@ -0,0 +1,252 @@
+import contextvars
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+
+from .html_stream import DEFAULT_MAX_BYTES, read_capped, stream_search_results
+from .metrics import ERRORS, timed
+
+logger = logging.getLogger(__name__)
+
+# Reciprocal rank fusion constant: score = sum over engines of 1 / (RRF_K + rank)
+RRF_K = 60
+
+_WORDS = re.compile(r'\w+')
+
+
+class SearchBackend:
+    """One search engine: how to request a results page and where the result titles are
+
+    Subclasses set name, source (the lead source label), page_size,
+    container/heading_tag (for StreamingPageParser) and implement
+    page_request(). base_url points a
+    backend at another endpoint (a proxy, or a local fixture server).
+    """
+
+    name = 'base'
+    source = 'Web Search'
+    page_size = 10
+    container = ('div', 'g')
+    heading_tag = 'h3'
+
+    def __init__(self, session=None, parse_mode='stream', max_bytes=DEFAULT_MAX_BYTES, deadline=8, max_pages=3,
+                 timeout=10, base_url=None):
+        self.session = session
+        self.base_url = base_url
+        self.timeout = timeout
+        self.parse_mode = parse_mode
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.max_pages = max_pages
+
+    def page_request(self, query, country_info, page):
+        """(url, params) for results page number page (0-based)"""
+        raise NotImplementedError
+
+    def parse_results(self, response):
+        """Result titles from a results page response"""
+        if self.parse_mode == 'stream':
+            return stream_search_results(response, self.container, self.heading_tag,
+                                         limit=self.page_size, max_bytes=self.max_bytes)
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(read_capped(response, self.max_bytes), 'html.parser')
+        titles = []
+        for result in soup.find_all(self.container[0], class_=self.container[1])[:self.page_size]:
+            title_elem = result.find(self.heading_tag)
+            if title_elem and title_elem.get_text().strip():
+                titles.append(title_elem.get_text().strip())
+        return titles
+
+    def fetch_page(self, query, country_info, page, timeout):
+        url, params = self.page_request(query, country_info, page)
+        response = self.session.get(url, params=params, timeout=timeout, stream=True)
+        if response.status_code != 200:
+            response.close()
+            raise RuntimeError(f"{self.name} returned HTTP {response.status_code}")
+        return self.parse_results(response)
+
+    def search(self, query, country_info, max_results):
+        """Yield pages of result titles until max_results, an empty page, or this backend's deadline"""
+        deadline_at = time.monotonic() + self.deadline
+        found = 0
+        for page in range(self.max_pages):
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0 or found >= max_results:
+                return
+            titles = self.fetch_page(query, country_info, page, timeout=min(remaining, self.timeout))
+            if not titles:
+                return
+            found += len(titles)
+            yield titles
+
+
+class GoogleBackend(SearchBackend):
+    name = 'google'
+    source = 'Google Search'
+
+    def page_request(self, query, country_info, page):
+        url = self.base_url or f"https://{country_info.get('search_engine', 'google.com')}/search"
+        return url, {'q': query, 'start': page * self.page_size}
+
+
+class BingBackend(SearchBackend):
+    name = 'bing'
+    source = 'Bing Search'
+    container = ('li', 'b_algo')
+    heading_tag = 'h2'
+
+    def page_request(self, query, country_info, page):
+        return self.base_url or "https://www.bing.com/search", {'q': query, 'first': page * self.page_size + 1}
+
+
+class DuckDuckGoBackend(SearchBackend):
+    name = 'duckduckgo'
+    source = 'DuckDuckGo Search'
+    page_size = 30
+    container = ('h2', 'result__title')
+    heading_tag = 'a'
+
+    def page_request(self, query, country_info, page):
+        return self.base_url or "https://html.duckduckgo.com/html/", {'q': query, 's': page * self.page_size}
+
+
+class FixtureBackend(SearchBackend):
+    """Canned results for tests and offline runs, no network
+
+    results is a list of titles returned for every query, or a dict of
+    query -> titles. delay simulates a slow engine (seconds per page).
+    """
+
+    name = 'fixture'
+    source = 'Fixture Search'
+
+    def __init__(self, results=None, delay=0, **kwargs):
+        super().__init__(**kwargs)
+        if results is None:
+            path = os.environ.get('SEARCH_FIXTURE_PATH')
+            if path:
+                with open(path, encoding='utf-8') as f:
+                    results = json.load(f)
+        self.results = results or []
+        self.delay = delay
+
+    def fetch_page(self, query, country_info, page, timeout):
+        if self.delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"{self.name} took longer than {timeout:.1f}s")
+        time.sleep(self.delay)
+        titles = self.results.get(query, []) if isinstance(self.results, dict) else self.results
+        return list(titles[page * self.page_size:(page + 1) * self.page_size])
+
+
+BACKENDS = {
+    'google': GoogleBackend,
+    'bing': BingBackend,
+    'duckduckgo': DuckDuckGoBackend,
+    'fixture': FixtureBackend,
+}
+
+
+def create_backends(names=None, **options):
+    """Backends named in names (comma-separated or list), default SEARCH_BACKENDS"""
+    if names is None:
+        names = os.environ.get('SEARCH_BACKENDS', 'google,bing,duckduckgo')
+    if isinstance(names, str):
+        names = names.split(',')
+    backends = []
+    for name in names:
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown search backend: {name}")
+        backends.append(BACKENDS[name](**options))
+    return backends
+
+
+def result_key(title):
+    """Key for spotting the same result on different engines"""
+    return ' '.join(_WORDS.findall(title.lower()))
+
+
+class MultiSearch:
+    """Query several search backends at once and fuse their rankings
+
+    Every search starts one thread per backend, so a backend's deadline
+    runs from when it actually starts however many searches are in flight,
+    and hands back pages as they arrive. Rankings are merged with
+    reciprocal rank fusion, so results that several engines rank highly
+    come first. A backend that misses its deadline (or fails) is left
+    behind - the others still answer.
+    """
+
+    def __init__(self, backends):
+        self.backends = backends
+
+    def _run_backend(self, backend, query, country_info, max_results, pages):
+        try:
+            offset = 0
+            with timed(f'search_{backend.name}'):
+                for titles in backend.search(query, country_info, max_results):
+                    pages.put((backend.name, offset, titles))
+                    offset += len(titles)
+        except Exception as e:
+            logger.error(f"❌ {backend.name} search failed: {e}")
+        finally:
+            pages.put((backend.name, None, None))
+
+    def search(self, query, country_info, max_results=10, with_sources=False):
+        """Fused result titles, best first, at most max_results
+
+        With with_sources, (title, source) pairs instead, source being the
+        label of the engine that ranked the title highest.
+        """
+        if not self.backends:
+            return []
+        pages = queue.Queue()
+        started = time.monotonic()
+        for backend in self.backends:
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self._run_backend, backend, query, country_info, max_results, pages),
+                name=f'search-{backend.name}', daemon=True
+            ).start()
+
+        # Wait only as long as the slowest backend that is still running is allowed
+        deadlines = {backend.name: started + backend.deadline for backend in self.backends}
+        sources = {backend.name: backend.source for backend in self.backends}
+        scores = {}
+        titles_by_key = {}
+        best_rank = {}
+        running = set(deadlines)
+        while running:
+            remaining = max(deadlines[name] for name in running) - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"⏱️ Search deadline passed, still waiting on: {', '.join(sorted(running))}")
+                for name in running:
+                    ERRORS.inc(stage=f'search_{name}_deadline')
+                break
+            try:
+                name, offset, titles = pages.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if titles is None:
+                running.discard(name)
+                continue
+            for rank, title in enumerate(titles, offset + 1):
+                key = result_key(title)
+                if not key:
+                    continue
+                titles_by_key.setdefault(key, title)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank)
+                if key not in best_rank or rank < best_rank[key][0]:
+                    best_rank[key] = (rank, name)
+
+        ranked = sorted(scores, key=scores.get, reverse=True)[:max_results]
+        if with_sources:
+            return [(titles_by_key[key], sources[best_rank[key][1]]) for key in ranked]
+        return [titles_by_key[key] for key in ranked]
@@ -0,0 +1,167 @@
+"""Batched synthetic lead generation
+
+Lookup tables (full names, email local parts, company names) are built once
+per industry/country, and every random field is drawn for the whole batch
+at once: with NumPy when it is installed, otherwise with random.choices.
+Output is columnar - one list per field in LEAD_FIELDS order - so large
+batches can go straight to CSV without building a Lead per row.
+
+    python -m utils.synthetic --industry Technology --country Germany --count 1000000 --seed 42 -o leads.csv
+"""
+import argparse
+import csv
+import functools
+import logging
+import random
+import unicodedata
+
+from .locales import locales
+from .models import LEAD_FIELDS, Lead
+
+logger = logging.getLogger(__name__)
+
+COMPANY_WORDS = ['Global', 'International', 'Solutions']
+
+# Rows generated and written per batch when streaming to a file
+BATCH_SIZE = 100_000
+
+
+def _numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+# Letters NFKD does not break down into an ASCII base letter
+_TRANSLITERATE = str.maketrans({'ł': 'l', 'Ł': 'L', 'ø': 'o', 'Ø': 'O', 'æ': 'ae', 'Æ': 'Ae',
+                                'ß': 'ss', 'đ': 'd', 'Đ': 'D', 'ı': 'i'})
+
+
+def _mailbox(name):
+    """Name as an ASCII email local part: 'Fernández' -> 'fernandez'"""
+    ascii_name = unicodedata.normalize('NFKD', name.translate(_TRANSLITERATE)).encode('ascii', 'ignore').decode('ascii')
+    return ascii_name.lower().replace(' ', '')
+
+
+@functools.lru_cache(maxsize=256)
+def _tables(industry, country, tld):
+    """Per industry/country lookup tables, built once"""
+    locale = locales().info(country)
+    slug = industry.lower().replace(' ', '')
+    people = [(first, last) for first in locale['first_names'] for last in locale['last_names']]
+    names = [f"{first} {last}" for first, last in people]
+    emails = [f"{_mailbox(first)}.{_mailbox(last)}@{slug}.{tld}" for first, last in people]
+    companies = [f"{industry} {word} {suffix}" for word in COMPANY_WORDS for suffix in locale['suffixes']]
+    tables = {
+        'names': names,
+        'emails': emails,
+        'companies': companies,
+        'website': f"https://www.{slug}.{tld}",
+    }
+    np = _numpy()
+    if np is not None:
+        for field in ('names', 'emails', 'companies'):
+            tables[f'{field}_array'] = np.array(tables[field], dtype=object)
+    return tables
+
+
+def generate_columns(industry, country, count, country_info=None, seed=None, rng=None):
+    """Generate count leads as a dict of field -> list of values
+
+    Pass seed for reproducible output, or an existing rng (numpy Generator or
+    random.Random) to continue one random stream across batches.
+    """
+    country_info = country_info or locales().info(country)
+    code = country_info['code']
+    tables = _tables(industry, country, country_info['tld'])
+    np = _numpy()
+
+    if np is not None and (rng is None or isinstance(rng, np.random.Generator)):
+        rng = rng if rng is not None else np.random.default_rng(seed)
+        people = rng.integers(0, len(tables['names']), count)
+        names = tables['names_array'][people].tolist()
+        emails = tables['emails_array'][people].tolist()
+        companies = tables['companies_array'][rng.integers(0, len(tables['companies']), count)].tolist()
+        numbers = rng.integers(100000000, 1000000000, count).astype(str).tolist()
+    else:
+        rng = rng if rng is not None else random.Random(seed)
+        people = rng.choices(range(len(tables['names'])), k=count)
+        names = [tables['names'][i] for i in people]
+        emails = [tables['emails'][i] for i in people]
+        companies = rng.choices(tables['companies'], k=count)
+        numbers = [str(rng.randrange(100000000, 1000000000)) for _ in range(count)]
+
+    return {
+        'name': names,
+        'title': ['CEO'] * count,
+        'company': companies,
+        'phone': [code + number for number in numbers],
+        'email': emails,
+        'website': [tables['website']] * count,
+        'industry': [industry] * count,
+        'location': [country] * count,
+        'source': ['Enhanced Search'] * count,
+    }
+
+
+def iter_rows(columns):
+    """Rows (tuples in LEAD_FIELDS order) from a columnar batch"""
+    return zip(*(columns[field] for field in LEAD_FIELDS))
+
+
+def generate_leads(industry, country, count, country_info=None, seed=None):
+    """Generate count Lead records"""
+    return [Lead(*row) for row in iter_rows(generate_columns(industry, country, count, country_info, seed))]
+
+
+def _new_rng(seed):
+    np = _numpy()
+    return np.random.default_rng(seed) if np is not None else random.Random(seed)
+
+
+def write_synthetic(filename, format_type, industry, country, count, country_info=None, seed=None,
+                    batch_size=BATCH_SIZE):
+    """Generate count leads straight into an export file
+
+    CSV is written batch by batch from the columns, so memory stays bounded
+    by batch_size. Other formats build the Lead list and use export_data.
+    """
+    if format_type != 'csv':
+        from .exporter import export_data
+        return export_data(generate_leads(industry, country, count, country_info, seed), filename, format_type)
+
+    from .exporter import HEADERS
+    rng = _new_rng(seed)
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        for start in range(0, count, batch_size):
+            batch = min(batch_size, count - start)
+            columns = generate_columns(industry, country, batch, country_info, rng=rng)
+            # Generated leads are not enriched: empty Verification column
+            writer.writerows(row + ('',) for row in iter_rows(columns))
+    logger.info(f"✅ Generated {count} synthetic leads to CSV: {filename}")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate synthetic leads in bulk, e.g. for load testing')
+    parser.add_argument('--industry', required=True)
+    parser.add_argument('--country', required=True)
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--format', default='csv', choices=['xlsx', 'pdf', 'vcf', 'csv', 'txt'])
+    parser.add_argument('-o', '--output', help='output file (default leads_synthetic.<format>)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    output = args.output or f'leads_synthetic.{args.format}'
+    write_synthetic(output, args.format, args.industry, args.country, args.count,
+                    locales().info(args.country), args.seed)
+    print(f"✅ {args.count} synthetic leads -> {output}")
+
+
+if __name__ == '__main__':
+    main()
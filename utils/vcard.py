@@ -0,0 +1,95 @@
+"""vCard 3.0 (RFC 2426) and 4.0 (RFC 6350) serialization without vobject
+
+Cards are built from string templates: values are escaped, content lines
+are folded at 75 octets and everything uses CRLF line endings. Far faster
+than serializing a vobject.vCard per lead (benchmarks/bench_writers.py).
+"""
+VERSIONS = ('3.0', '4.0')
+
+# Content lines longer than this many octets are folded (RFC 2426 2.6, RFC 6350 3.2)
+FOLD_OCTETS = 75
+
+
+def escape(value):
+    """Escape a text value: backslash, comma, semicolon and newlines"""
+    value = str(value)
+    if '\\' in value:
+        value = value.replace('\\', '\\\\')
+    if ',' in value or ';' in value:
+        value = value.replace(',', '\\,').replace(';', '\\;')
+    if '\n' in value or '\r' in value:
+        value = value.replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n')
+    return value
+
+
+def fold(line):
+    """Fold a content line into 75-octet pieces, never splitting a UTF-8 character"""
+    if len(line) <= FOLD_OCTETS and line.isascii():
+        return line
+    if line.isascii():
+        pieces = [line[:FOLD_OCTETS]]
+        # Continuation lines start with a space, which counts towards their 75 octets
+        pieces.extend(line[i:i + FOLD_OCTETS - 1] for i in range(FOLD_OCTETS, len(line), FOLD_OCTETS - 1))
+        return '\r\n '.join(pieces)
+
+    pieces = []
+    start = 0
+    octets = 0
+    limit = FOLD_OCTETS
+    for i, char in enumerate(line):
+        size = len(char.encode('utf-8'))
+        if octets + size > limit:
+            pieces.append(line[start:i])
+            start = i
+            octets = 0
+            limit = FOLD_OCTETS - 1
+        octets += size
+    pieces.append(line[start:])
+    return '\r\n '.join(pieces)
+
+
+def tel_uri(phone):
+    """tel: URI for a formatted phone number (vCard 4.0 TEL values are URIs)"""
+    return 'tel:' + '-'.join(str(phone).replace('(', ' ').replace(')', ' ').split())
+
+
+def serialize(lead, version='3.0'):
+    """One lead as a vCard; the same fields as the vobject writer, plus FN/N always present"""
+    if version not in VERSIONS:
+        raise ValueError(f'Unsupported vCard version {version}; use one of {", ".join(VERSIONS)}')
+    v4 = version == '4.0'
+    get = lead.get
+    name = get('name') or ''
+    company = get('company') or ''
+
+    lines = ['BEGIN:VCARD', 'VERSION:' + version]
+    # FN is required by both versions (N by 3.0) - fall back to the company for nameless leads
+    lines.append('FN:' + escape(name or company or get('email') or ''))
+    if name:
+        names = name.split(' ', 1)
+        family, given = (names[0], '') if len(names) == 1 else (names[1], names[0])
+        lines.append(f'N:{escape(family)};{escape(given)};;;')
+    elif not v4:
+        lines.append('N:;;;;')
+    if company:
+        lines.append('ORG:' + escape(company))
+    if get('title'):
+        lines.append('TITLE:' + escape(get('title')))
+    if get('phone'):
+        if v4:
+            lines.append('TEL;VALUE=uri;TYPE=work:' + tel_uri(get('phone')))
+        else:
+            lines.append('TEL;TYPE=WORK:' + escape(get('phone')))
+    if get('email'):
+        lines.append(('EMAIL;TYPE=work:' if v4 else 'EMAIL;TYPE=WORK:') + escape(get('email')))
+
+    note_parts = []
+    if get('industry'):
+        note_parts.append(f"Industry: {get('industry')}")
+    if get('source'):
+        note_parts.append(f"Source: {get('source')}")
+    if note_parts:
+        lines.append('NOTE:' + escape(' | '.join(note_parts)))
+    lines.append('END:VCARD')
+
+    return '\r\n'.join([fold(line) for line in lines]) + '\r\n'